@@ -18,6 +18,12 @@ class SubscribeCallback(object):
     def message(self, pubnub, message):
         pass
 
+    def messages(self, pubnub, messages):
+        """ Receives consecutive messages of one subscribe response at once. Override it to process them in bulk,
+        by default each message is passed to `message` """
+        for message in messages:
+            self.message(pubnub, message)
+
     @abstractmethod
     def presence(self, pubnub, presence):
         pass
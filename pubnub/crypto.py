@@ -1,15 +1,16 @@
-import hashlib
-import json
 import logging
 import secrets
 
 from base64 import decodebytes, encodebytes, b64decode, b64encode
+from itertools import chain
 from Cryptodome.Cipher import AES
 from Cryptodome.Util.Padding import pad, unpad
 from pubnub.crypto_core import PubNubCrypto, PubNubCryptor, PubNubLegacyCryptor, PubNubAesCbcCryptor, CryptoHeader, \
-    CryptorPayload
+    CryptorPayload, _KeyDerivation, _derive_key, _derive_legacy_key, _encrypt_chunks, _decrypt_chunks, _padded_size, \
+    _split_stream
 from pubnub.exceptions import PubNubException
-from typing import Union, Dict
+from pubnub.json_codec import get_default_codec
+from typing import Iterable, Iterator, Optional, Union, Dict, List
 
 
 Initial16bytes = '0123456789012345'
@@ -23,34 +24,32 @@ class PubNubCryptodome(PubNubCrypto):
         super().__init__(pubnub_config)
         self.mode = pubnub_config.cipher_mode
         self.fallback_mode = pubnub_config.fallback_cipher_mode
+        self._legacy_key = _KeyDerivation(_derive_legacy_key)
 
     def encrypt(self, key, msg, use_random_iv=False):
-        secret = self.get_secret(key)
         initialization_vector = self.get_initialization_vector(use_random_iv)
 
-        cipher = AES.new(bytes(secret[0:32], 'utf-8'), self.mode, bytes(initialization_vector, 'utf-8'))
+        cipher = AES.new(self._legacy_key(key), self.mode, bytes(initialization_vector, 'utf-8'))
         encrypted_message = cipher.encrypt(self.pad(msg.encode('utf-8')))
         msg_with_iv = self.append_random_iv(encrypted_message, use_random_iv, bytes(initialization_vector, "utf-8"))
 
         return encodebytes(msg_with_iv).decode('utf-8').replace("\n", "")
 
     def decrypt(self, key, msg, use_random_iv=False):
-        secret = self.get_secret(key)
-
         decoded_message = decodebytes(msg.encode("utf-8"))
         initialization_vector, extracted_message = self.extract_random_iv(decoded_message, use_random_iv)
-        cipher = AES.new(bytes(secret[0:32], "utf-8"), self.mode, initialization_vector)
+        cipher = AES.new(self._legacy_key(key), self.mode, initialization_vector)
         try:
             plain = self.depad((cipher.decrypt(extracted_message)).decode('utf-8'))
         except UnicodeDecodeError as e:
             if not self.fallback_mode:
                 raise e
 
-            cipher = AES.new(bytes(secret[0:32], "utf-8"), self.fallback_mode, initialization_vector)
+            cipher = AES.new(self._legacy_key(key), self.fallback_mode, initialization_vector)
             plain = self.depad((cipher.decrypt(extracted_message)).decode('utf-8'))
 
         try:
-            return json.loads(plain)
+            return self.pubnub_configuration.json_codec.decode(plain)
         except Exception:
             return plain
 
@@ -80,15 +79,14 @@ class PubNubCryptodome(PubNubCrypto):
         return msg[0:-ord(msg[-1])]
 
     def get_secret(self, key):
-        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return _derive_key(key).hex()
 
 
 class PubNubFileCrypto(PubNubCryptodome):
     def encrypt(self, key, file, use_random_iv=True):
 
-        secret = self.get_secret(key)
         initialization_vector = self.get_initialization_vector(use_random_iv)
-        cipher = AES.new(bytes(secret[0:32], "utf-8"), self.mode, bytes(initialization_vector, 'utf-8'))
+        cipher = AES.new(self._legacy_key(key), self.mode, bytes(initialization_vector, 'utf-8'))
         initialization_vector = bytes(initialization_vector, 'utf-8')
 
         return self.append_random_iv(
@@ -97,16 +95,33 @@ class PubNubFileCrypto(PubNubCryptodome):
             initialization_vector=initialization_vector
         )
 
+    def encrypt_stream(self, key, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """ Encrypts file chunks as they are read, the output is the same as `encrypt` of the whole file """
+        initialization_vector = bytes(self.get_initialization_vector(True), 'utf-8')
+        yield initialization_vector
+        yield from _encrypt_chunks(AES.new(self._legacy_key(key), self.mode, initialization_vector), chunks)
+
+    def encrypted_size(self, size: int) -> int:
+        return AES.block_size + _padded_size(size)
+
+    def decrypt_stream(self, key, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """ Decrypts file chunks as they arrive. Unlike `decrypt`, a file which can't be decrypted raises an error
+        instead of being returned as is, parts of it may have been yielded already. """
+        initialization_vector, chunks = _split_stream(chunks, AES.block_size)
+        try:
+            yield from _decrypt_chunks(AES.new(self._legacy_key(key), self.mode, initialization_vector), chunks)
+        except ValueError:
+            raise PubNubException('decryption error')
+
     def decrypt(self, key, file, use_random_iv=True):
-        secret = self.get_secret(key)
         initialization_vector, extracted_file = self.extract_random_iv(file, use_random_iv)
         try:
-            cipher = AES.new(bytes(secret[0:32], "utf-8"), self.mode, initialization_vector)
+            cipher = AES.new(self._legacy_key(key), self.mode, initialization_vector)
             result = unpad(cipher.decrypt(extracted_file), 16)
         except ValueError:
             if not self.fallback_mode:  # No fallback mode so we return the original content
                 return file
-            cipher = AES.new(bytes(secret[0:32], "utf-8"), self.fallback_mode, initialization_vector)
+            cipher = AES.new(self._legacy_key(key), self.fallback_mode, initialization_vector)
             result = unpad(cipher.decrypt(extracted_file), 16)
 
         return result
@@ -138,16 +153,58 @@ class PubNubCryptoModule(PubNubCrypto):
             raise PubNubException('unknown cryptor error')
         return self.cryptor_map[cryptor_id]
 
+    # messages handled by one task when a batch is spread over an executor
+    BATCH_CHUNK_SIZE = 8
+
     # encrypt string
     def encrypt(self, message: str, cryptor_id: str = None) -> str:
+        cryptor_id = self._validate_cryptor_id(cryptor_id)
+        return self._encrypt_with(cryptor_id, self.cryptor_map[cryptor_id], message)
+
+    def _encrypt_with(self, cryptor_id: str, cryptor: PubNubCryptor, message: str) -> str:
         if not len(message):
             raise PubNubException('encryption error')
-        cryptor_id = self._validate_cryptor_id(cryptor_id)
-        data = message.encode('utf-8')
-        crypto_payload = self.cryptor_map[cryptor_id].encrypt(data)
+        crypto_payload = cryptor.encrypt(message.encode('utf-8'))
         header = self.encode_header(cryptor_id=cryptor_id, cryptor_data=crypto_payload['cryptor_data'])
         return b64encode(header + crypto_payload['data']).decode()
 
+    def encrypt_many(self, messages: List[str], cryptor_id: str = None, executor=None) -> List[str]:
+        """ Encrypts a batch of strings with a cryptor resolved once for the whole batch.
+
+        With a `concurrent.futures.Executor` the batch is encrypted in chunks of `BATCH_CHUNK_SIZE` on its workers.
+        Results keep the order of `messages`.
+        """
+        cryptor_id = self._validate_cryptor_id(cryptor_id)
+        cryptor = self.cryptor_map[cryptor_id]
+        return self._map_chunks(lambda message: self._encrypt_with(cryptor_id, cryptor, message), messages, executor)
+
+    def decrypt_many(self, messages: List[str], executor=None, return_exceptions: bool = False) -> List:
+        """ Decrypts a batch of messages, each of them may use a different cryptor.
+
+        With a `concurrent.futures.Executor` the batch is decrypted in chunks of `BATCH_CHUNK_SIZE` on its workers.
+        Results keep the order of `messages`. With `return_exceptions` a message which can't be decrypted gets the
+        raised exception in place of its result instead of failing the whole batch.
+        """
+        def decrypt(message):
+            try:
+                return self.decrypt(message)
+            except Exception as exception:
+                if not return_exceptions:
+                    raise
+                return exception
+
+        return self._map_chunks(decrypt, messages, executor)
+
+    def _map_chunks(self, func, items: List, executor=None) -> List:
+        if executor is None or len(items) <= self.BATCH_CHUNK_SIZE:
+            return [func(item) for item in items]
+
+        chunks = [items[index:index + self.BATCH_CHUNK_SIZE] for index in range(0, len(items), self.BATCH_CHUNK_SIZE)]
+        results = []
+        for chunk_results in executor.map(lambda chunk: [func(item) for item in chunk], chunks):
+            results.extend(chunk_results)
+        return results
+
     def decrypt(self, message):
         data = b64decode(message)
         header = self.decode_header(data)
@@ -166,7 +223,7 @@ class PubNubCryptoModule(PubNubCrypto):
 
         message = self._get_cryptor(cryptor_id).decrypt(payload)
         try:
-            return json.loads(message)
+            return get_default_codec().decode(message)
         except Exception:
             return message
 
@@ -174,26 +231,100 @@ class PubNubCryptoModule(PubNubCrypto):
         if not len(file_data):
             raise PubNubException('encryption error')
         cryptor_id = self._validate_cryptor_id(cryptor_id)
-        crypto_payload = self.cryptor_map[cryptor_id].encrypt(file_data)
-        header = self.encode_header(cryptor_id=cryptor_id, cryptor_data=crypto_payload['cryptor_data'])
-        return header + crypto_payload['data']
+        # the built-in cryptors encrypt into one buffer which starts with the header
+        return self.cryptor_map[cryptor_id].encrypt_with_header(
+            file_data, lambda cryptor_data: self.encode_header(cryptor_id=cryptor_id, cryptor_data=cryptor_data))
+
+    def encrypt_file_stream(self, chunks: Iterable[bytes], cryptor_id: str = None) -> Iterator[bytes]:
+        """ Encrypts a file read in chunks. The header is yielded first, followed by encrypted chunks as soon as
+        complete blocks are available, so the whole file is never held in memory. """
+        cryptor_id = self._validate_cryptor_id(cryptor_id)
+        crypto_payload = self.cryptor_map[cryptor_id].encrypt_stream(chunks)
+        yield self.encode_header(cryptor_id=cryptor_id, cryptor_data=crypto_payload['cryptor_data'])
+        yield from crypto_payload['data']
+
+    def encrypted_file_size(self, size: int, cryptor_id: str = None) -> Optional[int]:
+        """ Length of the `encrypt_file_stream` output for `size` bytes of file, None if the cryptor can't tell """
+        if not size:
+            raise PubNubException('encryption error')
+        cryptor_id = self._validate_cryptor_id(cryptor_id)
+        payload_size = self.cryptor_map[cryptor_id].encrypted_size(size)
+        if payload_size is None:
+            return None
+        # cryptor data of the AES-CBC cryptors is the initialization vector, one block long
+        return len(self.encode_header(cryptor_id=cryptor_id, cryptor_data=bytes(AES.block_size))) + payload_size
 
     def decrypt_file(self, file_data):
+        """ Decrypts a whole file. The built-in cryptors decrypt from a view of `file_data` into one buffer and
+        return it as a bytearray, custom cryptors are given bytes as before. """
+        file_data = memoryview(file_data)
         header = self.decode_header(file_data)
         if header:
             cryptor_id = header['cryptor_id']
-            payload = CryptorPayload(data=file_data[header['length']:], cryptor_data=header['cryptor_data'])
+            data = file_data[header['length']:]
+            cryptor_data = header['cryptor_data']
         else:
             cryptor_id = self.FALLBACK_CRYPTOR_ID
-            payload = CryptorPayload(data=file_data)
+            data = file_data
+            cryptor_data = None
 
-        if not len(payload['data']):
+        if not len(data):
             raise PubNubException('decryption error')
 
         if cryptor_id not in self.cryptor_map.keys():
             raise PubNubException('unknown cryptor error')
 
-        return self._get_cryptor(cryptor_id).decrypt(payload, binary_mode=True)
+        cryptor = self._get_cryptor(cryptor_id)
+        if type(cryptor).decrypt not in (PubNubAesCbcCryptor.decrypt, PubNubLegacyCryptor.decrypt):
+            # custom decryption may rely on bytes methods
+            data = bytes(data)
+        payload = CryptorPayload(data=data, cryptor_data=cryptor_data) if header else CryptorPayload(data=data)
+        return cryptor.decrypt(payload, binary_mode=True)
+
+    def decrypt_file_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """ Decrypts a file received in chunks. Decrypted chunks are yielded as soon as complete blocks arrive,
+        only the last block is held back to remove the padding. """
+        chunks = iter(chunks)
+        head = b''
+        header_length = None
+        for chunk in chunks:
+            head += bytes(chunk)
+            header_length = self._header_length(head)
+            if header_length is not None and len(head) >= header_length:
+                break
+
+        header = self.decode_header(head)
+        if header:
+            cryptor_id = header['cryptor_id']
+            cryptor_data = header['cryptor_data']
+        else:
+            cryptor_id = self.FALLBACK_CRYPTOR_ID
+            cryptor_data = None
+            header_length = 0
+
+        if cryptor_id not in self.cryptor_map.keys():
+            raise PubNubException('unknown cryptor error')
+
+        payload = CryptorPayload(data=chain((head[header_length:],), chunks), cryptor_data=cryptor_data)
+        try:
+            yield from self._get_cryptor(cryptor_id).decrypt_stream(payload)
+        except ValueError:
+            raise PubNubException('decryption error')
+
+    @staticmethod
+    def _header_length(data: bytes) -> Optional[int]:
+        """ Length of the crypto header which `data` starts with, 0 if there is none, None if more data is needed """
+        if len(data) < 4:
+            return None if b'PNED'.startswith(data) else 0
+        if data[:4] != b'PNED':
+            return 0
+        if len(data) < 10:
+            return None
+        if data[9] < 255:
+            return 10 + data[9]
+        if len(data) < 12:
+            return None
+        return 12 + int.from_bytes(data[10:12], byteorder='big')
 
     def encode_header(self, cryptor_id: str = None, cryptor_data: any = None) -> str:
         if cryptor_id == self.FALLBACK_CRYPTOR_ID:
@@ -221,10 +352,12 @@ class PubNubCryptoModule(PubNubCrypto):
 
     def decode_header(self, header: bytes) -> Union[None, CryptoHeader]:
         try:
-            sentinel = header[:4]
+            # fields are read through a view, only the few header bytes are ever copied
+            header = memoryview(header)
+            sentinel = bytes(header[:4])
             if sentinel != b'PNED':
                 return False
-        except ValueError:
+        except (TypeError, ValueError):
             return False
 
         try:
@@ -232,15 +365,15 @@ class PubNubCryptoModule(PubNubCrypto):
             if header_version > CryptoHeader.header_ver:
                 raise PubNubException('unknown cryptor error')
 
-            cryptor_id = header[5:9].decode()
+            cryptor_id = bytes(header[5:9]).decode()
             crlen = header[9]
             if crlen < 255:
-                cryptor_data = header[10: 10 + crlen]
                 hlen = 10 + crlen
+                cryptor_data = bytes(header[10:hlen])
             else:
-                crlen = int(header[10:12].hex(), 16)
-                cryptor_data = header[12:12 + crlen]
+                crlen = int.from_bytes(header[10:12], byteorder='big')
                 hlen = 12 + crlen
+                cryptor_data = bytes(header[12:hlen])
 
             return CryptoHeader(sentinel=sentinel, header_ver=header_version, cryptor_id=cryptor_id,
                                 cryptor_data=cryptor_data, length=hlen)
@@ -1,11 +1,120 @@
 import hashlib
-import json
 import secrets
 
+from itertools import chain
 from abc import abstractmethod
 from Cryptodome.Cipher import AES
-from Cryptodome.Util.Padding import pad, unpad
+from Cryptodome.Util.Padding import unpad
 from pubnub.exceptions import PubNubException
+from pubnub.json_codec import get_default_codec
+
+
+def _derive_key(cipher_key: str) -> bytes:
+    return hashlib.sha256(cipher_key.encode("utf-8")).digest()
+
+
+def _derive_legacy_key(cipher_key: str) -> bytes:
+    """ Legacy cryptors use the first 32 characters of the hex encoded SHA-256 hash as the AES-256 key """
+    return _derive_key(cipher_key).hex()[0:32].encode("utf-8")
+
+
+class _KeyDerivation:
+    """ Remembers the key derived from the last cipher key used by its cryptor, usually the configured one, so it
+    is derived once per cryptor instead of on every call. Nothing outlives the cryptor. """
+
+    def __init__(self, derive):
+        self._derive = derive
+        self._last = (None, None)
+
+    def __call__(self, cipher_key):
+        last_cipher_key, key = self._last
+        if cipher_key != last_cipher_key or key is None:
+            key = self._derive(cipher_key)
+            self._last = (cipher_key, key)
+        return key
+
+
+def _encrypt_padded(cipher, data, prefix: bytes = b'', block_size: int = AES.block_size) -> bytearray:
+    """ Encrypts `data` with PKCS#7 padding into one preallocated buffer which starts with `prefix`.
+    Full blocks are encrypted straight from a view of `data`, only the last partial block is copied to be padded. """
+    data = memoryview(data)
+    tail = len(data) % block_size
+    body = len(data) - tail
+    padding = block_size - tail
+
+    output = bytearray(len(prefix) + body + block_size)
+    output[:len(prefix)] = prefix
+    with memoryview(output) as output_view:
+        if body:
+            cipher.encrypt(data[:body], output=output_view[len(prefix):len(prefix) + body])
+        cipher.encrypt(bytes(data[body:]) + bytes([padding]) * padding, output=output_view[len(prefix) + body:])
+    return output
+
+
+def _decrypt_padded(cipher, data, block_size: int = AES.block_size) -> bytearray:
+    """ Decrypts `data`, which may be a view, into a preallocated buffer and strips PKCS#7 padding in place """
+    output = bytearray(len(data))
+    cipher.decrypt(data, output=output)
+    padding = output[-1] if output else 0
+    if not 0 < padding <= block_size or len(output) % block_size \
+            or output[len(output) - padding:] != bytes([padding]) * padding:
+        raise ValueError("Padding is incorrect.")
+    del output[len(output) - padding:]
+    return output
+
+
+def _padded_size(size: int, block_size: int = AES.block_size) -> int:
+    """ Length of `size` bytes after PKCS#7 padding """
+    return size - size % block_size + block_size
+
+
+def _encrypt_chunks(cipher, chunks, block_size: int = AES.block_size):
+    """ Incrementally encrypts an iterable of byte chunks with PKCS#7 padding.
+    Complete blocks are encrypted as soon as they are read, only an incomplete block is held back between chunks. """
+    pending = b''
+    for chunk in chunks:
+        if pending:
+            chunk = pending + bytes(chunk)
+        chunk = memoryview(chunk)
+        body = len(chunk) - len(chunk) % block_size
+        if body:
+            yield cipher.encrypt(chunk[:body])
+        pending = bytes(chunk[body:])
+    padding = block_size - len(pending)
+    yield cipher.encrypt(pending + bytes([padding]) * padding)
+
+
+def _decrypt_chunks(cipher, chunks, block_size: int = AES.block_size):
+    """ Incrementally decrypts an iterable of byte chunks and strips PKCS#7 padding.
+    The last block is held back until the stream ends, then its padding is validated and removed. """
+    pending = b''
+    for chunk in chunks:
+        if pending:
+            chunk = pending + bytes(chunk)
+        chunk = memoryview(chunk)
+        body = len(chunk) - (len(chunk) % block_size or block_size)
+        if body > 0:
+            yield cipher.decrypt(chunk[:body])
+        pending = bytes(chunk[max(body, 0):])
+    if len(pending) != block_size:
+        raise ValueError("Data must be padded to %d byte boundary in CBC mode" % block_size)
+    last_block = cipher.decrypt(pending)
+    padding = last_block[-1]
+    if not 0 < padding <= block_size or last_block[-padding:] != bytes([padding]) * padding:
+        raise ValueError("Padding is incorrect.")
+    if padding < block_size:
+        yield last_block[:-padding]
+
+
+def _split_stream(chunks, length: int):
+    """ Reads the first `length` bytes of a chunk stream, returns them with an iterator over the rest """
+    chunks = iter(chunks)
+    head = b''
+    for chunk in chunks:
+        head += bytes(chunk)
+        if len(head) >= length:
+            break
+    return head[:length], chain((head[length:],), chunks)
 
 
 class PubNubCrypto:
@@ -45,6 +154,29 @@ class PubNubCryptor:
     def decrypt(self, payload: CryptorPayload, binary_mode: bool = False, **kwargs) -> bytes:
         pass
 
+    def encrypt_stream(self, chunks, **kwargs) -> CryptorPayload:
+        """ Encrypts an iterable of byte chunks, `data` of the returned payload is an iterator of encrypted chunks.
+        Cryptors which can't encrypt incrementally encrypt the whole stream at once. """
+        payload = self.encrypt(b''.join(chunks), **kwargs)
+        return CryptorPayload(data=iter((payload['data'],)), cryptor_data=payload['cryptor_data'])
+
+    def decrypt_stream(self, payload: CryptorPayload, **kwargs):
+        """ Decrypts a payload whose `data` is an iterable of byte chunks, returns an iterator of decrypted chunks.
+        Cryptors which can't decrypt incrementally decrypt the whole stream at once. """
+        data = b''.join(bytes(chunk) for chunk in payload['data'])
+        return iter((self.decrypt(CryptorPayload(data=data, cryptor_data=payload['cryptor_data']), binary_mode=True,
+                                  **kwargs),))
+
+    def encrypted_size(self, size: int, **kwargs):
+        """ Length of the encrypted `data` for `size` bytes of input, None when it is not known upfront """
+        return None
+
+    def encrypt_with_header(self, data, header, **kwargs):
+        """ Encrypts `data` and returns it after `header(cryptor_data)`. Cryptors which can write the header in
+        front of the encrypted data without copying it override this. """
+        payload = self.encrypt(data, **kwargs)
+        return header(payload['cryptor_data']) + payload['data']
+
 
 class PubNubLegacyCryptor(PubNubCryptor):
     CRYPTOR_ID = '0000'
@@ -57,43 +189,83 @@ class PubNubLegacyCryptor(PubNubCryptor):
         self.use_random_iv = use_random_iv
         self.mode = cipher_mode
         self.fallback_mode = fallback_cipher_mode
+        self._legacy_key = _KeyDerivation(_derive_legacy_key)
 
     def encrypt(self, msg, key=None, use_random_iv=None, **kwargs) -> CryptorPayload:
         key = key or self.cipher_key
         use_random_iv = use_random_iv or self.use_random_iv
 
-        secret = self.get_secret(key)
         initialization_vector = self.get_initialization_vector(use_random_iv)
-        cipher = AES.new(bytes(secret[0:32], 'utf-8'), self.mode, initialization_vector)
-        encrypted_message = cipher.encrypt(self.pad(msg))
-        msg_with_iv = self.append_random_iv(encrypted_message, use_random_iv, initialization_vector)
-        return CryptorPayload(data=msg_with_iv, cryptor_data=initialization_vector)
+        msg_with_iv = self._encrypt_buffer(msg, key, use_random_iv, initialization_vector, b'')
+        # encrypted payloads are hashable bytes, like they were before
+        return CryptorPayload(data=bytes(msg_with_iv), cryptor_data=initialization_vector)
+
+    def encrypt_with_header(self, data, header, key=None, use_random_iv=None, **kwargs):
+        key = key or self.cipher_key
+        use_random_iv = use_random_iv or self.use_random_iv
+        initialization_vector = self.get_initialization_vector(use_random_iv)
+        return self._encrypt_buffer(data, key, use_random_iv, initialization_vector, header(initialization_vector))
+
+    def _encrypt_buffer(self, msg, key, use_random_iv, initialization_vector, header):
+        cipher = AES.new(self._legacy_key(key), self.mode, initialization_vector)
+        # the header and the random initialization vector are written in front of the encrypted message
+        prefix = header + initialization_vector if self.use_random_iv or use_random_iv else header
+        return _encrypt_padded(cipher, msg, prefix)
+
+    def encrypt_stream(self, chunks, key=None, use_random_iv=None, **kwargs) -> CryptorPayload:
+        key = key or self.cipher_key
+        use_random_iv = use_random_iv or self.use_random_iv
+
+        initialization_vector = self.get_initialization_vector(use_random_iv)
+        cipher = AES.new(self._legacy_key(key), self.mode, initialization_vector)
+        data = _encrypt_chunks(cipher, chunks)
+        if self.use_random_iv or use_random_iv:
+            data = chain((initialization_vector,), data)
+        return CryptorPayload(data=data, cryptor_data=initialization_vector)
+
+    def encrypted_size(self, size: int, use_random_iv=None, **kwargs) -> int:
+        prefix = AES.block_size if self.use_random_iv or use_random_iv else 0
+        return prefix + _padded_size(size)
 
     def decrypt(self, payload: CryptorPayload, key=None, use_random_iv=False, binary_mode: bool = False, **kwargs):
         key = key or self.cipher_key
         use_random_iv = use_random_iv or self.use_random_iv
-        secret = self.get_secret(key)
         msg = payload['data']
         initialization_vector, extracted_message = self.extract_random_iv(msg, use_random_iv)
         if not len(extracted_message):
             raise PubNubException('decryption error')
-        cipher = AES.new(bytes(secret[0:32], "utf-8"), self.mode, initialization_vector)
+        cipher = AES.new(self._legacy_key(key), self.mode, initialization_vector)
         if binary_mode:
-            return self.depad(cipher.decrypt(extracted_message), binary_mode)
+            output = bytearray(len(extracted_message))
+            cipher.decrypt(extracted_message, output=output)
+            # padding is stripped in place, like depad does it for bytes
+            padding = output[-1]
+            del output[len(output) - padding if padding else 0:]
+            return output
         try:
             plain = self.depad((cipher.decrypt(extracted_message)).decode('utf-8'), binary_mode)
         except UnicodeDecodeError as e:
             if not self.fallback_mode:
                 raise e
 
-            cipher = AES.new(bytes(secret[0:32], "utf-8"), self.fallback_mode, initialization_vector)
+            cipher = AES.new(self._legacy_key(key), self.fallback_mode, initialization_vector)
             plain = self.depad((cipher.decrypt(extracted_message)).decode('utf-8'), binary_mode)
 
         try:
-            return json.loads(plain)
+            return get_default_codec().decode(plain)
         except Exception:
             return plain
 
+    def decrypt_stream(self, payload: CryptorPayload, key=None, use_random_iv=False, **kwargs):
+        key = key or self.cipher_key
+        use_random_iv = use_random_iv or self.use_random_iv
+        chunks = payload['data']
+        if use_random_iv:
+            initialization_vector, chunks = _split_stream(chunks, AES.block_size)
+        else:
+            initialization_vector = self.Initial16bytes
+        return _decrypt_chunks(AES.new(self._legacy_key(key), self.mode, initialization_vector), chunks)
+
     def append_random_iv(self, message, use_random_iv, initialization_vector):
         if self.use_random_iv or use_random_iv:
             return initialization_vector + message
@@ -101,10 +273,10 @@ class PubNubLegacyCryptor(PubNubCryptor):
             return message
 
     def extract_random_iv(self, message, use_random_iv):
-        if not isinstance(message, bytes):
+        if isinstance(message, str):
             message = bytes(message, 'utf-8')
         if use_random_iv:
-            return message[0:16], message[16:]
+            return bytes(message[0:16]), message[16:]
         else:
             return self.Initial16bytes, message
 
@@ -125,7 +297,7 @@ class PubNubLegacyCryptor(PubNubCryptor):
             return msg[0:-ord(msg[-1])]
 
     def get_secret(self, key):
-        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return _derive_key(key).hex()
 
 
 class PubNubAesCbcCryptor(PubNubCryptor):
@@ -134,21 +306,38 @@ class PubNubAesCbcCryptor(PubNubCryptor):
 
     def __init__(self, cipher_key):
         self.cipher_key = cipher_key
+        self._secret = _KeyDerivation(_derive_key)
 
     def get_initialization_vector(self) -> bytes:
         return secrets.token_bytes(16)
 
     def get_secret(self, key) -> str:
-        return hashlib.sha256(key.encode("utf-8")).digest()
+        return self._secret(key)
 
     def encrypt(self, data: bytes, key=None, **kwargs) -> CryptorPayload:
         key = key or self.cipher_key
         secret = self.get_secret(key)
         iv = self.get_initialization_vector()
         cipher = AES.new(secret, mode=self.mode, iv=iv)
-        encrypted = cipher.encrypt(pad(data, AES.block_size))
+        # encrypted payloads are hashable bytes, like they were before
+        encrypted = bytes(_encrypt_padded(cipher, data))
         return CryptorPayload(data=encrypted, cryptor_data=iv)
 
+    def encrypt_with_header(self, data, header, key=None, **kwargs):
+        key = key or self.cipher_key
+        iv = self.get_initialization_vector()
+        cipher = AES.new(self.get_secret(key), mode=self.mode, iv=iv)
+        return _encrypt_padded(cipher, data, header(iv))
+
+    def encrypt_stream(self, chunks, key=None, **kwargs) -> CryptorPayload:
+        key = key or self.cipher_key
+        iv = self.get_initialization_vector()
+        cipher = AES.new(self.get_secret(key), mode=self.mode, iv=iv)
+        return CryptorPayload(data=_encrypt_chunks(cipher, chunks), cryptor_data=iv)
+
+    def encrypted_size(self, size: int, **kwargs) -> int:
+        return _padded_size(size)
+
     def decrypt(self, payload: CryptorPayload, key=None, binary_mode: bool = False, **kwargs):
         key = key or self.cipher_key
         secret = self.get_secret(key)
@@ -157,6 +346,11 @@ class PubNubAesCbcCryptor(PubNubCryptor):
         cipher = AES.new(secret, mode=self.mode, iv=iv)
 
         if binary_mode:
-            return unpad(cipher.decrypt(payload['data']), AES.block_size)
+            return _decrypt_padded(cipher, payload['data'])
         else:
             return unpad(cipher.decrypt(payload['data']), AES.block_size).decode()
+
+    def decrypt_stream(self, payload: CryptorPayload, key=None, **kwargs):
+        key = key or self.cipher_key
+        cipher = AES.new(self.get_secret(key), mode=self.mode, iv=payload['cryptor_data'])
+        return _decrypt_chunks(cipher, payload['data'])
@@ -1,11 +1,19 @@
+import os
+
+from concurrent.futures import ThreadPoolExecutor
 from pubnub.endpoints.file_operations.file_based_endpoint import FileOperationEndpoint
+from pubnub.endpoints.file_operations.partial_download import PartialDownload, content_range_size
 from pubnub.enums import HttpMethod, PNOperationType
+from pubnub.exceptions import PubNubException
 from pubnub.crypto import PubNubFileCrypto
 from pubnub.models.consumer.file import PNDownloadFileResult
 from pubnub.endpoints.file_operations.get_file_url import GetFileDownloadUrl
 from warnings import warn
 from urllib.parse import urlparse, parse_qs
 
+# downloaded files are received, decrypted and written in chunks of this size
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
 
 class DownloadFileNative(FileOperationEndpoint):
     def __init__(self, pubnub):
@@ -47,6 +55,22 @@ class DownloadFileNative(FileOperationEndpoint):
         else:
             return self._pubnub.crypto.decrypt_file(data)
 
+    def is_encrypted(self):
+        return bool(self._cipher_key or self._pubnub.config.cipher_key)
+
+    def decrypt_stream(self, chunks):
+        """ Decrypts the downloaded file chunk by chunk, the whole file is never held in memory """
+        if self._cipher_key:
+            return PubNubFileCrypto(self._pubnub.config).decrypt_stream(self._cipher_key, chunks)
+        elif self._pubnub.config.cipher_key:
+            return self._pubnub.crypto.decrypt_file_stream(chunks)
+        else:
+            return chunks
+
+    def part_path(self, path):
+        """ Files are downloaded into `<path>.<file id>.part`, which replaces `path` once the download is complete """
+        return '%s.%s.part' % (os.fspath(path), self._file_id)
+
     def validate_params(self):
         self.validate_subscribe_key()
         self.validate_channel()
@@ -54,7 +78,7 @@ class DownloadFileNative(FileOperationEndpoint):
         self.validate_file_id()
 
     def create_response(self, envelope):
-        if self._cipher_key or self._pubnub.config.cipher_key:
+        if self.is_encrypted():
             return PNDownloadFileResult(self.decrypt_payload(envelope.content))
         else:
             return PNDownloadFileResult(envelope.content)
@@ -75,14 +99,116 @@ class DownloadFileNative(FileOperationEndpoint):
     def name(self):
         return "Downloading file"
 
-    def sync(self):
-        self._download_data = GetFileDownloadUrl(self._pubnub)\
+    def get_download_url(self):
+        return GetFileDownloadUrl(self._pubnub)\
             .channel(self._channel)\
             .file_name(self._file_name)\
-            .file_id(self._file_id)\
-            .sync()
+            .file_id(self._file_id)
+
+    def sync(self):
+        self._download_data = self.get_download_url().sync()
 
         return super(DownloadFileNative, self).sync()
 
+    def download_stream(self, chunk_size, headers=None, response=None):
+        """ Streams the raw file content, the status and headers of the response are stored into `response` """
+        def on_response(status, headers):
+            response.update(status=status, headers=headers)
+
+        return self._pubnub.get_request_handler().download_stream(self._download_data.result.file_url, chunk_size,
+                                                                  headers, None if response is None else on_response)
+
+    def iter_chunks(self, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """ Downloads the file and returns an iterator over its (decrypted) content in chunks of about `chunk_size`
+        bytes, produced as the response body arrives. """
+        self.validate_params()
+        self._download_data = self.get_download_url().sync()
+        return self.decrypt_stream(self.download_stream(chunk_size))
+
+    def to_path(self, path, chunk_size=DOWNLOAD_CHUNK_SIZE, resume=True, parallel=1):
+        """ Downloads the file into `path` writing it to the disk as it arrives, returns `path`.
+
+        With `resume` a part file left by a failed download is continued with a `Range` request. With `parallel` > 1
+        unencrypted files are downloaded in ranges, `parallel` of them at a time. Encrypted files are decrypted into
+        `path` once they are downloaded completely.
+        """
+        self.validate_params()
+        self._download_data = self.get_download_url().sync()
+        download = PartialDownload(self.part_path(path))
+        if not resume:
+            download.discard()
+        try:
+            if parallel > 1 and not self.is_encrypted():
+                self._download_ranges(download, chunk_size, parallel)
+            else:
+                self._download_sequential(download, chunk_size)
+        except BaseException:
+            download.failed(resume)
+            raise
+
+        if self.is_encrypted():
+            download.decrypt_into(path, self.decrypt_stream, chunk_size)
+        else:
+            download.finish(path)
+        return path
+
+    def _download_sequential(self, download, chunk_size):
+        offset = download.start_sequential()
+        response = {}
+        chunks = self.download_stream(chunk_size, {'Range': 'bytes=%d-' % offset} if offset else None, response)
+        try:
+            with open(download.part_path, 'ab' if offset else 'wb') as fd:
+                for chunk in chunks:
+                    if offset and response['status'] == 200:
+                        # the range was ignored and the whole file is sent
+                        fd.truncate(0)
+                        offset = 0
+                    fd.write(chunk)
+        except PubNubException as e:
+            # the part file is already complete when the range starts at the end of the file
+            if e._status_code != 416 or content_range_size(response.get('headers')) != offset:
+                raise
+
+    def _download_ranges(self, download, chunk_size, parallel):
+        download.start_ranges()
+        if download.size is None:
+            self._download_range(download, download.first_pending_range(), chunk_size)
+
+        with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="pubnub-download") as executor:
+            list(executor.map(lambda start: self._download_range(download, start, chunk_size),
+                              download.pending_ranges()))
+
+    def _download_range(self, download, start, chunk_size):
+        response = {}
+        chunks = self.download_stream(chunk_size, download.range_header(start), response)
+        written = 0
+        try:
+            with open(download.part_path, 'r+b') as fd:
+                fd.seek(start)
+                for chunk in chunks:
+                    self._check_range_response(start, response)
+                    written += fd.write(chunk)
+        except PubNubException as e:
+            # the range starts after the end of the file
+            if e._status_code != 416:
+                raise
+        self._complete_range(download, start, response, written)
+
+    @staticmethod
+    def _check_range_response(start, response):
+        if start and response['status'] not in (206, 416):
+            raise PubNubException(errormsg="Ranged download is not supported for this file")
+
+    @classmethod
+    def _complete_range(cls, download, start, response, written):
+        cls._check_range_response(start, response)
+        if response['status'] == 200:
+            download.complete_range(start, written, whole_file=True)
+            return
+        size = content_range_size(response['headers'])
+        if size is None:
+            raise PubNubException(errormsg="Ranged download response has no file size")
+        download.complete_range(start, size)
+
     def pn_async(self, callback):
         self._pubnub.get_request_handler().async_file_based_operation(self.sync, callback, "File Download")
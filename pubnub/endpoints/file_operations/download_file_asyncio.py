@@ -1,20 +1,19 @@
+import asyncio
+
+from pubnub.exceptions import PubNubException
 from pubnub.models.consumer.file import PNDownloadFileResult
-from pubnub.endpoints.file_operations.download_file import DownloadFileNative
-from pubnub.endpoints.file_operations.get_file_url import GetFileDownloadUrl
+from pubnub.endpoints.file_operations.download_file import DownloadFileNative, DOWNLOAD_CHUNK_SIZE
+from pubnub.endpoints.file_operations.partial_download import PartialDownload, content_range_size
 
 
 class DownloadFileAsyncio(DownloadFileNative):
     def create_response(self, envelope, data=None):
-        if self._cipher_key or self._pubnub.config.cipher_key:
+        if self.is_encrypted():
             data = self.decrypt_payload(data)
         return PNDownloadFileResult(data)
 
     async def future(self):
-        self._download_data = await GetFileDownloadUrl(self._pubnub)\
-            .channel(self._channel)\
-            .file_name(self._file_name)\
-            .file_id(self._file_id)\
-            .future()
+        self._download_data = await self.get_download_url().future()
 
         downloaded_file = await super(DownloadFileAsyncio, self).future()
         return downloaded_file
@@ -22,3 +21,121 @@ class DownloadFileAsyncio(DownloadFileNative):
     async def result(self):
         response_envelope = await self.future()
         return response_envelope.result
+
+    async def iter_chunks(self, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """ Downloads the file and asynchronously yields its (decrypted) content in chunks of about `chunk_size`
+        bytes, produced as the response body arrives. Decryption runs in the default executor. """
+        self.validate_params()
+        self._download_data = await self.get_download_url().future()
+        response_chunks = self.download_stream(chunk_size)
+
+        try:
+            if not self.is_encrypted():
+                async for chunk in response_chunks:
+                    yield chunk
+                return
+
+            loop = asyncio.get_running_loop()
+
+            def received_chunks():
+                # runs on an executor thread, chunks are received on the event loop
+                while True:
+                    try:
+                        yield asyncio.run_coroutine_threadsafe(response_chunks.__anext__(), loop).result()
+                    except StopAsyncIteration:
+                        return
+
+            chunks = iter(self.decrypt_stream(received_chunks()))
+            while True:
+                chunk = await loop.run_in_executor(None, next, chunks, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            await response_chunks.aclose()
+
+    async def to_path(self, path, chunk_size=DOWNLOAD_CHUNK_SIZE, resume=True, parallel=1):
+        """ Downloads the file into `path` writing it to the disk as it arrives, returns `path`.
+
+        Resuming and ranged downloads work as in DownloadFileNative.to_path. Disk writes and decryption run in the
+        default executor.
+        """
+        self.validate_params()
+        self._download_data = await self.get_download_url().future()
+        loop = asyncio.get_running_loop()
+        download = PartialDownload(self.part_path(path))
+        if not resume:
+            download.discard()
+        try:
+            if parallel > 1 and not self.is_encrypted():
+                await self._download_ranges(download, chunk_size, parallel)
+            else:
+                await self._download_sequential(download, chunk_size)
+        except BaseException:
+            download.failed(resume)
+            raise
+
+        if self.is_encrypted():
+            await loop.run_in_executor(None, download.decrypt_into, path, self.decrypt_stream, chunk_size)
+        else:
+            download.finish(path)
+        return path
+
+    async def _download_sequential(self, download, chunk_size):
+        loop = asyncio.get_running_loop()
+        offset = download.start_sequential()
+        response = {}
+        chunks = self.download_stream(chunk_size, {'Range': 'bytes=%d-' % offset} if offset else None, response)
+        try:
+            with open(download.part_path, 'ab' if offset else 'wb') as fd:
+                async for chunk in chunks:
+                    if offset and response['status'] == 200:
+                        # the range was ignored and the whole file is sent
+                        fd.truncate(0)
+                        offset = 0
+                    await loop.run_in_executor(None, fd.write, chunk)
+        except PubNubException as e:
+            # the part file is already complete when the range starts at the end of the file
+            if e._status_code != 416 or content_range_size(response.get('headers')) != offset:
+                raise
+        finally:
+            await chunks.aclose()
+
+    async def _download_ranges(self, download, chunk_size, parallel):
+        download.start_ranges()
+        if download.size is None:
+            await self._download_range(download, download.first_pending_range(), chunk_size)
+
+        semaphore = asyncio.Semaphore(parallel)
+
+        async def download_range(start):
+            async with semaphore:
+                await self._download_range(download, start, chunk_size)
+
+        tasks = [asyncio.ensure_future(download_range(start)) for start in download.pending_ranges()]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _download_range(self, download, start, chunk_size):
+        loop = asyncio.get_running_loop()
+        response = {}
+        chunks = self.download_stream(chunk_size, download.range_header(start), response)
+        written = 0
+        try:
+            with open(download.part_path, 'r+b') as fd:
+                fd.seek(start)
+                async for chunk in chunks:
+                    self._check_range_response(start, response)
+                    written += await loop.run_in_executor(None, fd.write, chunk)
+        except PubNubException as e:
+            # the range starts after the end of the file
+            if e._status_code != 416:
+                raise
+        finally:
+            await chunks.aclose()
+        self._complete_range(download, start, response, written)
@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+
+# ranged downloads fetch the file and persist their progress in ranges of this size
+DOWNLOAD_RANGE_SIZE = 8 * 1024 * 1024
+
+
+def content_range_size(headers):
+    """ Size of the whole file from the `Content-Range` header of a ranged response, e.g. `bytes 0-99/1234` """
+    content_range = headers.get('Content-Range') if headers else None
+    if not content_range or '/' not in content_range:
+        return None
+    size = content_range.rsplit('/', 1)[1].strip()
+    return int(size) if size.isdigit() else None
+
+
+class PartialDownload:
+    """ A file being downloaded into a part file, which is kept when the download fails so that it can be resumed.
+
+    Sequential downloads append to the part file, its size is their progress. Ranged downloads write ranges of
+    DOWNLOAD_RANGE_SIZE at their offsets and keep the file size with the downloaded ranges in `<part file>.ranges`.
+    Both can continue after each other.
+    """
+
+    def __init__(self, part_path):
+        self.part_path = part_path
+        self.progress_path = part_path + '.ranges'
+        self.size = None
+        self.done = set()
+        self._lock = threading.Lock()
+
+        if os.path.exists(self.progress_path) and os.path.exists(self.part_path):
+            with open(self.progress_path) as fd:
+                progress = json.load(fd)
+            self.size, self.done = progress['size'], set(progress['done'])
+
+    def discard(self):
+        for path in (self.part_path, self.progress_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.size, self.done = None, set()
+
+    def downloaded_prefix(self):
+        """ Number of downloaded bytes at the beginning of the part file """
+        if not os.path.exists(self.part_path):
+            return 0
+        if not os.path.exists(self.progress_path):
+            return os.path.getsize(self.part_path)
+        prefix = 0
+        while prefix in self.done:
+            prefix += DOWNLOAD_RANGE_SIZE
+        return min(prefix, self.size)
+
+    def start_sequential(self):
+        """ Drops downloaded ranges after the downloaded prefix, returns the offset to continue from """
+        offset = self.downloaded_prefix()
+        if os.path.exists(self.progress_path):
+            os.truncate(self.part_path, offset)
+            os.remove(self.progress_path)
+            self.size, self.done = None, set()
+        return offset
+
+    def start_ranges(self):
+        """ Creates the part file, ranges completed by an interrupted sequential download are kept """
+        if not os.path.exists(self.progress_path):
+            prefix = self.downloaded_prefix()
+            self.done = set(range(0, prefix - DOWNLOAD_RANGE_SIZE + 1, DOWNLOAD_RANGE_SIZE))
+        open(self.part_path, 'ab').close()
+
+    def first_pending_range(self):
+        start = 0
+        while start in self.done:
+            start += DOWNLOAD_RANGE_SIZE
+        return start
+
+    def pending_ranges(self):
+        return [start for start in range(0, self.size, DOWNLOAD_RANGE_SIZE) if start not in self.done]
+
+    @staticmethod
+    def range_header(start):
+        return {'Range': 'bytes=%d-%d' % (start, start + DOWNLOAD_RANGE_SIZE - 1)}
+
+    def complete_range(self, start, size, whole_file=False):
+        """ Records a downloaded range, `whole_file` when the server sent the whole file instead of the range """
+        with self._lock:
+            self.size = size
+            if whole_file:
+                self.done = set(range(0, size, DOWNLOAD_RANGE_SIZE))
+            else:
+                self.done.add(start)
+            progress_path = self.progress_path + '.tmp'
+            with open(progress_path, 'w') as fd:
+                json.dump({'size': self.size, 'done': sorted(self.done)}, fd)
+            os.replace(progress_path, self.progress_path)
+
+    def failed(self, resume):
+        """ Keeps the part file to resume the download later if there is something to resume """
+        if not resume or (not self.done and os.path.exists(self.part_path) and not os.path.getsize(self.part_path)):
+            self.discard()
+
+    def finish(self, path):
+        """ Moves the downloaded file to `path` """
+        if self.size is not None:
+            os.truncate(self.part_path, self.size)
+        os.replace(self.part_path, path)
+        if os.path.exists(self.progress_path):
+            os.remove(self.progress_path)
+
+    def decrypt_into(self, path, decrypt_stream, chunk_size):
+        """ Decrypts the downloaded file into `path`. The part file is kept when decryption fails. """
+        if self.size is not None:
+            os.truncate(self.part_path, self.size)
+        decrypted_path = self.part_path + '.decrypted'
+        try:
+            with open(self.part_path, 'rb') as encrypted, open(decrypted_path, 'wb') as decrypted:
+                for chunk in decrypt_stream(iter(lambda: encrypted.read(chunk_size), b'')):
+                    decrypted.write(chunk)
+        except BaseException:
+            os.remove(decrypted_path)
+            raise
+        os.replace(decrypted_path, path)
+        self.discard()
@@ -1,4 +1,8 @@
+import io
+import os
+
 from pubnub.endpoints.file_operations.file_based_endpoint import FileOperationEndpoint
+from pubnub.endpoints.file_operations.upload_body import MultipartUploadBody
 
 from pubnub.crypto import PubNubFileCrypto
 from pubnub.enums import HttpMethod, PNOperationType
@@ -8,6 +12,11 @@ from pubnub.endpoints.file_operations.fetch_upload_details import FetchFileUploa
 from pubnub.endpoints.mixins import TimeTokenOverrideMixin
 from warnings import warn
 
+# files are read, encrypted and sent in chunks of this size
+UPLOAD_CHUNK_SIZE = 64 * 1024
+# files sent at the same time by send_files()
+SEND_FILES_CONCURRENCY = 8
+
 
 class SendFileNative(FileOperationEndpoint, TimeTokenOverrideMixin):
     def __init__(self, pubnub):
@@ -24,11 +33,25 @@ class SendFileNative(FileOperationEndpoint, TimeTokenOverrideMixin):
         self._replicate = None
         self._ptto = None
         self._custom_message_type = None
+        self._file_path = None
+        self._file_position = 0
+        self._progress_callback = None
+        self._upload_body = None
 
     def file_object(self, fd):
         self._file_object = fd
         return self
 
+    def file_path(self, path):
+        """ Uploads the file at `path`, it is streamed from the disk instead of being read into memory """
+        self._file_path = path
+        return self
+
+    def progress_callback(self, callback):
+        """ `callback(bytes_sent, total_bytes)` is called as the upload request body is being sent """
+        self._progress_callback = callback
+        return self
+
     def custom_message_type(self, custom_message_type: str):
         self._custom_message_type = custom_message_type
         return self
@@ -51,7 +74,68 @@ class SendFileNative(FileOperationEndpoint, TimeTokenOverrideMixin):
         else:
             return self._file_object
 
+    def file_size(self):
+        """ Size of the file to upload, None if it can't be streamed and has to be read into memory """
+        if self._file_path:
+            return os.path.getsize(self._file_path)
+        if isinstance(self._file_object, (bytes, bytearray, memoryview)):
+            return memoryview(self._file_object).nbytes
+        if isinstance(self._file_object, io.IOBase) and not isinstance(self._file_object, io.TextIOBase) \
+                and self._file_object.seekable():
+            self._file_position = self._file_object.tell()
+            size = self._file_object.seek(0, io.SEEK_END) - self._file_position
+            self._file_object.seek(self._file_position)
+            return size
+        return None
+
+    def read_file(self):
+        """ File content in chunks of UPLOAD_CHUNK_SIZE, every call starts from the beginning of the file """
+        if self._file_path:
+            with open(self._file_path, 'rb') as fd:
+                yield from iter(lambda: fd.read(UPLOAD_CHUNK_SIZE), b'')
+        elif isinstance(self._file_object, io.IOBase):
+            self._file_object.seek(self._file_position)
+            yield from iter(lambda: self._file_object.read(UPLOAD_CHUNK_SIZE), b'')
+        else:
+            view = memoryview(self._file_object).cast('B')
+            for offset in range(0, len(view), UPLOAD_CHUNK_SIZE):
+                yield bytes(view[offset:offset + UPLOAD_CHUNK_SIZE])
+
+    def upload_content(self, size):
+        """ Size of the uploaded file content and a callable which returns its (encrypted) chunks """
+        if self._cipher_key:
+            file_crypto = PubNubFileCrypto(self._pubnub.config)
+            return file_crypto.encrypted_size(size), \
+                lambda: file_crypto.encrypt_stream(self._cipher_key, self.read_file())
+        elif self._pubnub.config.cipher_key:
+            crypto = self._pubnub.crypto
+            return crypto.encrypted_file_size(size), lambda: crypto.encrypt_file_stream(self.read_file())
+        else:
+            return size, self.read_file
+
+    def build_upload_body(self):
+        """ Streaming multipart body of the upload, None if the file has to be read into memory """
+        size = self.file_size()
+        if size is None:
+            return None
+        upload_size, upload_chunks = self.upload_content(size)
+        if upload_size is None:
+            return None
+        form_fields = [(form_field["key"], form_field["value"])
+                       for form_field in self._file_upload_envelope.result.data["form_fields"]]
+        return MultipartUploadBody(form_fields, self._file_name, upload_chunks, upload_size, self._progress_callback)
+
+    def options(self):
+        self._upload_body = self.build_upload_body()
+        options = super(SendFileNative, self).options()
+        if self._upload_body is not None:
+            options.data = options.body = self._upload_body
+        return options
+
     def build_file_upload_request(self):
+        if self._upload_body is not None:
+            return None
+
         file = self.encrypt_payload()
         multipart_body = {}
         for form_field in self._file_upload_envelope.result.data["form_fields"]:
@@ -77,7 +161,8 @@ class SendFileNative(FileOperationEndpoint, TimeTokenOverrideMixin):
     def validate_params(self):
         self.validate_subscribe_key()
         self.validate_channel()
-        self.validate_file_object()
+        if not self._file_path:
+            self.validate_file_object()
         self.validate_file_name()
 
     def use_base_path(self):
@@ -122,7 +207,9 @@ class SendFileNative(FileOperationEndpoint, TimeTokenOverrideMixin):
         return PNOperationType.PNSendFileAction
 
     def request_headers(self):
-        return {}
+        if self._upload_body is None:
+            return {}
+        return {"Content-Type": self._upload_body.content_type, "Content-Length": str(len(self._upload_body))}
 
     def name(self):
         return "Send file to S3"
@@ -1,15 +1,26 @@
 from pubnub.endpoints.file_operations.send_file import SendFileNative
 from pubnub.endpoints.file_operations.publish_file_message import PublishFileMessage
 from pubnub.endpoints.file_operations.fetch_upload_details import FetchFileUploadS3Data
+from pubnub.endpoints.file_operations.upload_body import AsyncMultipartUploadBody
 
 
 class AsyncioSendFile(SendFileNative):
+    def options(self):
+        options = super(AsyncioSendFile, self).options()
+        if self._upload_body is not None:
+            options.data = options.body = AsyncMultipartUploadBody(self._upload_body)
+        return options
+
     async def future(self):
         self._file_upload_envelope = await FetchFileUploadS3Data(self._pubnub) \
             .channel(self._channel) \
             .file_name(self._file_name).future()
+        if self._file_upload_envelope.is_error():
+            return self._file_upload_envelope
 
         response_envelope = await super(SendFileNative, self).future()
+        if response_envelope.is_error():
+            return response_envelope
 
         publish_file_response = await PublishFileMessage(self._pubnub) \
             .channel(self._channel) \
@@ -23,6 +34,8 @@ class AsyncioSendFile(SendFileNative):
             .ptto(self._ptto) \
             .custom_message_type(self._custom_message_type) \
             .cipher_key(self._cipher_key).future()
+        if publish_file_response.is_error():
+            return publish_file_response
 
         response_envelope.result.timestamp = publish_file_response.result.timestamp
         return response_envelope
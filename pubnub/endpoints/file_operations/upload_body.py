@@ -0,0 +1,89 @@
+import asyncio
+import secrets
+
+from itertools import chain
+from typing import Callable, Iterable, List, Optional, Tuple
+
+
+def _quote(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '%22')
+
+
+class MultipartUploadBody:
+    """ multipart/form-data body of a file upload which is produced while it is being sent.
+
+    The S3 form fields are encoded upfront, the file part is pulled from `file_chunks` (a callable returning an
+    iterable of byte chunks) one chunk at a time, so only a chunk of the file is held in memory. Iterating the body
+    again restarts the file part, which lets the HTTP client resend the request.
+
+    `progress_callback(bytes_sent, total_bytes)` is called after every chunk handed to the HTTP client.
+    """
+
+    def __init__(self, form_fields: List[Tuple[str, str]], file_name: str, file_chunks: Callable[[], Iterable[bytes]],
+                 file_size: int, progress_callback: Optional[Callable[[int, int], None]] = None):
+        self.boundary = secrets.token_hex(16)
+        self._file_chunks = file_chunks
+        self._file_size = file_size
+        self._progress_callback = progress_callback
+
+        head = b''
+        for name, value in form_fields:
+            head += self._part_header('form-data; name="%s"' % _quote(name)) + str(value).encode('utf-8') + b'\r\n'
+        self._head = head + self._part_header('form-data; name="file"; filename="%s"' % _quote(file_name))
+        self._tail = ('\r\n--%s--\r\n' % self.boundary).encode('utf-8')
+
+    def _part_header(self, content_disposition: str) -> bytes:
+        return ('--%s\r\nContent-Disposition: %s\r\n\r\n' % (self.boundary, content_disposition)).encode('utf-8')
+
+    @property
+    def content_type(self) -> str:
+        return 'multipart/form-data; boundary=%s' % self.boundary
+
+    def __len__(self):
+        return len(self._head) + self._file_size + len(self._tail)
+
+    def chunks(self) -> Iterable[bytes]:
+        return chain((self._head,), self._file_chunks(), (self._tail,))
+
+    def report_progress(self, bytes_sent: int):
+        if self._progress_callback:
+            self._progress_callback(bytes_sent, len(self))
+
+    def __iter__(self):
+        bytes_sent = 0
+        for chunk in self.chunks():
+            bytes_sent += len(chunk)
+            yield chunk
+            self.report_progress(bytes_sent)
+
+    def __repr__(self):
+        return '<%s %d bytes>' % (self.__class__.__name__, len(self))
+
+
+class AsyncMultipartUploadBody:
+    """ Asynchronous iterator over a `MultipartUploadBody`.
+
+    File reads and encryption of every chunk run in the default executor, so they don't block the event loop.
+    The progress callback is called on the event loop.
+    """
+
+    def __init__(self, body: MultipartUploadBody):
+        self._body = body
+
+    def __len__(self):
+        return len(self._body)
+
+    async def __aiter__(self):
+        loop = asyncio.get_running_loop()
+        chunks = iter(self._body.chunks())
+        bytes_sent = 0
+        while True:
+            chunk = await loop.run_in_executor(None, next, chunks, None)
+            if chunk is None:
+                return
+            bytes_sent += len(chunk)
+            yield chunk
+            self._body.report_progress(bytes_sent)
+
+    def __repr__(self):
+        return repr(self._body)
@@ -0,0 +1,245 @@
+import asyncio
+import threading
+import time
+
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+import httpx
+import requests
+
+from pubnub.endpoints.objects_v2.objects_endpoint import UuidEndpoint
+from pubnub.errors import PNERR_CLIENT_TIMEOUT, PNERR_CONNECTION_ERROR
+from pubnub.exceptions import PubNubException
+from pubnub.models.consumer.objects_v2.bulk import PNBulkObjectResult, PNObjectsSyncResult
+from pubnub.models.consumer.objects_v2.channel_members import PNUserMember
+from pubnub.models.consumer.objects_v2.common import MemberIncludes, MembershipIncludes
+from pubnub.models.consumer.objects_v2.memberships import PNChannelMembership
+
+# number of requests of a bulk operation in flight at the same time
+BULK_OBJECTS_CONCURRENCY = 8
+# attempts per object before a throttled or failed request is reported as an error
+BULK_OBJECTS_MAX_ATTEMPTS = 5
+# memberships or members changed by one manage request, also the page size of listing them
+MANAGE_OBJECTS_LIMIT = 100
+
+
+class BulkPacer:
+    """ Spaces out the requests of a bulk operation.
+
+    Requests start without delay. A throttled (429) or failed (5xx) request doubles the interval between request
+    starts and pauses all requests for that interval, every success halves it again, so the operation settles at
+    the rate the service accepts.
+    """
+
+    MIN_INTERVAL = 0.05
+    MAX_INTERVAL = 10.0
+
+    def __init__(self):
+        self.interval = 0
+        self._next_start = 0
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """ Reserves the start of the next request, returns the number of seconds to wait for it """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+            return start - now
+
+    def succeeded(self):
+        with self._lock:
+            self.interval = self.interval / 2 if self.interval > self.MIN_INTERVAL else 0
+
+    def throttled(self):
+        with self._lock:
+            self.interval = min(max(self.interval * 2, self.MIN_INTERVAL), self.MAX_INTERVAL)
+            self._next_start = max(self._next_start, time.monotonic() + self.interval)
+
+
+# errors of the connection itself, raised as they are by the asyncio request handler
+TRANSPORT_ERRORS = (asyncio.TimeoutError, httpx.TransportError, requests.exceptions.RequestException, OSError)
+
+
+def is_retryable(exception):
+    """ Throttled (429) and failed (5xx) requests, timeouts and connection errors are worth another attempt """
+    if isinstance(exception, TRANSPORT_ERRORS):
+        return True
+    if not isinstance(exception, PubNubException):
+        return False
+    if exception._pn_error in (PNERR_CONNECTION_ERROR, PNERR_CLIENT_TIMEOUT):
+        return True
+    status_code = exception._status_code or 0
+    return status_code == 429 or status_code >= 500
+
+
+def object_id(endpoint):
+    if isinstance(endpoint, UuidEndpoint):
+        return endpoint._effective_uuid()
+    return endpoint._channel
+
+
+def execute(endpoint, pacer, max_attempts):
+    attempt = 0
+    while True:
+        attempt += 1
+        time.sleep(pacer.reserve())
+        try:
+            result = endpoint.sync().result
+        except Exception as e:
+            if attempt < max_attempts and is_retryable(e):
+                pacer.throttled()
+                continue
+            return PNBulkObjectResult(object_id(endpoint), error=e, attempts=attempt)
+        pacer.succeeded()
+        return PNBulkObjectResult(object_id(endpoint), result=result, attempts=attempt)
+
+
+async def aexecute(endpoint, pacer, max_attempts):
+    attempt = 0
+    while True:
+        attempt += 1
+        await asyncio.sleep(pacer.reserve())
+        try:
+            result = await endpoint.result()
+        except Exception as e:
+            if attempt < max_attempts and is_retryable(e):
+                pacer.throttled()
+                continue
+            return PNBulkObjectResult(object_id(endpoint), error=e, attempts=attempt)
+        pacer.succeeded()
+        return PNBulkObjectResult(object_id(endpoint), result=result, attempts=attempt)
+
+
+def bulk_requests(endpoints, concurrency=BULK_OBJECTS_CONCURRENCY, max_attempts=BULK_OBJECTS_MAX_ATTEMPTS):
+    """ Executes the requests from `endpoints`, up to `concurrency` of them at a time, and yields their
+    PNBulkObjectResult as they complete. Endpoints are taken from the iterable only when there is room for them. """
+    pacer = BulkPacer()
+    endpoints = iter(endpoints)
+    pending = set()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pubnub-bulk-objects") as executor:
+        while True:
+            for endpoint in islice(endpoints, concurrency - len(pending)):
+                pending.add(executor.submit(execute, endpoint, pacer, max_attempts))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+async def abulk_requests(endpoints, concurrency=BULK_OBJECTS_CONCURRENCY, max_attempts=BULK_OBJECTS_MAX_ATTEMPTS):
+    """ Asyncio counterpart of `bulk_requests`, the requests run as tasks """
+    pacer = BulkPacer()
+    endpoints = iter(endpoints)
+    pending = set()
+    try:
+        while True:
+            for endpoint in islice(endpoints, concurrency - len(pending)):
+                pending.add(asyncio.ensure_future(aexecute(endpoint, pacer, max_attempts)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def memberships_request(pubnub, uuid):
+    return pubnub.get_memberships(uuid=uuid, limit=MANAGE_OBJECTS_LIMIT,
+                                  include=MembershipIncludes(custom=True, status=True, type=True))
+
+
+def members_request(pubnub, channel):
+    return pubnub.get_channel_members(channel=channel, limit=MANAGE_OBJECTS_LIMIT,
+                                      include=MemberIncludes(custom=True, status=True, type=True))
+
+
+def diff(current, desired, key):
+    """ Compares `current` listed memberships with `desired` PNChannelMembership or PNUserMember objects.
+
+    Returns the desired objects which are missing or differ in a field they set (custom, status or type), and
+    the ids of the current memberships which are not desired. """
+    current = {item[key]['id']: item for item in current}
+    to_set = []
+    desired_ids = set()
+    for membership in desired:
+        payload = membership.to_payload_dict()
+        id = payload[key]['id']
+        desired_ids.add(id)
+        if id not in current or any(current[id].get(field) != value for field, value in payload.items()
+                                    if field != key):
+            to_set.append((id, membership))
+    return to_set, [id for id in current if id not in desired_ids]
+
+
+def chunked_changes(to_set, to_remove):
+    changes = [(True, change) for change in to_set] + [(False, id) for id in to_remove]
+    for start in range(0, len(changes), MANAGE_OBJECTS_LIMIT):
+        chunk = changes[start:start + MANAGE_OBJECTS_LIMIT]
+        yield [change for is_set, change in chunk if is_set], [id for is_set, id in chunk if not is_set]
+
+
+def memberships_changes(pubnub, uuid, current, channels):
+    """ Manage requests turning `current` memberships of `uuid` into `channels`, names or PNChannelMembership """
+    desired = [channel if isinstance(channel, PNChannelMembership) else PNChannelMembership.channel(channel)
+               for channel in channels]
+    to_set, to_remove = diff(current, desired, 'channel')
+    return [([id for id, _ in chunk_set], chunk_remove, pubnub.manage_memberships(
+        uuid=uuid, channel_memberships_to_set=[membership for _, membership in chunk_set],
+        channel_memberships_to_remove=[PNChannelMembership.channel(id) for id in chunk_remove]))
+        for chunk_set, chunk_remove in chunked_changes(to_set, to_remove)]
+
+
+def members_changes(pubnub, channel, current, uuids):
+    """ Manage requests turning `current` members of `channel` into `uuids`, ids or PNUserMember """
+    desired = [uuid if isinstance(uuid, PNUserMember) else PNUserMember(uuid) for uuid in uuids]
+    to_set, to_remove = diff(current, desired, 'uuid')
+    return [([id for id, _ in chunk_set], chunk_remove, pubnub.manage_channel_members(
+        channel=channel, uuids_to_set=[member for _, member in chunk_set],
+        uuids_to_remove=[PNUserMember(id) for id in chunk_remove]))
+        for chunk_set, chunk_remove in chunked_changes(to_set, to_remove)]
+
+
+def chunk_outcome(endpoint, outcome):
+    """ A chunk whose request raised is recorded as failed, the outcomes of the other chunks are kept """
+    if isinstance(outcome, BaseException):
+        return PNBulkObjectResult(object_id(endpoint), error=outcome)
+    return outcome
+
+
+def sync_result(changes, outcomes):
+    result = PNObjectsSyncResult()
+    for (set_ids, removed_ids, endpoint), outcome in zip(changes, outcomes):
+        outcome = chunk_outcome(endpoint, outcome)
+        if outcome.is_error():
+            result.failed.append(outcome)
+        else:
+            result.set.extend(set_ids)
+            result.removed.extend(removed_ids)
+    return result
+
+
+def apply_changes(changes, concurrency=BULK_OBJECTS_CONCURRENCY):
+    """ Executes the manage requests of `changes` concurrently, paced and retried as `bulk_requests` """
+    pacer = BulkPacer()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pubnub-bulk-objects") as executor:
+        futures = [executor.submit(execute, endpoint, pacer, BULK_OBJECTS_MAX_ATTEMPTS) for _, _, endpoint in changes]
+        outcomes = [future.exception() or future.result() for future in futures]
+    return sync_result(changes, outcomes)
+
+
+async def aapply_changes(changes, concurrency=BULK_OBJECTS_CONCURRENCY):
+    """ Asyncio counterpart of `apply_changes` """
+    pacer = BulkPacer()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def apply(endpoint):
+        async with semaphore:
+            return await aexecute(endpoint, pacer, BULK_OBJECTS_MAX_ATTEMPTS)
+
+    outcomes = await asyncio.gather(*(apply(endpoint) for _, _, endpoint in changes), return_exceptions=True)
+    return sync_result(changes, outcomes)
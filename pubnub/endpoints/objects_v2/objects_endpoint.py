@@ -1,8 +1,11 @@
+import asyncio
 import logging
 
 from abc import ABCMeta
+from concurrent.futures import ThreadPoolExecutor
 from pubnub import utils
 from pubnub.endpoints.endpoint import Endpoint
+from pubnub.enums import HttpMethod
 from pubnub.errors import PNERR_UUID_MISSING, PNERR_CHANNEL_MISSING
 from pubnub.exceptions import PubNubException
 from pubnub.models.consumer.objects_v2.page import Next, PNPage, Previous
@@ -241,6 +244,53 @@ class ListEndpoint:
         self._page = page
         return self
 
+    def iterate(self):
+        """Yields the objects of all pages, starting from the current one and following the `next` pages.
+
+            The next page is requested as soon as a page arrives, while its objects are being consumed, so at most one
+            request is in flight at a time.
+
+            Returns
+            -------
+            generator of objects returned in the `data` of the pages
+        """
+        self._validate_iterable()
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pubnub-pages") as executor:
+            page = executor.submit(self.sync)
+            while page is not None:
+                result = page.result().result
+                page = None
+                if result.next and result.data:
+                    self._page = result.next
+                    page = executor.submit(self.sync)
+                yield from result.data
+
+    async def aiterate(self):
+        """Asynchronous counterpart of `iterate` for the asyncio client, the next page is requested in a task.
+
+            Returns
+            -------
+            async generator of objects returned in the `data` of the pages
+        """
+        self._validate_iterable()
+        page = asyncio.ensure_future(self.result())
+        try:
+            while page is not None:
+                result = await page
+                page = None
+                if result.next and result.data:
+                    self._page = result.next
+                    page = asyncio.ensure_future(self.result())
+                for item in result.data:
+                    yield item
+        finally:
+            if page is not None:
+                page.cancel()
+
+    def _validate_iterable(self):
+        if self.http_method() != HttpMethod.GET:
+            raise PubNubException(errormsg="Only requests listing objects can be iterated")
+
 
 class IncludeCapableEndpoint:
     _includes: PNIncludes = None
@@ -1,11 +1,20 @@
-from typing import List, Union
+import asyncio
+import copy
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterator, List, Union
 from pubnub import utils
 from pubnub.endpoints.endpoint import Endpoint
 from pubnub.enums import HttpMethod, PNOperationType
 from pubnub.models.consumer.common import PNStatus
-from pubnub.models.consumer.presence import PNHereNowResult
+from pubnub.models.consumer.presence import PNHereNowOccupantsData, PNHereNowResult
 from pubnub.structures import Envelope
 
+# pages of occupants requested at the same time by `iterate` once the occupancy is known
+HERE_NOW_CONCURRENCY = 4
+
 
 class PNHereNowResultEnvelope(Envelope):
     result: PNHereNowResult
@@ -95,6 +104,56 @@ class HereNow(Endpoint):
     def sync(self) -> PNHereNowResultEnvelope:
         return PNHereNowResultEnvelope(super().sync())
 
+    def iterate(self, concurrency: int = HERE_NOW_CONCURRENCY) -> Iterator[PNHereNowOccupantsData]:
+        """Yields the occupants of the channels page by page, `limit` occupants of each channel per page.
+
+        The first page tells the occupancy of the channels, the following pages are then requested
+        `concurrency` at a time and their occupants are yielded in the order of the pages. Only these pages
+        are held in memory. Occupants joining or leaving meanwhile can be missed or repeated.
+        """
+        first = self.sync().result
+        yield from self._occupants(first)
+
+        offsets = iter(self._next_offsets(first))
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pubnub-here-now") as executor:
+            pages = deque(executor.submit(self._page_at(offset).sync) for offset in islice(offsets, concurrency))
+            while pages:
+                result = pages.popleft().result().result
+                pages.extend(executor.submit(self._page_at(offset).sync) for offset in islice(offsets, 1))
+                yield from self._occupants(result)
+
+    async def aiterate(self, concurrency: int = HERE_NOW_CONCURRENCY):
+        """Asynchronous counterpart of `iterate` for the asyncio client, the pages are requested in tasks."""
+        first = await self.result()
+        for occupant in self._occupants(first):
+            yield occupant
+
+        offsets = iter(self._next_offsets(first))
+        pages = deque(asyncio.ensure_future(self._page_at(offset).result()) for offset in islice(offsets, concurrency))
+        try:
+            while pages:
+                result = await pages.popleft()
+                pages.extend(asyncio.ensure_future(self._page_at(offset).result()) for offset in islice(offsets, 1))
+                for occupant in self._occupants(result):
+                    yield occupant
+        finally:
+            for page in pages:
+                page.cancel()
+
+    def _page_at(self, offset):
+        page = copy.copy(self)
+        page._offset = offset
+        return page
+
+    def _next_offsets(self, first_page):
+        occupancy = max((channel.occupancy for channel in first_page.channels), default=0)
+        return range((self._offset or 0) + self._limit, occupancy, self._limit)
+
+    @staticmethod
+    def _occupants(page):
+        for channel in page.channels:
+            yield from channel.occupants or ()
+
     def request_timeout(self):
         return self.pubnub.config.non_subscribe_request_timeout
 
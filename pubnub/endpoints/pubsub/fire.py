@@ -57,7 +57,7 @@ class Fire(Endpoint):
 
     def build_data(self):
         if self._use_post is True:
-            stringified_message = utils.write_value_as_string(self._message)
+            stringified_message = utils.write_value_as_string(self._message, self.pubnub.config.json_codec)
             if self.pubnub.config.crypto_module:
                 stringified_message = '"' + self.pubnub.config.crypto_module.encrypt(stringified_message) + '"'
             elif self.pubnub.config.cipher_key is not None:  # The legacy way
@@ -72,7 +72,7 @@ class Fire(Endpoint):
     def custom_params(self):
         params = {}
         if self._meta is not None:
-            params['meta'] = utils.write_value_as_string(self._meta)
+            params['meta'] = utils.write_value_as_string(self._meta, self.pubnub.config.json_codec)
         params["store"] = "0"
         params["norep"] = "1"
         if self.pubnub.config.auth_key is not None:
@@ -85,7 +85,7 @@ class Fire(Endpoint):
                                           self.pubnub.config.subscribe_key,
                                           utils.url_encode(self._channel), 0)
         else:
-            stringified_message = utils.write_value_as_string(self._message)
+            stringified_message = utils.write_value_as_string(self._message, self.pubnub.config.json_codec)
             if self.pubnub.config.crypto_module:
                 stringified_message = '"' + self.pubnub.config.crypto_module.encrypt(stringified_message) + '"'
             elif self.pubnub.config.cipher_key is not None:  # The legacy way
@@ -81,7 +81,7 @@ class Publish(Endpoint, TimeTokenOverrideMixin):
 
     def build_data(self):
         if self._use_post is True:
-            stringified_message = utils.write_value_as_string(self._message)
+            stringified_message = utils.write_value_as_string(self._message, self.pubnub.config.json_codec)
 
             if self.pubnub.config.crypto_module:
                 stringified_message = '"' + self.pubnub.config.crypto_module.encrypt(stringified_message) + '"'
@@ -96,7 +96,7 @@ class Publish(Endpoint, TimeTokenOverrideMixin):
     def encoded_params(self):
         if self._meta:
             return {
-                "meta": utils.url_write(self._meta)
+                "meta": utils.url_write(self._meta, self.pubnub.config.json_codec)
             }
         else:
             return {}
@@ -108,7 +108,7 @@ class Publish(Endpoint, TimeTokenOverrideMixin):
             params['ttl'] = self._ttl
 
         if self._meta:
-            params['meta'] = utils.write_value_as_string(self._meta)
+            params['meta'] = utils.write_value_as_string(self._meta, self.pubnub.config.json_codec)
 
         if self._custom_message_type:
             params['custom_message_type'] = utils.url_encode(self._custom_message_type)
@@ -131,7 +131,7 @@ class Publish(Endpoint, TimeTokenOverrideMixin):
                                                 self.pubnub.config.subscribe_key,
                                                 utils.url_encode(self._channel), 0)
         else:
-            stringified_message = utils.write_value_as_string(self._message)
+            stringified_message = utils.write_value_as_string(self._message, self.pubnub.config.json_codec)
             if self.pubnub.config.crypto_module:
                 stringified_message = '"' + self.pubnub.config.crypto_module.encrypt(stringified_message) + '"'
             elif self.pubnub.config.cipher_key is not None:  # The legacy way
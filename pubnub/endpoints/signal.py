@@ -37,7 +37,7 @@ class Signal(Endpoint):
         return self
 
     def build_path(self):
-        stringified_message = utils.write_value_as_string(self._message)
+        stringified_message = utils.write_value_as_string(self._message, self.pubnub.config.json_codec)
         msg = utils.url_encode(stringified_message)
         return Signal.SIGNAL_PATH % (
             self.pubnub.config.publish_key, self.pubnub.config.subscribe_key,
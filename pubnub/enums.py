@@ -40,6 +40,7 @@ class PNStatusCategory(Enum):
     PNSubscriptionChangedCategory = 18
     PNConnectionErrorCategory = 19
     PNSerializationErrorCategory = 20
+    PNMessageQueueOverflowCategory = 21
 
 
 class PNOperationType(object):
@@ -142,6 +143,19 @@ class PNReconnectionPolicy(object):
     EXPONENTIAL = 3
 
 
+class PNRequestRejectionPolicy(object):
+    ABORT = 1
+    CALLER_RUNS = 2
+    BLOCK = 3
+
+
+class PNMessageQueueOverflowPolicy(object):
+    BLOCK = 1
+    DROP_OLDEST = 2
+    DROP_NEWEST = 3
+    COALESCE_BY_CHANNEL = 4
+
+
 class PNPushType(object):
     APNS = 1
     GCM = 3  # Deprecated: Use FCM instead. GCM has been replaced by FCM (Firebase Cloud Messaging)
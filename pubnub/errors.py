@@ -10,6 +10,8 @@ PNERR_SERVER_ERROR = "HTTP Server Error"
 # For 4xx server responses
 PNERR_CLIENT_ERROR = "HTTP Client Error"
 PNERR_UNKNOWN_ERROR = "Unknown Error"
+PNERR_REQUEST_QUEUE_FULL = "Request queue is full"
+PNERR_REQUEST_EXECUTOR_SHUT_DOWN = "Request executor is shut down"
 PNERR_CHANNEL_MISSING = "Channel missing"
 PNERR_CHANNELS_MISSING = "Channels missing"
 PNERR_GROUP_MISSING = "Channel group missing"
@@ -111,6 +111,10 @@ class ReceiveMessagesEffect(Effect):
             self.run_async(self.receive_messages_async(channels, groups, timetoken, region))
 
     async def receive_messages_async(self, channels, groups, timetoken, region):
+        # hold the next request while subscription streams are full
+        for stream in self.pubnub._subscription_manager._lagging_streams():
+            await stream.wait_for_space()
+
         request = Subscribe(self.pubnub)
         if channels:
             request.channels(channels)
@@ -475,9 +479,8 @@ class EmitEffect:
 
     def emit_message(self, invocation: invocations.EmitMessagesInvocation):
         self.message_worker._listener_manager = self.pubnub._subscription_manager._listener_manager
-        for message in invocation.messages:
-            subscribe_message = SubscribeMessage().from_json(message)
-            self.message_worker._process_incoming_payload(subscribe_message)
+        self.message_worker._process_incoming_payloads(
+            [SubscribeMessage().from_json(message) for message in invocation.messages])
 
     def emit_status(self, invocation: invocations.EmitStatusInvocation):
         if isinstance(invocation.status, PNStatus):
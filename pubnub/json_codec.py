@@ -0,0 +1,104 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class PubNubJsonCodec:
+    """JSON codec used to serialize outgoing payloads and parse responses and decrypted messages.
+
+    This implementation is backed by the standard library. Subclasses can plug in faster libraries; they
+    should produce the same Python objects as `json.loads` and fall back to it for any input they can't handle.
+    """
+    name = "json"
+
+    def encode(self, data) -> str:
+        return json.dumps(data)
+
+    def decode(self, data):
+        return json.loads(data)
+
+
+class OrjsonCodec(PubNubJsonCodec):
+    """Codec backed by `orjson`.
+
+    Decoding always goes through `orjson` and falls back to the standard library for documents it rejects
+    (e.g. `NaN` or integers wider than 64 bits).
+
+    By default encoding still goes through the standard library, because `orjson` writes compact, non-ASCII
+    escaped JSON, which changes the bytes sent over the wire (and compared by request signatures and caches).
+    Pass `compact_encoding=True` to encode with `orjson` as well.
+    """
+    name = "orjson"
+
+    def __init__(self, compact_encoding: bool = False):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        self.compact_encoding = compact_encoding
+
+    def encode(self, data) -> str:
+        if self.compact_encoding:
+            try:
+                return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+            except orjson.JSONEncodeError:
+                pass
+        return super().encode(data)
+
+    def decode(self, data):
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            return super().decode(data)
+
+
+class UjsonCodec(PubNubJsonCodec):
+    """Codec backed by `ujson`. Follows the same encoding and fallback rules as `OrjsonCodec`."""
+    name = "ujson"
+
+    def __init__(self, compact_encoding: bool = False):
+        if ujson is None:
+            raise ImportError("ujson is not installed")
+        self.compact_encoding = compact_encoding
+
+    def encode(self, data) -> str:
+        if self.compact_encoding:
+            try:
+                return ujson.dumps(data, ensure_ascii=False, escape_forward_slashes=False)
+            except (TypeError, OverflowError):
+                pass
+        return super().encode(data)
+
+    def decode(self, data):
+        try:
+            return ujson.loads(data)
+        except ValueError:
+            return super().decode(data)
+
+
+def _create_default_codec() -> PubNubJsonCodec:
+    if orjson is not None:
+        return OrjsonCodec()
+    if ujson is not None:
+        return UjsonCodec()
+    return PubNubJsonCodec()
+
+
+_default_codec = _create_default_codec()
+
+
+def get_default_codec() -> PubNubJsonCodec:
+    """Codec used where no `PNConfiguration` is at hand. Uses the fastest installed library."""
+    return _default_codec
+
+
+def set_default_codec(codec: PubNubJsonCodec) -> None:
+    global _default_codec
+    assert isinstance(codec, PubNubJsonCodec)
+    _default_codec = codec
@@ -3,12 +3,18 @@ from abc import abstractmethod, ABCMeta
 
 import base64
 import random
+import threading
+import time
+
+from collections import OrderedDict
+from copy import deepcopy
 
 from cbor2 import loads
 
 from pubnub import utils
-from pubnub.enums import PNStatusCategory, PNReconnectionPolicy
+from pubnub.enums import PNStatusCategory, PNReconnectionPolicy, PNOperationType, PNMessageQueueOverflowPolicy
 from pubnub.models.consumer.common import PNStatus
+from pubnub.models.consumer.pubsub import PNMessageQueueStats
 from pubnub.models.server.subscribe import SubscribeEnvelope
 from pubnub.dtos import SubscribeOperation, UnsubscribeOperation
 from pubnub.callbacks import SubscribeCallback, ReconnectionCallback
@@ -215,6 +221,10 @@ class ListenerManager:
         for callback in self._listeners:
             callback.message(self._pubnub, message)
 
+    def announce_messages(self, messages):
+        for callback in self._listeners:
+            callback.messages(self._pubnub, messages)
+
     def announce_signal(self, signal):
         for callback in self._listeners:
             callback.signal(self._pubnub, signal)
@@ -244,14 +254,78 @@ class ListenerManager:
             callback.file(self._pubnub, file_message)
 
 
+class MessageQueueOverflow:
+    """ Keeps the queue of received subscribe messages within `message_queue_size`.
+
+    `put` is called by the queue implementations while holding their own lock. With the BLOCK policy messages are
+    always appended and the queue itself applies backpressure to the subscribe loop; the other policies make room by
+    dropping the oldest message, the incoming one, or the oldest queued message of the same channel (falling back to
+    the oldest one).
+    """
+
+    def __init__(self, max_size=0, policy=PNMessageQueueOverflowPolicy.BLOCK):
+        self.max_size = max_size or 0
+        self.policy = policy
+        self.dropped = 0
+        self._dropped_channels = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(config.message_queue_size, config.message_queue_overflow_policy)
+
+    @property
+    def blocks(self):
+        return self.max_size > 0 and self.policy == PNMessageQueueOverflowPolicy.BLOCK
+
+    def is_full(self, size):
+        return 0 < self.max_size <= size
+
+    def put(self, items, message) -> bool:
+        """ Adds the message to the deque of queued items, returns False if a message had to be dropped """
+        if message is None or self.policy == PNMessageQueueOverflowPolicy.BLOCK or not self.is_full(len(items)):
+            items.append(message)
+            return True
+
+        if self.policy == PNMessageQueueOverflowPolicy.DROP_NEWEST:
+            dropped = message
+        else:
+            dropped = None
+            if self.policy == PNMessageQueueOverflowPolicy.COALESCE_BY_CHANNEL:
+                dropped = next((item for item in items if item is not None and item.channel == message.channel), None)
+            if dropped is None:
+                dropped = items.popleft()
+            else:
+                items.remove(dropped)
+            items.append(message)
+            if dropped is None:
+                # only the stop marker of a worker which is shutting down was removed
+                return True
+
+        with self._lock:
+            self.dropped += 1
+            self._dropped_channels.append(dropped.channel)
+        return False
+
+    def take_dropped_channels(self):
+        with self._lock:
+            channels, self._dropped_channels = self._dropped_channels, []
+        return channels
+
+
 class SubscriptionManager:
     __metaclass__ = ABCMeta
 
     HEARTBEAT_INTERVAL_MULTIPLIER = 1000
 
+    _message_queue_overflow: MessageQueueOverflow = None
+    # platform specific PNSubscriptionStream implementation
+    _subscription_stream_class = None
+
     def __init__(self, pubnub_instance):
         self._pubnub = pubnub_instance
         self._subscription_status_announced = False
+        self._subscription_streams = []
 
         self._subscription_state = StateManager()
         self._listener_manager = ListenerManager(self._pubnub)
@@ -375,10 +449,53 @@ class SubscriptionManager:
                 if only_channel:
                     message.only_channel_subscription = True
                 self._message_queue_put(message)
+            self._announce_dropped_messages()
 
         self._timetoken = int(result.metadata.timetoken)
         self._region = int(result.metadata.region)
 
+    def _announce_dropped_messages(self):
+        if self._message_queue_overflow is None:
+            return
+        dropped_channels = self._message_queue_overflow.take_dropped_channels()
+        if not dropped_channels:
+            return
+
+        logger.warning("Message queue is full, %d message(s) dropped" % len(dropped_channels))
+        pn_status = PNStatus()
+        pn_status.category = PNStatusCategory.PNMessageQueueOverflowCategory
+        pn_status.operation = PNOperationType.PNSubscribeOperation
+        pn_status.error = False
+        pn_status.affected_channels = list(dict.fromkeys(dropped_channels))
+        self._listener_manager.announce_status(pn_status)
+
+    def _message_queue_depth(self):
+        return self._message_queue.qsize()
+
+    def get_message_queue_stats(self):
+        if self._message_queue_overflow is None:
+            return None
+        return PNMessageQueueStats(
+            depth=self._message_queue_depth(),
+            max_size=self._message_queue_overflow.max_size,
+            dropped=self._message_queue_overflow.dropped
+        )
+
+    def open_stream(self, subscription, maxsize):
+        stream = self._subscription_stream_class(self, subscription, maxsize)
+        self._subscription_streams.append(stream)
+        subscription.subscribe()
+        return stream
+
+    def close_stream(self, stream):
+        if stream in self._subscription_streams:
+            self._subscription_streams.remove(stream)
+            stream.subscription.unsubscribe()
+
+    def _lagging_streams(self):
+        """ Streams whose consumers fell behind, the subscribe loop waits for them before the next request """
+        return [stream for stream in list(self._subscription_streams) if stream.is_full()]
+
     # TODO: make abstract
     def _register_heartbeat_timer(self):
         self._stop_heartbeat_timer()
@@ -445,3 +562,120 @@ class TokenManager:
             return decoded_obj
         except Exception:
             raise PubNubException(pn_error=PNERR_INVALID_ACCESS_TOKEN)
+
+
+class ObjectsCacheManager:
+    """ Bounded LRU cache of App Context (Objects) read responses.
+
+    Responses younger than `ttl` seconds are served without a round trip. Older ones are revalidated with
+    `If-None-Match` when an ETag is known (either the `ETag` header or `eTag` of a single object), and the cached
+    response is reused when the server answers `304 Not Modified`. Any successful write made by this client to an
+    object drops the cached entries of that object and all cached membership and member lists.
+    """
+    CACHEABLE_OPERATIONS = (
+        PNOperationType.PNGetUuidMetadataOperation,
+        PNOperationType.PNGetChannelMetadataOperation,
+        PNOperationType.PNGetMembershipsOperation,
+        PNOperationType.PNGetChannelMembersOperation,
+    )
+    OBJECTS_PATH_PREFIX = "/v2/objects/"
+    # '', 'v2', 'objects', subscribe key, 'uuids' or 'channels', id
+    ENTITY_PATH_SEGMENTS = 6
+
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        if not config.objects_cache_size:
+            return None
+        return cls(max_entries=config.objects_cache_size, ttl=config.objects_cache_ttl)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def is_cacheable(self, options):
+        return options.operation_type in self.CACHEABLE_OPERATIONS and options.is_coalescable()
+
+    def lookup(self, options):
+        """ Returns a copy of the cached response while it is fresh. For a stale entry with a known ETag adds
+        the `If-None-Match` header to the request options and returns None. """
+        if not self.is_cacheable(options):
+            return None
+
+        key = self._key(options)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+
+            if time.monotonic() - entry['stored_at'] < self.ttl:
+                return deepcopy(entry['response'])
+            if entry['etag'] is None:
+                del self._entries[key]
+                return None
+            etag = entry['etag']
+
+        options.request_headers = {**(options.request_headers or {}), 'If-None-Match': etag}
+        return None
+
+    def not_modified(self, options):
+        """ Returns a copy of the cached response confirmed by `304 Not Modified`, None if it's gone already. """
+        with self._lock:
+            entry = self._entries.get(self._key(options))
+            if entry is None:
+                return None
+            entry['stored_at'] = time.monotonic()
+            return deepcopy(entry['response'])
+
+    @staticmethod
+    def drop_revalidation(options):
+        """ Removes the `If-None-Match` header added by `lookup`, so a `304 Not Modified` for an entry evicted in
+        the meantime can be repeated as a cache miss. Returns False when the request wasn't a revalidation. """
+        headers = options.request_headers or {}
+        if 'If-None-Match' not in headers:
+            return False
+        options.request_headers = {name: value for name, value in headers.items() if name != 'If-None-Match'}
+        return True
+
+    def update(self, options, response, etag=None):
+        """ Stores a successful read response or invalidates entries affected by a successful write. """
+        if not options.path.startswith(self.OBJECTS_PATH_PREFIX):
+            return
+        if options.method_string != "GET":
+            self.invalidate(options.path)
+            return
+        if not self.is_cacheable(options):
+            return
+
+        if etag is None and isinstance(response, dict) and isinstance(response.get('data'), dict):
+            etag = response['data'].get('eTag')
+
+        key = self._key(options)
+        with self._lock:
+            self._entries[key] = {'response': deepcopy(response), 'etag': etag, 'stored_at': time.monotonic()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, path):
+        entity_path = "/".join(path.split("/")[:self.ENTITY_PATH_SEGMENTS])
+        with self._lock:
+            for key in list(self._entries):
+                cached_path = key[0]
+                if cached_path == entity_path or cached_path.startswith(entity_path + "/") \
+                        or cached_path.count("/") >= self.ENTITY_PATH_SEGMENTS:
+                    del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @staticmethod
+    def _key(options):
+        return options.path, options.canonical_query()
@@ -77,15 +77,18 @@ class PNFetchMessagesResult(object):
 
         for key, entry in json_input['channels'].items():
             channels[key] = []
-            for item in entry:
-                try:
-                    error = None
-                    item_message = crypto_module.decrypt(item['message']) if crypto_module else item['message']
-                except Exception as decryption_error:
-                    if type(decryption_error) not in [PubNubException, binascii.Error, ValueError]:
-                        raise decryption_error
+            if crypto_module:
+                decrypted = crypto_module.decrypt_many([item['message'] for item in entry], return_exceptions=True)
+            else:
+                decrypted = [item['message'] for item in entry]
+
+            for item, item_message in zip(entry, decrypted):
+                error = None
+                if isinstance(item_message, Exception):
+                    if type(item_message) not in [PubNubException, binascii.Error, ValueError]:
+                        raise item_message
+                    error = item_message
                     item_message = item['message']
-                    error = decryption_error
 
                 message = PNFetchMessageItem(item_message, item['timetoken'], error=error)
                 if 'uuid' in item:
@@ -0,0 +1,28 @@
+class PNBulkObjectResult(object):
+    def __init__(self, id, result=None, error=None, attempts=1):
+        self.id = id
+        self.result = result
+        self.error = error
+        self.attempts = attempts
+
+    def is_error(self):
+        return self.error is not None
+
+    def __str__(self):
+        if self.is_error():
+            return "Bulk operation on %s failed after %d attempts: %s" % (self.id, self.attempts, self.error)
+        return "Bulk operation on %s: %s" % (self.id, self.result)
+
+
+class PNObjectsSyncResult(object):
+    def __init__(self):
+        self.set = []
+        self.removed = []
+        self.failed = []
+
+    def is_error(self):
+        return bool(self.failed)
+
+    def __str__(self):
+        return "Synchronization set %d, removed %d, failed requests: %d" % (
+            len(self.set), len(self.removed), len(self.failed))
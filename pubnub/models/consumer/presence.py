@@ -48,10 +48,10 @@ class PNHereNowResult:
             occupants = []
             for user in envelope['uuids']:
                 if isinstance(user, str):
-                    occupants.append(PNHereNowOccupantsData(user, None))
+                    occupants.append(PNHereNowOccupantsData(user, None, channel_names[0]))
                 else:
                     state = user['state'] if 'state' in user else None
-                    occupants.append(PNHereNowOccupantsData(user['uuid'], state))
+                    occupants.append(PNHereNowOccupantsData(user['uuid'], state, channel_names[0]))
 
             return PNHereNowResult(
                 total_channels=1,
@@ -93,11 +93,11 @@ class PNHereNowChannelData(object):
             for user in json_input['uuids']:
                 if isinstance(user, dict) and len(user) > 0:
                     if 'state' in user:
-                        occupants.append(PNHereNowOccupantsData(user['uuid'], user['state']))
+                        occupants.append(PNHereNowOccupantsData(user['uuid'], user['state'], name))
                     else:
-                        occupants.append(PNHereNowOccupantsData(user['uuid'], None))
+                        occupants.append(PNHereNowOccupantsData(user['uuid'], None, name))
                 else:
-                    occupants.append(PNHereNowOccupantsData(user, None))
+                    occupants.append(PNHereNowOccupantsData(user, None, name))
         else:
             occupants = None
 
@@ -109,9 +109,10 @@ class PNHereNowChannelData(object):
 
 
 class PNHereNowOccupantsData(object):
-    def __init__(self, uuid, state):
+    def __init__(self, uuid, state, channel_name=None):
         self.uuid = uuid
         self.state = state
+        self.channel_name = channel_name
 
     def __str__(self):
         return "HereNow Occupants Data for '%s': %s" % (self.uuid, self.state)
@@ -50,10 +50,21 @@ class PNFileMessageResult(PNMessageResult):
         self.file_id = file_id
         self.file_name = file_name
 
+    @property
+    def file_url(self):
+        """ Download URL of the file. When given as a callable, it is built on the first access and kept """
+        if callable(self._file_url):
+            self._file_url = self._file_url()
+        return self._file_url
+
+    @file_url.setter
+    def file_url(self, file_url):
+        self._file_url = file_url
+
 
 class PNPresenceEventResult(object):
     def __init__(self, event, uuid, timestamp, occupancy, subscription, channel,
-                 timetoken, state, join, leave, timeout, user_metadata=None):
+                 timetoken, state, join, leave, timeout, user_metadata=None, here_now_refresh=False):
 
         assert isinstance(event, str)
         assert isinstance(timestamp, int)
@@ -84,6 +95,8 @@ class PNPresenceEventResult(object):
 
         self.timetoken = timetoken
         self.user_metadata = user_metadata
+        # set on interval events with too many changes to list, the occupants have to be requested with here_now
+        self.here_now_refresh = here_now_refresh
 
 
 class PNMessageActionResult(PNMessageAction):
@@ -117,3 +130,20 @@ class PNFireResult(object):
 
     def __str__(self):
         return "Fire success with timetoken %s" % self.timetoken
+
+
+class PNMessageQueueStats(object):
+    def __init__(self, depth, max_size, dropped):
+        """
+        Snapshot of the queue of received messages waiting to be delivered to listeners
+
+        :param depth: number of messages currently waiting
+        :param max_size: configured bound of the queue, 0 when unbounded
+        :param dropped: number of messages dropped by the overflow policy since the client was created
+        """
+        self.depth = depth
+        self.max_size = max_size
+        self.dropped = dropped
+
+    def __str__(self):
+        return "Message queue depth %s (max %s), %s dropped" % (self.depth, self.max_size, self.dropped)
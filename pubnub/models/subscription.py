@@ -23,8 +23,112 @@ class PNSubscribable:
         return PubNubSubscription(self.pubnub, self.name, self._type, with_presence=with_presence)
 
 
+class _ChannelTrieNode:
+    __slots__ = ('children', 'exact', 'wildcard')
+
+    def __init__(self):
+        self.children = {}
+        self.exact = []
+        self.wildcard = []
+
+
+class PNSubscriptionMatcher:
+    """ Finds the subscribers interested in an event.
+
+    Channel names are stored in a trie over their dot-separated segments, so a channel is matched against all
+    exact and wildcard (`a.b.*`) subscriptions in time proportional to its number of segments. Channel groups
+    are matched by name.
+    """
+
+    def __init__(self):
+        self._root = _ChannelTrieNode()
+        self._groups = {}
+
+    @staticmethod
+    def _split(name):
+        if name.endswith('.*'):
+            return name[:-2].split('.'), True
+        return name.split('.'), False
+
+    def add(self, subscription, subscriber):
+        if subscription._type != PNSubscriptionType.CHANNEL:
+            self._groups.setdefault(subscription.name, []).append(subscriber)
+            return
+
+        segments, is_wildcard = self._split(subscription.name)
+        node = self._root
+        for segment in segments:
+            node = node.children.setdefault(segment, _ChannelTrieNode())
+        (node.wildcard if is_wildcard else node.exact).append(subscriber)
+
+    def remove(self, subscription, subscriber=None):
+        """ Removes the subscriber (or every subscriber, when not given) registered for the subscription name """
+        if subscription._type != PNSubscriptionType.CHANNEL:
+            self.remove_group(subscription.name, subscriber)
+        else:
+            self.remove_channel(subscription.name, subscriber)
+
+    def remove_group(self, name, subscriber=None):
+        subscribers = self._groups.get(name, [])
+        if subscriber is None:
+            subscribers.clear()
+        elif subscriber in subscribers:
+            subscribers.remove(subscriber)
+        if not subscribers:
+            self._groups.pop(name, None)
+
+    def remove_channel(self, name, subscriber=None):
+        segments, is_wildcard = self._split(name)
+        path = [self._root]
+        for segment in segments:
+            node = path[-1].children.get(segment)
+            if node is None:
+                return
+            path.append(node)
+
+        subscribers = path[-1].wildcard if is_wildcard else path[-1].exact
+        if subscriber is None:
+            subscribers.clear()
+        elif subscriber in subscribers:
+            subscribers.remove(subscriber)
+
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.children or node.exact or node.wildcard:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+
+    def clear(self):
+        self._root = _ChannelTrieNode()
+        self._groups = {}
+
+    def match(self, event) -> list:
+        """ Subscribers of the event channel (exact ones first, then wildcards), followed by subscribers of
+        the channel group the event was received through """
+        matched = []
+        channel = getattr(event, 'channel', None)
+        if channel is not None:
+            wildcards = []
+            node = self._root
+            for segment in channel.split('.'):
+                if node.wildcard:
+                    wildcards += node.wildcard
+                node = node.children.get(segment)
+                if node is None:
+                    break
+            else:
+                matched += node.exact
+            matched += reversed(wildcards)
+
+        subscription = getattr(event, 'subscription', None)
+        if subscription is not None and self._groups:
+            matched += self._groups.get(subscription, ())
+        return matched
+
+
 class PNEventEmitter:
     on_message: callable
+    on_messages: callable
     on_signal: callable
     on_presence: callable
     on_channel_metadata: callable
@@ -36,14 +140,10 @@ class PNEventEmitter:
     def is_matching_listener(self, message):
         def wildcard_match(name, subscription):
             return subscription.endswith('.*') and name.startswith(subscription.strip('*'))
-        if isinstance(self, PubNubSubscriptionSet):
-            return any([subscription_item.is_matching_listener(message)
-                        for subscription_item in self.get_subscription_items()])
+        if self._type == PNSubscriptionType.CHANNEL:
+            return message.channel == self.name or wildcard_match(message.channel, self.name)
         else:
-            if self._type == PNSubscriptionType.CHANNEL:
-                return message.channel == self.name or wildcard_match(message.channel, self.name)
-            else:
-                return message.subscription == self.name
+            return message.subscription == self.name
 
     def presence(self, presence):
         if not hasattr(self, 'on_presence') or not (hasattr(self, 'with_presence') and self.with_presence):
@@ -53,8 +153,23 @@ class PNEventEmitter:
             self.on_presence(presence)
 
     def message(self, message):
-        if self.is_matching_listener(message) and hasattr(self, 'on_message'):
+        if not self.is_matching_listener(message):
+            return
+        if hasattr(self, 'on_message'):
             self.on_message(message)
+        elif hasattr(self, 'on_messages'):
+            self.on_messages([message])
+
+    def messages(self, messages):
+        """ Delivers messages of one subscribe response, to `on_messages` when set or one by one to `on_message` """
+        if not hasattr(self, 'on_messages'):
+            for message in messages:
+                self.message(message)
+            return
+
+        matching = [message for message in messages if self.is_matching_listener(message)]
+        if matching:
+            self.on_messages(matching)
 
     def message_action(self, message_action):
         if self.is_matching_listener(message_action) and hasattr(self, 'on_message_action'):
@@ -64,6 +179,13 @@ class PNEventEmitter:
         if self.is_matching_listener(signal) and hasattr(self, 'on_signal'):
             self.on_signal(signal)
 
+    def stream(self, maxsize: int = 100):
+        """ Subscribes and returns a stream of received messages, iterated with `for` on PubNub and `async for`
+        on PubNubAsyncio. The stream takes over `on_messages` and unsubscribes when closed. """
+        if self.subscription_manager is None:
+            raise Exception("Subscription manager is not enabled for this instance")
+        return self.subscription_manager.open_stream(self, maxsize)
+
 
 class PNSubscribeCapable:
     def subscribe(self, timetoken: Optional[int] = None, region: Optional[str] = None):
@@ -96,9 +218,59 @@ class PubNubSubscriptionSet(PNEventEmitter, PNSubscribeCapable):
         self.subscription_manager = pubnub_instance._subscription_manager
         self.subscriptions = subscriptions
 
+    @property
+    def subscriptions(self) -> List[PubNubSubscription]:
+        return self._subscriptions
+
+    @subscriptions.setter
+    def subscriptions(self, subscriptions: List[PubNubSubscription]):
+        self._subscriptions = subscriptions
+        self._matcher = None
+
     def get_subscription_items(self):
         return [item for item in self.subscriptions]
 
+    def is_matching_listener(self, message):
+        if self._matcher is None:
+            matcher = PNSubscriptionMatcher()
+            for subscription in self.subscriptions:
+                matcher.add(subscription, subscription)
+            self._matcher = matcher
+        return len(self._matcher.match(message)) > 0
+
+
+class PNSubscriptionStream:
+    """ Buffers messages of a subscription until they are iterated. While `maxsize` or more messages wait in the
+    buffer the subscribe loop stops requesting new ones. Messages already received are still buffered, so the buffer
+    can outgrow `maxsize` by about one subscribe response. `maxsize` of 0 disables the limit. """
+
+    def __init__(self, subscription_manager, subscription: PNEventEmitter, maxsize: int = 100) -> None:
+        self.subscription_manager = subscription_manager
+        self.subscription = subscription
+        self.maxsize = maxsize
+        self.closed = False
+        subscription.on_messages = self._put_messages
+
+    def is_full(self) -> bool:
+        return 0 < self.maxsize <= self.qsize()
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        self.subscription_manager.close_stream(self)
+        self._wake()
+
+    def qsize(self) -> int:
+        raise NotImplementedError
+
+    def _put_messages(self, messages):
+        raise NotImplementedError
+
+    def _wake(self):
+        """ Ends the iteration once the buffered messages are consumed """
+        raise NotImplementedError
+
 
 class PubNubChannel(PNSubscribable):
     _type = PNSubscriptionType.CHANNEL
@@ -137,6 +309,9 @@ class PNSubscriptionRegistry:
         self.subscription_registry_callback = None
         self.with_presence = None
         self.subscriptions = []
+        # Event emitters (subscriptions and the sets they belong to) indexed by what they match, so dispatching
+        # an event only visits the emitters interested in its channel or channel group
+        self._matcher = PNSubscriptionMatcher()
 
     def __add_subscription(self, subscription: PubNubSubscription, subscription_set: PubNubSubscriptionSet = None):
         names_added = []
@@ -153,13 +328,16 @@ class PNSubscriptionRegistry:
 
         for name in subscription.get_names_with_presence():
             if name not in subscription_list:
-                subscription_list[name] = subscriptions
+                subscription_list[name] = list(subscriptions)
                 names_added.append(name)
             else:
                 subscription_list[name].extend(subscriptions)
+
+        for emitter in subscriptions:
+            self._matcher.add(subscription, emitter)
         return names_added
 
-    def __remove_subscription(self, subscription: PubNubSubscription):
+    def __remove_subscription(self, subscription: PubNubSubscription, subscription_set: PubNubSubscriptionSet = None):
         names_removed = {'channels': [],
                          'groups': []}
 
@@ -175,9 +353,15 @@ class PNSubscriptionRegistry:
         for name in subscription.get_names_with_presence():
             if name in subscription_list and subscription in subscription_list[name]:
                 subscription_list[name].remove(subscription)
+                if subscription_set in subscription_list[name]:
+                    subscription_list[name].remove(subscription_set)
                 if len(subscription_list[name]) == 0:
                     removed.append(name)
 
+        self._matcher.remove(subscription, subscription)
+        if subscription_set is not None:
+            self._matcher.remove(subscription, subscription_set)
+
         return names_removed
 
     def add(self, subscription: Union[PubNubSubscription, PubNubSubscriptionSet]) -> list:
@@ -214,7 +398,7 @@ class PNSubscriptionRegistry:
 
         if isinstance(subscription, PubNubSubscriptionSet):
             for subscription_part in subscription.subscriptions:
-                names_changed = self.__remove_subscription(subscription_part)
+                names_changed = self.__remove_subscription(subscription_part, subscription)
                 channels_changed += names_changed['channels']
                 groups_changed += names_changed['groups']
         else:
@@ -252,6 +436,15 @@ class PNSubscriptionRegistry:
             listeners += self.global_listeners
         return set(listeners)
 
+    def get_listeners_for(self, event):
+        """ Emitters matching the event channel or subscription, followed by global listeners.
+        Events not bound to a channel go to all listeners. """
+        channel = getattr(event, 'channel', None)
+        if channel is None:
+            return self.get_all_listeners()
+
+        return dict.fromkeys(self._matcher.match(event) + self.global_listeners)
+
     def add_listener(self, listener):
         assert isinstance(listener, SubscribeCallback)
         self.global_listeners.append(listener)
@@ -268,11 +461,13 @@ class PNSubscriptionRegistry:
         self.pubnub._subscription_manager.adapt_unsubscribe_builder(unsubscribe_operation)
         self.channels = []
         self.channel_groups = []
+        self._matcher.clear()
 
     def unsubscribe(self, channels=None, groups=None):
         presence_channels = []
         for channel in channels:
             del self.channels[channel]
+            self._matcher.remove_channel(channel)
             if f'{channel}-pnpres' in self.channels:
                 del self.channels[f'{channel}-pnpres']
                 presence_channels.append(f'{channel}-pnpres')
@@ -280,6 +475,7 @@ class PNSubscriptionRegistry:
         presence_groups = []
         for group in groups:
             del self.channel_groups[group]
+            self._matcher.remove_group(group)
             if f'{group}-pnpres' in self.channel_groups:
                 del self.channel_groups[f'{group}-pnpres']
                 presence_groups.append(f'{group}-pnpres')
@@ -300,33 +496,46 @@ class PNSubscriptionRegistryCallback(SubscribeCallback):
         pass
 
     def presence(self, _, presence):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(presence):
             listener.presence(presence)
 
     def message(self, _, message):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(message):
             listener.message(message)
 
+    def messages(self, _, messages):
+        batches = {}
+        for message in messages:
+            for listener in self.subscription_registry.get_listeners_for(message):
+                batches.setdefault(listener, []).append(message)
+
+        for listener, batch in batches.items():
+            if isinstance(listener, PNEventEmitter):
+                listener.messages(batch)
+            else:
+                for message in batch:
+                    listener.message(message)
+
     def signal(self, _, signal):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(signal):
             listener.signal(signal)
 
     def channel(self, _, channel):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(channel):
             listener.channel(channel)
 
     def uuid(self, pubnub, uuid):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(uuid):
             listener.uuid(uuid)
 
     def membership(self, _, membership):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(membership):
             listener.membership(membership)
 
     def message_action(self, _, message_action):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(message_action):
             listener.message_action(message_action)
 
     def file(self, _, file_message):
-        for listener in self.subscription_registry.get_all_listeners():
+        for listener in self.subscription_registry.get_listeners_for(file_message):
             listener.file_message(file_message)
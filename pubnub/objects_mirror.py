@@ -0,0 +1,268 @@
+"""Local mirror of App Context (Objects) metadata and memberships.
+
+The mirror is a subscribe listener. It is seeded with paginated `get_all_*` requests and then kept current by
+the `uuid`, `channel` and `membership` events received on the subscribed channels, so lookups are served from
+memory (or a local SQLite database) without a round trip.
+
+Example:
+    ```python
+    mirror = ObjectsMirror()
+    pubnub.add_listener(mirror)
+    pubnub.subscribe().channels(["room-1", "room-2"]).execute()
+    mirror.seed(pubnub, memberships_of=["user-1"])
+
+    author = mirror.uuid_metadata(message.publisher)
+    ```
+"""
+import json
+import sqlite3
+import threading
+
+from contextlib import contextmanager
+
+from pubnub.callbacks import SubscribeCallback
+from pubnub.models.consumer.objects_v2.common import MembershipIncludes
+
+
+class ObjectsMemoryStore:
+    """ Keeps the mirrored objects in dictionaries, memberships are indexed both by UUID and by channel """
+
+    def __init__(self):
+        self._objects = {'uuid': {}, 'channel': {}}
+        self._memberships = {}
+        self._members = {}
+
+    def get(self, kind, id):
+        return self._objects[kind].get(id)
+
+    def put(self, kind, id, data):
+        self._objects[kind][id] = data
+
+    def remove(self, kind, id):
+        self._objects[kind].pop(id, None)
+
+    def get_membership(self, uuid, channel):
+        return self._memberships.get(uuid, {}).get(channel)
+
+    def put_membership(self, uuid, channel, data):
+        self._memberships.setdefault(uuid, {})[channel] = data
+        self._members.setdefault(channel, {})[uuid] = data
+
+    def remove_membership(self, uuid, channel):
+        self._memberships.get(uuid, {}).pop(channel, None)
+        self._members.get(channel, {}).pop(uuid, None)
+
+    def memberships(self, uuid):
+        return dict(self._memberships.get(uuid, {}))
+
+    def members(self, channel):
+        return dict(self._members.get(channel, {}))
+
+
+class ObjectsSQLiteStore:
+    """ Keeps the mirrored objects in a SQLite database, which can outlive the process when `path` is a file """
+
+    def __init__(self, path=':memory:'):
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.executescript("""
+                CREATE TABLE IF NOT EXISTS objects (kind TEXT, id TEXT, data TEXT, PRIMARY KEY (kind, id));
+                CREATE TABLE IF NOT EXISTS memberships (
+                    uuid TEXT, channel TEXT, data TEXT, PRIMARY KEY (uuid, channel));
+                CREATE INDEX IF NOT EXISTS memberships_channel ON memberships (channel);
+            """)
+
+    def _fetch_one(self, query, *params):
+        row = self._db.execute(query, params).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _execute(self, query, *params):
+        with self._db:
+            self._db.execute(query, params)
+
+    def get(self, kind, id):
+        return self._fetch_one("SELECT data FROM objects WHERE kind = ? AND id = ?", kind, id)
+
+    def put(self, kind, id, data):
+        self._execute("INSERT OR REPLACE INTO objects VALUES (?, ?, ?)", kind, id, json.dumps(data))
+
+    def remove(self, kind, id):
+        self._execute("DELETE FROM objects WHERE kind = ? AND id = ?", kind, id)
+
+    def get_membership(self, uuid, channel):
+        return self._fetch_one("SELECT data FROM memberships WHERE uuid = ? AND channel = ?", uuid, channel)
+
+    def put_membership(self, uuid, channel, data):
+        self._execute("INSERT OR REPLACE INTO memberships VALUES (?, ?, ?)", uuid, channel, json.dumps(data))
+
+    def remove_membership(self, uuid, channel):
+        self._execute("DELETE FROM memberships WHERE uuid = ? AND channel = ?", uuid, channel)
+
+    def memberships(self, uuid):
+        rows = self._db.execute("SELECT channel, data FROM memberships WHERE uuid = ?", (uuid,))
+        return {channel: json.loads(data) for channel, data in rows}
+
+    def members(self, channel):
+        rows = self._db.execute("SELECT uuid, data FROM memberships WHERE channel = ?", (channel,))
+        return {uuid: json.loads(data) for uuid, data in rows}
+
+
+class ObjectsMirror(SubscribeCallback):
+    """ Mirror of UUID metadata, channel metadata and memberships, updated from App Context events.
+
+    Events only arrive for the channels this client is subscribed to, the mirror is as complete as that
+    subscription. An event is ignored when the mirrored object was updated later (by its `updated` timestamp),
+    so the events received while seeding are not overwritten by older listed data. Objects and memberships
+    deleted while seeding are remembered until the seed ends, so listed data doesn't bring them back.
+    """
+
+    def __init__(self, store=None):
+        self._store = store or ObjectsMemoryStore()
+        self._lock = threading.Lock()
+        self._seeds = 0
+        self._deleted = set()
+
+    def uuid_metadata(self, uuid):
+        with self._lock:
+            return self._store.get('uuid', uuid)
+
+    def channel_metadata(self, channel):
+        with self._lock:
+            return self._store.get('channel', channel)
+
+    def memberships(self, uuid):
+        """ Memberships of `uuid` keyed by channel """
+        with self._lock:
+            return self._store.memberships(uuid)
+
+    def channel_members(self, channel):
+        """ Memberships in `channel` keyed by UUID """
+        with self._lock:
+            return self._store.members(channel)
+
+    def seed(self, pubnub, memberships_of=(), members_of=()):
+        """ Loads the metadata of all UUIDs and channels, the memberships of UUIDs `memberships_of` and the
+        members of channels `members_of` """
+        with self._seeding():
+            for uuid in pubnub.get_all_uuid_metadata(include_custom=True).iterate():
+                self._set_object('uuid', uuid, listed=True)
+            for channel in pubnub.get_all_channel_metadata(include_custom=True).iterate():
+                self._set_object('channel', channel, listed=True)
+            for uuid in memberships_of:
+                for membership in self._memberships_request(pubnub, uuid).iterate():
+                    self._set_membership({**membership, 'uuid': {'id': uuid}}, listed=True)
+            for channel in members_of:
+                for member in self._members_request(pubnub, channel).iterate():
+                    self._set_membership({**member, 'channel': {'id': channel}}, listed=True)
+
+    async def aseed(self, pubnub, memberships_of=(), members_of=()):
+        """ Asyncio counterpart of `seed` """
+        with self._seeding():
+            async for uuid in pubnub.get_all_uuid_metadata(include_custom=True).aiterate():
+                self._set_object('uuid', uuid, listed=True)
+            async for channel in pubnub.get_all_channel_metadata(include_custom=True).aiterate():
+                self._set_object('channel', channel, listed=True)
+            for uuid in memberships_of:
+                async for membership in self._memberships_request(pubnub, uuid).aiterate():
+                    self._set_membership({**membership, 'uuid': {'id': uuid}}, listed=True)
+            for channel in members_of:
+                async for member in self._members_request(pubnub, channel).aiterate():
+                    self._set_membership({**member, 'channel': {'id': channel}}, listed=True)
+
+    @contextmanager
+    def _seeding(self):
+        with self._lock:
+            self._seeds += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._seeds -= 1
+                if not self._seeds:
+                    self._deleted.clear()
+
+    def _tombstone(self, key):
+        """ Remembers a deletion while a seed is in progress, the lock must be held """
+        if self._seeds:
+            self._deleted.add(key)
+
+    @staticmethod
+    def _memberships_request(pubnub, uuid):
+        return pubnub.get_memberships(uuid=uuid, include=MembershipIncludes(custom=True, status=True, type=True))
+
+    @staticmethod
+    def _members_request(pubnub, channel):
+        return pubnub.get_channel_members(channel=channel, include_custom=True)
+
+    def status(self, pubnub, status):
+        pass
+
+    def message(self, pubnub, message):
+        pass
+
+    def presence(self, pubnub, presence):
+        pass
+
+    def uuid(self, pubnub, uuid):
+        self._apply_object_event('uuid', uuid)
+
+    def channel(self, pubnub, channel):
+        self._apply_object_event('channel', channel)
+
+    def membership(self, pubnub, membership):
+        if membership.event == 'delete':
+            uuid, channel = membership.data['uuid']['id'], membership.data['channel']['id']
+            with self._lock:
+                self._store.remove_membership(uuid, channel)
+                self._tombstone(('membership', uuid, channel))
+        else:
+            self._set_membership(membership.data, merge=True)
+
+    def _apply_object_event(self, kind, event):
+        if event.event != 'delete':
+            self._set_object(kind, event.data, merge=True)
+            return
+
+        id = event.data['id']
+        with self._lock:
+            self._store.remove(kind, id)
+            self._tombstone((kind, id))
+            # memberships of a removed object are removed with it
+            related = self._store.memberships(id) if kind == 'uuid' else self._store.members(id)
+            for other in related:
+                if kind == 'uuid':
+                    self._store.remove_membership(id, other)
+                else:
+                    self._store.remove_membership(other, id)
+
+    @staticmethod
+    def _is_outdated(current, data):
+        if not current or not current.get('updated') or not data.get('updated'):
+            return False
+        return current['updated'] > data['updated']
+
+    def _is_deleted(self, listed, *keys):
+        """ Listed data of a deleted object is dropped, an event setting it again ends the deletion """
+        if listed:
+            return any(key in self._deleted for key in keys)
+        self._deleted.difference_update(keys[:1])
+        return False
+
+    def _set_object(self, kind, data, merge=False, listed=False):
+        with self._lock:
+            if self._is_deleted(listed, (kind, data['id'])):
+                return
+            current = self._store.get(kind, data['id'])
+            if self._is_outdated(current, data):
+                return
+            self._store.put(kind, data['id'], {**current, **data} if merge and current else data)
+
+    def _set_membership(self, data, merge=False, listed=False):
+        uuid, channel = data['uuid']['id'], data['channel']['id']
+        with self._lock:
+            if self._is_deleted(listed, ('membership', uuid, channel), ('uuid', uuid), ('channel', channel)):
+                return
+            current = self._store.get_membership(uuid, channel)
+            if self._is_outdated(current, data):
+                return
+            self._store.put_membership(uuid, channel, {**current, **data} if merge and current else data)
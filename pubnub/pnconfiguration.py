@@ -2,9 +2,11 @@ import warnings
 from typing import Any, Optional
 from copy import deepcopy
 from Cryptodome.Cipher import AES
-from pubnub.enums import PNHeartbeatNotificationOptions, PNReconnectionPolicy
+from pubnub.enums import PNHeartbeatNotificationOptions, PNReconnectionPolicy, PNRequestRejectionPolicy, \
+    PNMessageQueueOverflowPolicy
 from pubnub.exceptions import PubNubException
 from pubnub.crypto import PubNubCrypto, LegacyCryptoModule, PubNubCryptoModule
+from pubnub.json_codec import PubNubJsonCodec, get_default_codec
 
 
 class PNConfiguration(object):
@@ -44,6 +46,16 @@ class PNConfiguration(object):
         self.reconnection_interval = None  # if None is left the default value from LinearDelay/ExponentialDelay is used
         self.maximum_reconnection_interval = None  # if None the default value from ExponentialDelay is used
         self.daemon = False
+        self.request_thread_pool_size = None  # None starts a new thread for every asynchronous request
+        self.request_queue_size = 1000  # pending requests accepted by the pool, 0 means unbounded
+        self.request_rejection_policy = PNRequestRejectionPolicy.ABORT
+        self.coalesce_read_requests = False  # identical concurrent GET requests share one round trip
+        self.objects_cache_size = 0  # max cached App Context read responses, 0 disables the cache
+        self.objects_cache_ttl = 30  # seconds a cached App Context response is served without revalidation
+        self.message_queue_size = 0  # max received messages waiting for each worker thread, 0 means unbounded
+        self.message_queue_overflow_policy = PNMessageQueueOverflowPolicy.BLOCK
+        self.message_worker_threads = 1  # native client threads running listeners, messages are routed by channel
+        self.decryption_thread_pool_size = None  # None decrypts received messages one by one on the listener worker
         self.use_random_initialization_vector = True
         self.suppress_leave_events = False
         self.should_compress = False
@@ -54,6 +66,7 @@ class PNConfiguration(object):
         self.cryptor = None
         self.file_cryptor = None
         self._crypto_module = None
+        self._json_codec = None
         self.disable_config_locking = True
         self._locked = False
 
@@ -146,6 +159,15 @@ class PNConfiguration(object):
     def crypto_module(self, crypto_module: PubNubCryptoModule):
         self._crypto_module = crypto_module
 
+    @property
+    def json_codec(self) -> PubNubJsonCodec:
+        """Codec for outgoing payloads and responses. Defaults to the fastest installed JSON library."""
+        return self._json_codec or get_default_codec()
+
+    @json_codec.setter
+    def json_codec(self, json_codec: PubNubJsonCodec):
+        self._json_codec = json_codec
+
     @property
     def port(self):
         return 443 if self.ssl == "https" else 80
@@ -194,7 +216,7 @@ class PNConfiguration(object):
         if name in ['uuid', 'user_id']:
             PNConfiguration.validate_not_empty_string(value)
             self.__dict__['_uuid'] = value
-        elif name in ['cipher_mode', 'fallback_cipher_mode', 'crypto_module']:
+        elif name in ['cipher_mode', 'fallback_cipher_mode', 'crypto_module', 'json_codec']:
             self.__dict__[f'_{name}'] = value
         else:
             self.__dict__[name] = value
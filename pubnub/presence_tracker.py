@@ -0,0 +1,209 @@
+"""Client-side occupancy of channels kept current by presence events.
+
+The tracker is a subscribe listener. It is seeded with `here_now` and then applies the `join`, `leave`,
+`timeout`, `state-change` and `interval` presence events of the subscribed channels, so occupancy and occupant
+queries are answered from memory. The occupants are periodically reconciled with `here_now`, which also
+repairs channels whose interval events were too large to list their changes.
+
+Example:
+    ```python
+    tracker = PresenceTracker()
+    pubnub.add_listener(tracker)
+    pubnub.subscribe().channels(["room-1"]).with_presence().execute()
+    tracker.seed(pubnub, ["room-1"])
+    tracker.start(pubnub)
+
+    if tracker.is_present("room-1", "user-1"):
+        ...
+    ```
+"""
+import asyncio
+import logging
+import threading
+import time
+
+from pubnub.callbacks import SubscribeCallback
+
+logger = logging.getLogger("pubnub")
+
+# seconds between reconciliations of all tracked channels with here_now
+PRESENCE_RECONCILE_INTERVAL = 300
+# seconds between checks for channels to refresh, asyncio only
+PRESENCE_REFRESH_CHECK_INTERVAL = 1
+
+
+class PresenceTracker(SubscribeCallback):
+    """ Occupants of channels with their state, updated from presence events. """
+
+    def __init__(self):
+        self._occupants = {}
+        self._occupancy = {}
+        self._stale = set()
+        # presence events received while seeds are in progress, by channel, applied on top of their snapshots
+        self._seed_events = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._task = None
+
+    def channels(self):
+        with self._lock:
+            return list(self._occupants)
+
+    def occupancy(self, channel):
+        """ Number of occupants of `channel` as last reported by the service, 0 for untracked channels """
+        with self._lock:
+            return self._occupancy.get(channel, 0)
+
+    def is_present(self, channel, uuid):
+        with self._lock:
+            return uuid in self._occupants.get(channel, ())
+
+    def state(self, channel, uuid):
+        with self._lock:
+            return self._occupants.get(channel, {}).get(uuid)
+
+    def occupants(self, channel):
+        """ Occupants of `channel` mapped to their state """
+        with self._lock:
+            return dict(self._occupants.get(channel, {}))
+
+    def stale_channels(self):
+        """ Channels whose occupants are not known since an interval event, until they are reconciled """
+        with self._lock:
+            return set(self._stale)
+
+    def seed(self, pubnub, channels):
+        """ Replaces the occupants of `channels` with the ones returned by here_now """
+        channels = list(channels)
+        if not channels:
+            return
+        occupants = {channel: {} for channel in channels}
+        events = self._record_events(channels)
+        try:
+            for occupant in pubnub.here_now().channels(channels).include_state(True).iterate():
+                occupants.setdefault(occupant.channel_name, {})[occupant.uuid] = occupant.state
+        finally:
+            self._stop_recording(events)
+        self._replace(occupants, events)
+
+    async def aseed(self, pubnub, channels):
+        """ Asyncio counterpart of `seed` """
+        channels = list(channels)
+        if not channels:
+            return
+        occupants = {channel: {} for channel in channels}
+        events = self._record_events(channels)
+        try:
+            async for occupant in pubnub.here_now().channels(channels).include_state(True).aiterate():
+                occupants.setdefault(occupant.channel_name, {})[occupant.uuid] = occupant.state
+        finally:
+            self._stop_recording(events)
+        self._replace(occupants, events)
+
+    def _record_events(self, channels):
+        events = {channel: [] for channel in channels}
+        with self._lock:
+            self._seed_events.append(events)
+        return events
+
+    def _stop_recording(self, events):
+        with self._lock:
+            self._seed_events.remove(events)
+
+    def _replace(self, occupants, events):
+        """ Replaces the occupants with a here_now snapshot, the events received while it was fetched are
+        applied on top of it, as the snapshot may predate them """
+        with self._lock:
+            for channel, present in occupants.items():
+                refresh = False
+                for presence in events.get(channel, ()):
+                    self._apply(present, presence)
+                    refresh = refresh or presence.here_now_refresh
+                self._occupants[channel] = present
+                self._occupancy[channel] = len(present)
+                if not refresh:
+                    self._stale.discard(channel)
+
+    def start(self, pubnub, interval=PRESENCE_RECONCILE_INTERVAL):
+        """ Reconciles the tracked channels every `interval` seconds, and stale channels right away, on a daemon
+        thread until `stop` is called """
+        self._stopped.clear()
+        threading.Thread(target=self._reconcile, args=(pubnub, interval), name="pubnub-presence-tracker",
+                         daemon=True).start()
+
+    def astart(self, pubnub, interval=PRESENCE_RECONCILE_INTERVAL):
+        """ Asyncio counterpart of `start`, reconciliation runs in a task """
+        self._stopped.clear()
+        self._task = asyncio.ensure_future(self._areconcile(pubnub, interval))
+        return self._task
+
+    def stop(self):
+        self._stopped.set()
+        self._wake.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _channels_to_reconcile(self, reconcile_at):
+        if time.monotonic() >= reconcile_at:
+            return self.channels(), True
+        return self.stale_channels(), False
+
+    def _reconcile(self, pubnub, interval):
+        reconcile_at = time.monotonic() + interval
+        while True:
+            self._wake.wait(max(0, reconcile_at - time.monotonic()))
+            self._wake.clear()
+            if self._stopped.is_set():
+                return
+            channels, all_channels = self._channels_to_reconcile(reconcile_at)
+            if all_channels:
+                reconcile_at = time.monotonic() + interval
+            try:
+                self.seed(pubnub, channels)
+            except Exception as e:
+                logger.warning("Presence tracker could not reconcile channels %s: %s" % (channels, e))
+
+    async def _areconcile(self, pubnub, interval):
+        reconcile_at = time.monotonic() + interval
+        while not self._stopped.is_set():
+            await asyncio.sleep(max(0, min(reconcile_at - time.monotonic(), PRESENCE_REFRESH_CHECK_INTERVAL)))
+            channels, all_channels = self._channels_to_reconcile(reconcile_at)
+            if all_channels:
+                reconcile_at = time.monotonic() + interval
+            try:
+                await self.aseed(pubnub, channels)
+            except Exception as e:
+                logger.warning("Presence tracker could not reconcile channels %s: %s" % (channels, e))
+
+    def status(self, pubnub, status):
+        pass
+
+    def message(self, pubnub, message):
+        pass
+
+    def presence(self, pubnub, presence):
+        with self._lock:
+            self._apply(self._occupants.setdefault(presence.channel, {}), presence)
+            self._occupancy[presence.channel] = presence.occupancy
+            if presence.here_now_refresh:
+                self._stale.add(presence.channel)
+                self._wake.set()
+            for events in self._seed_events:
+                if presence.channel in events:
+                    events[presence.channel].append(presence)
+
+    @staticmethod
+    def _apply(occupants, presence):
+        if presence.event == 'join':
+            occupants[presence.uuid] = presence.state
+        elif presence.event in ('leave', 'timeout'):
+            occupants.pop(presence.uuid, None)
+        elif presence.event == 'state-change':
+            occupants[presence.uuid] = presence.state
+        elif presence.event == 'interval':
+            for uuid in presence.join or ():
+                occupants.setdefault(uuid, None)
+            for uuid in (presence.leave or []) + (presence.timeout or []):
+                occupants.pop(uuid, None)
@@ -58,19 +58,25 @@ import logging
 import threading
 import os
 
-from typing import Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Type
 from threading import Event
-from queue import Queue, Empty
+from queue import Queue, Empty, Full
 from pubnub import utils
 from pubnub.request_handlers.base import BaseRequestHandler
 from pubnub.request_handlers.httpx import HttpxRequestHandler
 from pubnub.callbacks import SubscribeCallback, ReconnectionCallback
+from pubnub.endpoints.file_operations.send_file import SendFileNative, SEND_FILES_CONCURRENCY
+from pubnub.endpoints.objects_v2.bulk import bulk_requests, apply_changes, members_changes, members_request, \
+    memberships_changes, memberships_request, BULK_OBJECTS_CONCURRENCY
 from pubnub.endpoints.presence.heartbeat import Heartbeat
 from pubnub.endpoints.presence.leave import Leave
 from pubnub.endpoints.pubsub.subscribe import Subscribe
 from pubnub.enums import PNStatusCategory, PNHeartbeatNotificationOptions, PNOperationType, PNReconnectionPolicy
-from pubnub.managers import SubscriptionManager, ReconnectionManager
+from pubnub.managers import SubscriptionManager, ReconnectionManager, MessageQueueOverflow
 from pubnub.models.consumer.common import PNStatus
+from pubnub.models.consumer.objects_v2.bulk import PNBulkObjectResult, PNObjectsSyncResult
+from pubnub.models.subscription import PNSubscriptionStream
 from pubnub.pnconfiguration import PNConfiguration
 from pubnub.pubnub_core import PubNubCore
 from pubnub.structures import PlatformOptions
@@ -204,6 +210,141 @@ class PubNub(PubNubCore):
     def merge_in_params(self, options):
         options.merge_params_in({})
 
+    def send_files(self, files: List[SendFileNative], concurrency: int = SEND_FILES_CONCURRENCY) -> List:
+        """Send a batch of files, up to `concurrency` of them at the same time.
+
+        Every file still goes through its upload details, upload and file message requests in order,
+        the requests of different files overlap and share the HTTP connections of this instance.
+
+        Args:
+            files (List[SendFileNative]): File senders configured with `send_file()`, not executed yet.
+            concurrency (int): Maximum number of files being sent at the same time.
+
+        Returns:
+            List: For every file, in the order of `files`, its `PNSendFileResult` or the exception
+            which failed it. A failed file doesn't stop the others.
+
+        Example:
+            ```python
+            results = pubnub.send_files([
+                pubnub.send_file().channel("room-1").file_name(name).file_path(name) for name in names
+            ])
+            ```
+        """
+        def send(file):
+            try:
+                return file.sync().result
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="pubnub-send-files") as executor:
+            return list(executor.map(send, files))
+
+    def bulk_set_uuid_metadata(self, entities: Iterable[dict],
+                               concurrency: int = BULK_OBJECTS_CONCURRENCY) -> Iterator[PNBulkObjectResult]:
+        """Set metadata of many UUIDs, up to `concurrency` requests at the same time.
+
+        Entities are read from `entities` only as requests complete, so it can be a generator over a large
+        data set. Throttled (HTTP 429) and failed (HTTP 5xx) requests are retried, and all requests slow down
+        until the service accepts them again.
+
+        Args:
+            entities (Iterable[dict]): Keyword arguments of `set_uuid_metadata()` for every UUID,
+                e.g. `{"uuid": "user-1", "name": "Ann", "custom": {"team": "red"}}`.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            Iterator[PNBulkObjectResult]: The outcome of every UUID in the order of completion. The requests
+            are made while the iterator is consumed.
+
+        Example:
+            ```python
+            for outcome in pubnub.bulk_set_uuid_metadata({"uuid": user.id, "name": user.name} for user in users):
+                if outcome.is_error():
+                    print(outcome)
+            ```
+        """
+        return bulk_requests((self.set_uuid_metadata(**entity) for entity in entities), concurrency)
+
+    def bulk_set_channel_metadata(self, entities: Iterable[dict],
+                                  concurrency: int = BULK_OBJECTS_CONCURRENCY) -> Iterator[PNBulkObjectResult]:
+        """Set metadata of many channels, works as `bulk_set_uuid_metadata()`.
+
+        Args:
+            entities (Iterable[dict]): Keyword arguments of `set_channel_metadata()` for every channel.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            Iterator[PNBulkObjectResult]: The outcome of every channel in the order of completion.
+        """
+        return bulk_requests((self.set_channel_metadata(**entity) for entity in entities), concurrency)
+
+    def bulk_remove_uuid_metadata(self, uuids: Iterable[str],
+                                  concurrency: int = BULK_OBJECTS_CONCURRENCY) -> Iterator[PNBulkObjectResult]:
+        """Remove metadata of many UUIDs, works as `bulk_set_uuid_metadata()`.
+
+        Args:
+            uuids (Iterable[str]): UUIDs to remove the metadata of.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            Iterator[PNBulkObjectResult]: The outcome of every UUID in the order of completion.
+        """
+        return bulk_requests((self.remove_uuid_metadata(uuid=uuid) for uuid in uuids), concurrency)
+
+    def bulk_remove_channel_metadata(self, channels: Iterable[str],
+                                     concurrency: int = BULK_OBJECTS_CONCURRENCY) -> Iterator[PNBulkObjectResult]:
+        """Remove metadata of many channels, works as `bulk_set_uuid_metadata()`.
+
+        Args:
+            channels (Iterable[str]): Channels to remove the metadata of.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            Iterator[PNBulkObjectResult]: The outcome of every channel in the order of completion.
+        """
+        return bulk_requests((self.remove_channel_metadata(channel=channel) for channel in channels), concurrency)
+
+    def sync_memberships(self, uuid: str, channels: Iterable,
+                         concurrency: int = BULK_OBJECTS_CONCURRENCY) -> PNObjectsSyncResult:
+        """Make the channel memberships of a UUID match `channels`.
+
+        The current memberships are listed page by page and compared with `channels`. Only missing
+        memberships, memberships with different custom data, status or type, and memberships not in
+        `channels` are changed. The changes are sent in `manage_memberships` requests of up to 100
+        memberships, up to `concurrency` of them at the same time.
+
+        Args:
+            uuid (str): The UUID to synchronize memberships of.
+            channels (Iterable): The desired memberships, channel names or `PNChannelMembership` objects.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            PNObjectsSyncResult: Channels set and removed, and the outcomes of failed requests.
+
+        Example:
+            ```python
+            result = pubnub.sync_memberships("user-1", ["room-1", "room-2"])
+            ```
+        """
+        current = memberships_request(self, uuid).iterate()
+        return apply_changes(memberships_changes(self, uuid, current, channels), concurrency)
+
+    def sync_channel_members(self, channel: str, uuids: Iterable,
+                             concurrency: int = BULK_OBJECTS_CONCURRENCY) -> PNObjectsSyncResult:
+        """Make the members of a channel match `uuids`, works as `sync_memberships()`.
+
+        Args:
+            channel (str): The channel to synchronize members of.
+            uuids (Iterable): The desired members, UUIDs or `PNUserMember` objects.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            PNObjectsSyncResult: UUIDs set and removed, and the outcomes of failed requests.
+        """
+        current = members_request(self, channel).iterate()
+        return apply_changes(members_changes(self, channel, current, uuids), concurrency)
+
     def stop(self):
         """Stop all subscriptions and clean up resources.
 
@@ -218,6 +359,7 @@ class PubNub(PubNubCore):
         finally:
             if hasattr(self._request_handler, 'close'):
                 self._request_handler.close()
+            self._shutdown_decryption_executor()
 
     def request_deferred(self, options_func):
         raise NotImplementedError
@@ -297,6 +439,63 @@ class NativeReconnectionManager(ReconnectionManager):
             self._timer.cancel()
 
 
+class NativeSubscriptionStream(PNSubscriptionStream):
+    """ Blocking iterator over messages of a subscription:
+
+        with pubnub.channel("chat").subscription().stream(maxsize=50) as stream:
+            for message in stream:
+                ...
+    """
+
+    def __init__(self, subscription_manager, subscription, maxsize=100):
+        self._buffer = Queue()
+        self._space_available = threading.Event()
+        self._space_available.set()
+        super().__init__(subscription_manager, subscription, maxsize)
+
+    def qsize(self):
+        return self._buffer.qsize()
+
+    def _put_messages(self, messages):
+        for message in messages:
+            self._buffer.put(message)
+        if self.is_full():
+            self._space_available.clear()
+
+    def _wake(self):
+        self._buffer.put(None)
+        self._space_available.set()
+
+    def get(self, timeout=None):
+        """ Returns the next message, or None when the stream is closed. Raises `queue.Empty` on timeout. """
+        message = self._buffer.get(timeout=timeout)
+        if not self.is_full():
+            self._space_available.set()
+        if message is None:
+            # let other consumers of a closed stream stop as well
+            self._buffer.put(None)
+        return message
+
+    def wait_for_space(self, timeout=None):
+        return self._space_available.wait(timeout)
+
+    def __iter__(self):
+        try:
+            while True:
+                message = self.get()
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
 class NativeSubscriptionManager(SubscriptionManager):
     """Manages channel subscriptions and message processing.
 
@@ -304,12 +503,14 @@ class NativeSubscriptionManager(SubscriptionManager):
     and delivery of messages to listeners.
 
     Attributes:
-        _message_queue (Queue): Queue for incoming messages
-        _consumer_event (Event): Event for controlling the consumer thread
+        _message_queues (list): Queues for incoming messages, one per worker thread
+        _consumer_event (Event): Event for controlling the consumer threads
         _subscribe_call: Current subscription API call
         _heartbeat_periodic_callback: Callback for periodic heartbeats
     """
 
+    _subscription_stream_class = NativeSubscriptionStream
+
     def __init__(self, pubnub_instance):
         """Initialize the subscription manager.
 
@@ -318,7 +519,12 @@ class NativeSubscriptionManager(SubscriptionManager):
         """
         subscription_manager = self
 
-        self._message_queue = Queue()
+        self._message_queue_overflow = MessageQueueOverflow.from_config(pubnub_instance.config)
+        # one queue per worker thread, messages of a channel always go to the same one to keep their order
+        self._message_queues = [NativeSubscribeMessageQueue(self._message_queue_overflow)
+                                for _ in range(max(1, pubnub_instance.config.message_worker_threads))]
+        self._message_queue = self._message_queues[0]
+        self._consumer_threads = []
         self._consumer_event = threading.Event()
         self._subscribe_call = None
         self._heartbeat_periodic_callback = None
@@ -401,7 +607,30 @@ class NativeSubscriptionManager(SubscriptionManager):
         self._message_queue_put(None)
 
     def _message_queue_put(self, message):
-        self._message_queue.put(message)
+        if message is None:
+            queues = self._message_queues
+        elif len(self._message_queues) == 1:
+            queues = [self._message_queue]
+        else:
+            queues = [self._message_queues[hash(message.channel) % len(self._message_queues)]]
+
+        for queue in queues:
+            # Blocks only with the BLOCK overflow policy, which holds the subscribe loop until listeners catch up
+            while True:
+                try:
+                    queue.put(message, timeout=1)
+                    break
+                except Full:
+                    if self._consumer_event.is_set():
+                        break
+
+    def _message_queue_depth(self):
+        return sum(queue.qsize() for queue in self._message_queues)
+
+    def _wait_for_streams(self):
+        for stream in self._lagging_streams():
+            while stream.is_full() and not stream.closed and not self._should_stop:
+                stream.wait_for_space(timeout=1)
 
     def reconnect(self):
         """Reconnect all current subscriptions.
@@ -423,16 +652,20 @@ class NativeSubscriptionManager(SubscriptionManager):
         self._stop_subscribe_loop()
 
     def _start_worker(self):
-        consumer = NativeSubscribeMessageWorker(
-            self._pubnub,
-            self._listener_manager,
-            self._message_queue,
-            self._consumer_event
-        )
-        self._consumer_thread = threading.Thread(
-            target=consumer.run,
-            name="SubscribeMessageWorker",
-            daemon=True).start()
+        for index, queue in enumerate(self._message_queues):
+            consumer = NativeSubscribeMessageWorker(
+                self._pubnub,
+                self._listener_manager,
+                queue,
+                self._consumer_event
+            )
+            consumer_thread = threading.Thread(
+                target=consumer.run,
+                name="SubscribeMessageWorker" if index == 0 else "SubscribeMessageWorker-%d" % index,
+                daemon=True)
+            self._consumer_threads.append(consumer_thread)
+            consumer_thread.start()
+        self._consumer_thread = self._consumer_threads[0]
 
     def _start_subscribe_loop(self):
         self._stop_subscribe_loop()
@@ -469,6 +702,7 @@ class NativeSubscriptionManager(SubscriptionManager):
                 self.disconnect()
             else:
                 self._handle_endpoint_call(raw_result, status)
+                self._wait_for_streams()
                 self._start_subscribe_loop()
 
         try:
@@ -525,23 +759,42 @@ class NativePeriodicCallback:
         self._timeout.start()
 
 
+class NativeSubscribeMessageQueue(Queue):
+    def __init__(self, overflow: MessageQueueOverflow):
+        self.overflow = overflow
+        super().__init__(overflow.max_size if overflow.blocks else 0)
+
+    def _put(self, item):
+        if not self.overflow.put(self.queue, item):
+            # put() counts every item as an unfinished task, a dropped one will never be marked as done
+            self.unfinished_tasks -= 1
+
+
 class NativeSubscribeMessageWorker(SubscribeMessageWorker):
     def _take_message(self):
         while not self._event.is_set():
             try:
                 # TODO: get rid of 1s timeout
-                msg = self._queue.get(True, 1)
-                if msg is not None:
-                    self._process_incoming_payload(msg)
-                self._queue.task_done()
+                messages = [self._queue.get(True, 1)]
             except Empty:
                 continue
+
+            # messages already waiting in the queue are delivered together with the first one
+            while messages[-1] is not None and len(messages) < self.MAX_BATCH_SIZE:
+                try:
+                    messages.append(self._queue.get_nowait())
+                except Empty:
+                    break
+
+            try:
+                self._process_incoming_payloads([msg for msg in messages if msg is not None])
             except Exception as e:
-                # TODO: move to finally
-                self._queue.task_done()
                 self._event.set()
                 logger.error("take message interrupted: %s" % str(e))
                 raise
+            finally:
+                for _ in messages:
+                    self._queue.task_done()
 
 
 class SubscribeListener(SubscribeCallback):
@@ -55,14 +55,21 @@ import math
 
 from asyncio import Event, Queue, Semaphore
 import os
+from typing import AsyncIterator, Iterable, List
 from httpx import AsyncHTTPTransport
 from pubnub.event_engine.containers import PresenceStateContainer
 from pubnub.event_engine.models import events, states
 
 from pubnub.models.consumer.common import PNStatus
+from pubnub.models.consumer.objects_v2.bulk import PNBulkObjectResult, PNObjectsSyncResult
 from pubnub.models.consumer.pn_error_data import PNErrorData
+from pubnub.models.subscription import PNSubscriptionStream
 from pubnub.dtos import SubscribeOperation, UnsubscribeOperation
 from pubnub.event_engine.statemachine import StateMachine
+from pubnub.endpoints.file_operations.send_file import SEND_FILES_CONCURRENCY
+from pubnub.endpoints.file_operations.send_file_asyncio import AsyncioSendFile
+from pubnub.endpoints.objects_v2.bulk import abulk_requests, aapply_changes, members_changes, members_request, \
+    memberships_changes, memberships_request, BULK_OBJECTS_CONCURRENCY
 from pubnub.endpoints.presence.heartbeat import Heartbeat
 from pubnub.endpoints.presence.leave import Leave
 from pubnub.endpoints.pubsub.subscribe import Subscribe
@@ -70,7 +77,7 @@ from pubnub.pubnub_core import PubNubCore
 from pubnub.request_handlers.base import BaseRequestHandler
 from pubnub.request_handlers.async_httpx import AsyncHttpxRequestHandler, WallClockTimeoutError
 from pubnub.workers import SubscribeMessageWorker
-from pubnub.managers import SubscriptionManager, ReconnectionManager
+from pubnub.managers import SubscriptionManager, ReconnectionManager, MessageQueueOverflow
 from pubnub import utils
 from pubnub.enums import PNStatusCategory, PNHeartbeatNotificationOptions, PNOperationType, PNReconnectionPolicy
 from pubnub.callbacks import SubscribeCallback, ReconnectionCallback
@@ -172,6 +179,136 @@ class PubNubAsyncio(PubNubCore):
         """Close the current HTTP session."""
         await self._request_handler.close_session()
 
+    def get_request_handler(self) -> BaseRequestHandler:
+        """Get the current request handler instance.
+
+        Returns:
+            BaseRequestHandler: The current request handler instance
+        """
+        return self._request_handler
+
+    async def send_files(self, files: List[AsyncioSendFile], concurrency: int = SEND_FILES_CONCURRENCY) -> List:
+        """Send a batch of files, up to `concurrency` of them at the same time.
+
+        Every file still goes through its upload details, upload and file message requests in order,
+        the requests of different files overlap and share the HTTP session of this instance.
+
+        Args:
+            files (List[AsyncioSendFile]): File senders configured with `send_file()`, not awaited yet.
+            concurrency (int): Maximum number of files being sent at the same time.
+
+        Returns:
+            List: For every file, in the order of `files`, its `PNSendFileResult` or the exception
+            which failed it. A failed file doesn't stop the others.
+        """
+        semaphore = Semaphore(concurrency)
+
+        async def send(file):
+            try:
+                async with semaphore:
+                    envelope = await file.future()
+            except Exception as e:
+                return e
+            return envelope if envelope.is_error() else envelope.result
+
+        return await asyncio.gather(*(send(file) for file in files))
+
+    def bulk_set_uuid_metadata(self, entities: Iterable[dict],
+                               concurrency: int = BULK_OBJECTS_CONCURRENCY) -> AsyncIterator[PNBulkObjectResult]:
+        """Set metadata of many UUIDs, up to `concurrency` requests at the same time.
+
+        Entities are read from `entities` only as requests complete. Throttled (HTTP 429) and failed (HTTP 5xx)
+        requests are retried, and all requests slow down until the service accepts them again.
+
+        Args:
+            entities (Iterable[dict]): Keyword arguments of `set_uuid_metadata()` for every UUID.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            AsyncIterator[PNBulkObjectResult]: The outcome of every UUID in the order of completion. The
+            requests are made while the iterator is consumed.
+
+        Example:
+            ```python
+            async for outcome in pubnub.bulk_set_uuid_metadata({"uuid": u.id, "name": u.name} for u in users):
+                if outcome.is_error():
+                    print(outcome)
+            ```
+        """
+        return abulk_requests((self.set_uuid_metadata(**entity) for entity in entities), concurrency)
+
+    def bulk_set_channel_metadata(self, entities: Iterable[dict],
+                                  concurrency: int = BULK_OBJECTS_CONCURRENCY) -> AsyncIterator[PNBulkObjectResult]:
+        """Set metadata of many channels, works as `bulk_set_uuid_metadata()`.
+
+        Args:
+            entities (Iterable[dict]): Keyword arguments of `set_channel_metadata()` for every channel.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            AsyncIterator[PNBulkObjectResult]: The outcome of every channel in the order of completion.
+        """
+        return abulk_requests((self.set_channel_metadata(**entity) for entity in entities), concurrency)
+
+    def bulk_remove_uuid_metadata(self, uuids: Iterable[str],
+                                  concurrency: int = BULK_OBJECTS_CONCURRENCY) -> AsyncIterator[PNBulkObjectResult]:
+        """Remove metadata of many UUIDs, works as `bulk_set_uuid_metadata()`.
+
+        Args:
+            uuids (Iterable[str]): UUIDs to remove the metadata of.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            AsyncIterator[PNBulkObjectResult]: The outcome of every UUID in the order of completion.
+        """
+        return abulk_requests((self.remove_uuid_metadata(uuid=uuid) for uuid in uuids), concurrency)
+
+    def bulk_remove_channel_metadata(self, channels: Iterable[str], concurrency: int = BULK_OBJECTS_CONCURRENCY
+                                     ) -> AsyncIterator[PNBulkObjectResult]:
+        """Remove metadata of many channels, works as `bulk_set_uuid_metadata()`.
+
+        Args:
+            channels (Iterable[str]): Channels to remove the metadata of.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            AsyncIterator[PNBulkObjectResult]: The outcome of every channel in the order of completion.
+        """
+        return abulk_requests((self.remove_channel_metadata(channel=channel) for channel in channels), concurrency)
+
+    async def sync_memberships(self, uuid: str, channels: Iterable,
+                               concurrency: int = BULK_OBJECTS_CONCURRENCY) -> PNObjectsSyncResult:
+        """Make the channel memberships of a UUID match `channels`.
+
+        Only the differences from the current memberships are sent, in `manage_memberships` requests
+        of up to 100 memberships, up to `concurrency` of them at the same time.
+
+        Args:
+            uuid (str): The UUID to synchronize memberships of.
+            channels (Iterable): The desired memberships, channel names or `PNChannelMembership` objects.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            PNObjectsSyncResult: Channels set and removed, and the outcomes of failed requests.
+        """
+        current = [membership async for membership in memberships_request(self, uuid).aiterate()]
+        return await aapply_changes(memberships_changes(self, uuid, current, channels), concurrency)
+
+    async def sync_channel_members(self, channel: str, uuids: Iterable,
+                                   concurrency: int = BULK_OBJECTS_CONCURRENCY) -> PNObjectsSyncResult:
+        """Make the members of a channel match `uuids`, works as `sync_memberships()`.
+
+        Args:
+            channel (str): The channel to synchronize members of.
+            uuids (Iterable): The desired members, UUIDs or `PNUserMember` objects.
+            concurrency (int): Maximum number of requests in flight.
+
+        Returns:
+            PNObjectsSyncResult: UUIDs set and removed, and the outcomes of failed requests.
+        """
+        current = [member async for member in members_request(self, channel).aiterate()]
+        return await aapply_changes(members_changes(self, channel, current, uuids), concurrency)
+
     async def set_connector(self, connector):
         """Set a custom connector for HTTP operations.
 
@@ -184,6 +321,7 @@ class PubNubAsyncio(PubNubCore):
         """Stop all operations and clean up resources."""
         if self._subscription_manager:
             self._subscription_manager.stop()
+        self._shutdown_decryption_executor()
         await self.close_session()
 
     def sdk_platform(self):
@@ -347,6 +485,65 @@ class AsyncioReconnectionManager(ReconnectionManager):
             self._task.cancel()
 
 
+class AsyncioSubscriptionStream(PNSubscriptionStream):
+    """ Asynchronous iterator over messages of a subscription:
+
+        async with pubnub.channel("chat").subscription().stream(maxsize=50) as stream:
+            async for message in stream:
+                ...
+    """
+
+    def __init__(self, subscription_manager, subscription, maxsize=100):
+        self._buffer = Queue()
+        self._space_available = Event()
+        self._space_available.set()
+        super().__init__(subscription_manager, subscription, maxsize)
+
+    def qsize(self):
+        return self._buffer.qsize()
+
+    def _put_messages(self, messages):
+        for message in messages:
+            self._buffer.put_nowait(message)
+        if self.is_full():
+            self._space_available.clear()
+
+    def _wake(self):
+        self._buffer.put_nowait(None)
+        self._space_available.set()
+
+    async def get(self):
+        """ Returns the next message, or None when the stream is closed """
+        message = await self._buffer.get()
+        if not self.is_full():
+            self._space_available.set()
+        if message is None:
+            # let other consumers of a closed stream stop as well
+            self._buffer.put_nowait(None)
+        return message
+
+    async def wait_for_space(self):
+        while self.is_full() and not self.closed:
+            self._space_available.clear()
+            await self._space_available.wait()
+
+    async def __aiter__(self):
+        try:
+            while True:
+                message = await self.get()
+                if message is None:
+                    return
+                yield message
+        finally:
+            self.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
 class AsyncioSubscriptionManager(SubscriptionManager):
     """Manages channel subscriptions and message processing.
 
@@ -360,11 +557,14 @@ class AsyncioSubscriptionManager(SubscriptionManager):
         _heartbeat_periodic_callback: Callback for periodic heartbeats
     """
 
+    _subscription_stream_class = AsyncioSubscriptionStream
+
     def __init__(self, pubnub_instance):
         subscription_manager = self
 
         self._message_worker = None
-        self._message_queue = Queue()
+        self._message_queue_overflow = MessageQueueOverflow.from_config(pubnub_instance.config)
+        self._message_queue = AsyncioSubscribeMessageQueue(self._message_queue_overflow)
         self._subscription_lock = Semaphore(1)
         self._subscribe_loop_task = None
         self._heartbeat_periodic_callback = None
@@ -439,6 +639,7 @@ class AsyncioSubscriptionManager(SubscriptionManager):
         self._stop_subscribe_loop()
         await self._subscription_lock.acquire()
 
+        resubscribe = False
         try:
             combined_channels = self._subscription_state.prepare_channel_list(True)
             combined_groups = self._subscription_state.prepare_channel_group_list(True)
@@ -466,11 +667,24 @@ class AsyncioSubscriptionManager(SubscriptionManager):
                 await self._handle_subscription_error(e)
             else:
                 self._handle_endpoint_call(e.result, e.status)
-                self._subscribe_loop_task = asyncio.ensure_future(self._start_subscribe_loop())
+                resubscribe = True
 
         finally:
             self._subscription_lock.release()
 
+        if resubscribe:
+            # slow consumers are awaited without the lock, subscription changes and stop() are not held up
+            await self._wait_for_consumers()
+            # a subscription change meanwhile started a new loop, this one ends
+            if self._subscribe_loop_task is asyncio.current_task() and not self._should_stop:
+                self._subscribe_loop_task = asyncio.ensure_future(self._start_subscribe_loop())
+
+    async def _wait_for_consumers(self):
+        if self._message_queue_overflow.blocks:
+            await self._message_queue.wait_for_space()
+        for stream in self._lagging_streams():
+            await stream.wait_for_space()
+
     def _stop_subscribe_loop(self):
         if self._subscribe_request_task is not None and not self._subscribe_request_task.cancelled():
             self._subscribe_request_task.cancel()
@@ -550,7 +764,7 @@ class AsyncioSubscriptionManager(SubscriptionManager):
             return
 
         if error.status and error.status.category == PNStatusCategory.PNTimeoutCategory:
-            asyncio.ensure_future(self._start_subscribe_loop())
+            self._subscribe_loop_task = asyncio.ensure_future(self._start_subscribe_loop())
             return
 
         logger.error("Exception in subscribe loop: %s" % str(error))
@@ -566,6 +780,7 @@ class AsyncioSubscriptionManager(SubscriptionManager):
 class EventEngineSubscriptionManager(SubscriptionManager):
     event_engine: StateMachine
     loop: asyncio.AbstractEventLoop
+    _subscription_stream_class = AsyncioSubscriptionStream
 
     def __init__(self, pubnub_instance):
         self.state_container = PresenceStateContainer()
@@ -653,17 +868,65 @@ class EventEngineSubscriptionManager(SubscriptionManager):
         self.presence_engine.stop()
 
 
+class AsyncioSubscribeMessageQueue(Queue):
+    """ Unbounded queue which leaves the bound to the overflow policy. With the BLOCK policy the subscribe loop
+    waits for `wait_for_space` before requesting more messages. """
+
+    def __init__(self, overflow: MessageQueueOverflow):
+        super().__init__()
+        self.overflow = overflow
+        self._space_available = Event()
+        self._space_available.set()
+
+    def put_nowait(self, item):
+        size = self.qsize()
+        super().put_nowait(item)
+        if self.qsize() == size:
+            # the message was dropped and will never be marked as done
+            self.task_done()
+
+    def _put(self, item):
+        self.overflow.put(self._queue, item)
+        if self.overflow.is_full(len(self._queue)):
+            self._space_available.clear()
+
+    def _get(self):
+        item = self._queue.popleft()
+        if not self.overflow.is_full(len(self._queue)):
+            self._space_available.set()
+        return item
+
+    async def wait_for_space(self):
+        await self._space_available.wait()
+
+
 class AsyncioSubscribeMessageWorker(SubscribeMessageWorker):
     async def run(self):
         await self._take_message()
 
+    async def _decrypt_payloads_async(self, messages):
+        """ Decrypts payloads in the decryption thread pool without blocking the event loop """
+        if len(self._encrypted_payloads(messages)) < 2:
+            return None
+        # the batch is handed to the pool from the loop's default executor, so a pool thread never waits on the pool
+        return await asyncio.get_running_loop().run_in_executor(None, self._decrypt_payloads, messages)
+
     async def _take_message(self):
         while True:
             try:
-                msg = await self._queue.get()
-                if msg is not None:
-                    self._process_incoming_payload(msg)
-                self._queue.task_done()
+                messages = [await self._queue.get()]
+                # messages already waiting in the queue are delivered together with the first one
+                while messages[-1] is not None and len(messages) < self.MAX_BATCH_SIZE:
+                    try:
+                        messages.append(self._queue.get_nowait())
+                    except asyncio.QueueEmpty:
+                        break
+                try:
+                    payloads = [msg for msg in messages if msg is not None]
+                    self._process_incoming_payloads(payloads, await self._decrypt_payloads_async(payloads))
+                finally:
+                    for _ in messages:
+                        self._queue.task_done()
             except asyncio.CancelledError:
                 logger.debug("Message Worker cancelled")
                 break
@@ -55,7 +55,9 @@ See Also:
 """
 
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 from copy import deepcopy
 from typing import Dict, List, Optional, Union, Any, TYPE_CHECKING
@@ -80,6 +82,7 @@ from pubnub.exceptions import PubNubException
 from pubnub.features import feature_flag
 from pubnub.crypto import PubNubCryptoModule
 from pubnub.models.consumer.message_actions import PNMessageAction
+from pubnub.models.consumer.pubsub import PNMessageQueueStats
 from pubnub.models.consumer.objects_v2.channel_members import PNUUID
 from pubnub.models.consumer.objects_v2.common import MemberIncludes, MembershipIncludes
 from pubnub.models.consumer.objects_v2.page import PNPage
@@ -106,7 +109,7 @@ from pubnub.endpoints.objects_v2.memberships.set_memberships import SetMembershi
 from pubnub.endpoints.objects_v2.uuid.get_all_uuid import GetAllUuid
 from pubnub.endpoints.objects_v2.uuid.get_uuid import GetUuid
 from pubnub.endpoints.objects_v2.uuid.remove_uuid import RemoveUuid
-from pubnub.managers import BasePathManager, TokenManager
+from pubnub.managers import BasePathManager, TokenManager, ObjectsCacheManager
 from pubnub.builders import SubscribeBuilder
 from pubnub.builders import UnsubscribeBuilder
 from pubnub.endpoints.time import Time
@@ -168,6 +171,7 @@ class PubNubCore:
 
     __metaclass__ = ABCMeta
     __crypto: Optional[PubNubCryptoModule] = None
+    __default_crypto: Optional[tuple] = None
 
     _subscription_registry: PNSubscriptionRegistry
 
@@ -191,12 +195,37 @@ class PubNubCore:
         self._subscription_manager = None
         self._base_path_manager = BasePathManager(config)
         self._token_manager = TokenManager()
+        self._objects_cache = ObjectsCacheManager.from_config(self.config)
         self._subscription_registry = PNSubscriptionRegistry(self)
+        self._decryption_executor = None
+        self._decryption_executor_lock = threading.Lock()
+
+    def _get_decryption_executor(self) -> Optional[ThreadPoolExecutor]:
+        """Return the thread pool decrypting received messages, creating one if needed, also after `stop()` shut the
+        previous one down. None if `decryption_thread_pool_size` is not configured."""
+        if not self.config.decryption_thread_pool_size:
+            return None
+        with self._decryption_executor_lock:
+            if self._decryption_executor is None:
+                self._decryption_executor = ThreadPoolExecutor(max_workers=self.config.decryption_thread_pool_size,
+                                                               thread_name_prefix="pubnub-decrypt")
+            return self._decryption_executor
+
+    def _shutdown_decryption_executor(self) -> None:
+        with self._decryption_executor_lock:
+            executor, self._decryption_executor = self._decryption_executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
 
     @property
     def base_origin(self) -> str:
         return self._base_path_manager.get_base_path()
 
+    @property
+    def objects_cache(self) -> Optional[ObjectsCacheManager]:
+        """Cache of App Context read responses, None unless `objects_cache_size` is configured."""
+        return self._objects_cache
+
     @property
     def sdk_name(self) -> str:
         return "%s%s/%s" % (PubNubCore.SDK_NAME, self.sdk_platform(), PubNubCore.SDK_VERSION)
@@ -213,9 +242,19 @@ class PubNubCore:
     def crypto(self) -> Optional[PubNubCryptoModule]:
         crypto_module = self.__crypto or self.config.crypto_module
         if not crypto_module and self.config.cipher_key:
-            crypto_module = self.config.DEFAULT_CRYPTO_MODULE(self.config)
+            crypto_module = self._default_crypto_module()
         return crypto_module
 
+    def _default_crypto_module(self) -> PubNubCryptoModule:
+        # the module built from the cipher key is kept until the settings it was built from change, so its cryptors
+        # derive the key once instead of on every access
+        config = self.config
+        settings = (config.DEFAULT_CRYPTO_MODULE, config.cipher_key, config.use_random_initialization_vector,
+                    config.cipher_mode, config.fallback_cipher_mode)
+        if self.__default_crypto is None or self.__default_crypto[0] != settings:
+            self.__default_crypto = (settings, config.DEFAULT_CRYPTO_MODULE(config))
+        return self.__default_crypto[1]
+
     @crypto.setter
     def crypto(self, crypto: PubNubCryptoModule) -> None:
         self.__crypto = crypto
@@ -271,6 +310,15 @@ class PubNubCore:
         self._validate_subscribe_manager_enabled()
         return self._subscription_manager.get_subscribed_channel_groups()
 
+    def get_message_queue_stats(self) -> Optional[PNMessageQueueStats]:
+        """Get the depth, bound and drop counter of the queue of received messages waiting for listeners.
+
+        Returns:
+            PNMessageQueueStats: Queue statistics, or None if the subscription manager doesn't queue messages.
+        """
+        self._validate_subscribe_manager_enabled()
+        return self._subscription_manager.get_message_queue_stats()
+
     def add_channel_to_channel_group(self, channels: Union[str, List[str]] = None,
                                      channel_group: str = None) -> AddChannelToChannelGroup:
         """Add channels to a channel group.
@@ -1430,7 +1478,9 @@ class PubNubCore:
         """Send a file through PubNub's file upload service.
 
         The method automatically selects the appropriate implementation based on
-        the SDK platform (synchronous or asynchronous).
+        the SDK platform (synchronous or asynchronous). Files given with `file_path`,
+        as seekable binary file objects or as bytes are encrypted and uploaded in
+        chunks, without reading the whole file into memory.
 
         Returns:
             Union[SendFileNative, AsyncioSendFile]: A file sender object that can
@@ -55,6 +55,20 @@ class AsyncAiohttpRequestHandler(BaseRequestHandler):
     async def threaded_request(self, **_):
         raise NotImplementedError("threaded_request is not implemented for asyncio handler")
 
+    async def download_stream(self, url, chunk_size, headers=None, on_response=None):
+        if not self._session:
+            await self.create_session()
+        async with self._session.get(
+                url, headers={**self.pubnub.headers, **(headers or {})}, allow_redirects=True,
+                timeout=aiohttp.ClientTimeout(sock_read=self.pubnub.config.non_subscribe_request_timeout)
+        ) as response:
+            if on_response:
+                on_response(response.status, response.headers)
+            if response.status not in (200, 206):
+                raise self.download_error(response.status, await response.text())
+            async for chunk in response.content.iter_chunked(chunk_size):
+                yield chunk
+
     async def async_request(self, options_func, cancellation_event):
         """
         Query string should be provided as a manually serialized and encoded string.
@@ -151,7 +165,7 @@ class AsyncAiohttpRequestHandler(BaseRequestHandler):
                 data = body
             else:
                 try:
-                    data = json.loads(body)
+                    data = self.pubnub.config.json_codec.decode(body)
                 except ValueError:
                     if response.status == 599 and len(body) > 0:
                         data = body
@@ -159,7 +173,7 @@ class AsyncAiohttpRequestHandler(BaseRequestHandler):
                         raise
                 except TypeError:
                     try:
-                        data = json.loads(body.decode("utf-8"))
+                        data = self.pubnub.config.json_codec.decode(body.decode("utf-8"))
                     except ValueError:
                         raise create_exception(
                             category=status_category,
@@ -12,6 +12,7 @@ from pubnub.errors import PNERR_CLIENT_ERROR, PNERR_JSON_DECODING_FAILED, PNERR_
 from pubnub.exceptions import PubNubException
 from pubnub.models.envelopes import AsyncioEnvelope
 from pubnub.request_handlers.base import BaseRequestHandler
+from pubnub.request_handlers.single_flight import AsyncSingleFlight
 from pubnub.structures import RequestOptions, ResponseInfo
 
 logger = logging.getLogger("pubnub")
@@ -39,6 +40,7 @@ class AsyncHttpxRequestHandler(BaseRequestHandler):
     def __init__(self, pubnub):
         self.pubnub = pubnub
         self._connector = PubNubAsyncHTTPTransport(verify=True, http2=True)
+        self._single_flight = AsyncSingleFlight()
 
     async def create_session(self):
         self._session = httpx.AsyncClient(
@@ -96,6 +98,21 @@ class AsyncHttpxRequestHandler(BaseRequestHandler):
             request_task.cancel()
             raise
 
+    async def download_stream(self, url, chunk_size, headers=None, on_response=None):
+        if not self._session:
+            await self.create_session()
+        config = self.pubnub.config
+        async with self._session.stream(
+                "GET", url, headers={**self.pubnub.headers, **(headers or {})}, follow_redirects=True,
+                timeout=httpx.Timeout(config.non_subscribe_request_timeout, connect=config.connect_timeout)
+        ) as res:
+            if on_response:
+                on_response(res.status_code, res.headers)
+            if res.status_code not in (200, 206):
+                raise self.download_error(res.status_code, (await res.aread()).decode('utf-8', errors='ignore'))
+            async for chunk in res.aiter_bytes(chunk_size):
+                yield chunk
+
     async def async_request(self, options_func, cancellation_event):
         """
         Query string should be provided as a manually serialized and encoded string.
@@ -118,6 +135,15 @@ class AsyncHttpxRequestHandler(BaseRequestHandler):
 
         options.merge_params_in({})
 
+        objects_cache = self.pubnub.objects_cache
+        if objects_cache is not None:
+            cached_response = objects_cache.lookup(options)
+            if cached_response is not None:
+                return AsyncioEnvelope(
+                    result=create_response(cached_response),
+                    status=create_status(PNStatusCategory.PNAcknowledgmentCategory, cached_response, None, None)
+                )
+
         if options.use_base_path:
             url = utils.build_url(self.pubnub.config.scheme(), self.pubnub.base_origin, options.path,
                                   options.query_string)
@@ -151,9 +177,15 @@ class AsyncHttpxRequestHandler(BaseRequestHandler):
         try:
             if not self._session:
                 await self.create_session()
-            response = await self._request_with_wall_clock_deadline(
-                request_arguments, options.request_timeout
-            )
+            if self.pubnub.config.coalesce_read_requests and options.is_coalescable():
+                response = await self._single_flight.do(
+                    options.coalescing_key,
+                    lambda: self._request_with_wall_clock_deadline(request_arguments, options.request_timeout)
+                )
+            else:
+                response = await self._request_with_wall_clock_deadline(
+                    request_arguments, options.request_timeout
+                )
         except (asyncio.TimeoutError, asyncio.CancelledError):
             raise
         except Exception as e:
@@ -198,13 +230,28 @@ class AsyncHttpxRequestHandler(BaseRequestHandler):
                 http_version=response.http_version
             )
 
+        if response.status_code == 304 and objects_cache is not None:
+            cached_response = objects_cache.not_modified(options)
+            if cached_response is not None:
+                return AsyncioEnvelope(
+                    result=create_response(cached_response),
+                    status=create_status(
+                        PNStatusCategory.PNAcknowledgmentCategory,
+                        cached_response,
+                        response_info,
+                        None
+                    )
+                )
+            if objects_cache.drop_revalidation(options):
+                return await self.async_request(options_func, cancellation_event)
+
         # if body is not None and len(body) > 0 and not options.non_json_response:
         if body is not None and len(body) > 0:
             if options.non_json_response:
                 data = body
             else:
                 try:
-                    data = json.loads(body)
+                    data = self.pubnub.config.json_codec.decode(body)
                 except ValueError:
                     if response.status == 599 and len(body) > 0:
                         data = body
@@ -212,7 +259,7 @@ class AsyncHttpxRequestHandler(BaseRequestHandler):
                         raise
                 except TypeError:
                     try:
-                        data = json.loads(body.decode("utf-8"))
+                        data = self.pubnub.config.json_codec.decode(body.decode("utf-8"))
                     except ValueError:
                         raise create_exception(
                             category=status_category,
@@ -252,6 +299,8 @@ class AsyncHttpxRequestHandler(BaseRequestHandler):
                 )
             )
         else:
+            if objects_cache is not None and not options.non_json_response:
+                objects_cache.update(options, data, response.headers.get('ETag'))
             return AsyncioEnvelope(
                 result=create_response(data) if not options.non_json_response else create_response(response, data),
                 status=create_status(
@@ -1,5 +1,8 @@
 from abc import abstractmethod, ABCMeta
 
+from pubnub.errors import PNERR_CLIENT_ERROR, PNERR_SERVER_ERROR
+from pubnub.exceptions import PubNubException
+
 
 class BaseRequestHandler(object):
     __metaclass__ = ABCMeta
@@ -15,3 +18,17 @@ class BaseRequestHandler(object):
     @abstractmethod
     async def async_request(self, options_func, cancellation_event):
         pass
+
+    def download_stream(self, url, chunk_size, headers=None, on_response=None):
+        """ Sends a GET request to `url` and yields the response body in chunks of up to `chunk_size` bytes as it
+        arrives, instead of reading the whole body into memory. Asynchronous handlers return an async iterator.
+        `on_response(status_code, headers)` is called once the response arrives, before its body is read. """
+        raise NotImplementedError("download_stream is not implemented for %s" % self.__class__.__name__)
+
+    @staticmethod
+    def download_error(status_code, text):
+        return PubNubException(
+            pn_error=PNERR_SERVER_ERROR if status_code >= 500 else PNERR_CLIENT_ERROR,
+            errormsg=text,
+            status_code=status_code
+        )
@@ -0,0 +1,170 @@
+import logging
+import threading
+
+from collections import deque
+
+from pubnub.enums import PNRequestRejectionPolicy
+from pubnub.errors import PNERR_REQUEST_QUEUE_FULL, PNERR_REQUEST_EXECUTOR_SHUT_DOWN
+from pubnub.exceptions import PubNubException
+
+logger = logging.getLogger("pubnub")
+
+
+class RequestExecutor:
+    """Bounded pool of worker threads shared by a synchronous request handler.
+
+    Without a pool every `pn_async()` call, heartbeat, leave and reconnection probe starts a new OS thread.
+    The executor instead keeps at most `max_workers` threads alive and feeds them from a FIFO queue that
+    holds at most `queue_size` pending tasks (0 means unbounded). Worker threads are started lazily, only
+    when no idle worker is available.
+
+    When the queue is full, `rejection_policy` decides what happens to a new task:
+      - `PNRequestRejectionPolicy.ABORT` - `submit()` raises `PubNubException`,
+      - `PNRequestRejectionPolicy.CALLER_RUNS` - the task runs synchronously on the submitting thread,
+      - `PNRequestRejectionPolicy.BLOCK` - the submitting thread waits until the queue has room.
+
+    Tasks submitted from the pool's own workers (e.g. the subscribe loop re-arming itself from its callback)
+    are always queued, so that the pool can never deadlock on itself.
+
+    Keep in mind that a subscribe long-poll occupies one worker for up to `subscribe_request_timeout` seconds,
+    so `max_workers` should be sized with that in mind.
+    """
+
+    def __init__(self, max_workers, queue_size=0, rejection_policy=PNRequestRejectionPolicy.ABORT,
+                 daemon=False, name="pubnub-request"):
+        assert isinstance(max_workers, int) and max_workers > 0, "max_workers must be a positive integer"
+        assert isinstance(queue_size, int) and queue_size >= 0, "queue_size must be a non-negative integer"
+
+        self._max_workers = max_workers
+        self._queue_size = queue_size
+        self._rejection_policy = rejection_policy
+        self._daemon = daemon
+        self._name = name
+
+        self._tasks = deque()
+        self._workers = []
+        self._idle_workers = 0
+        self._is_shut_down = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    @classmethod
+    def from_config(cls, config):
+        """Build an executor from `PNConfiguration` or return None if pooling is not enabled."""
+        if not config.request_thread_pool_size:
+            return None
+
+        return cls(
+            max_workers=config.request_thread_pool_size,
+            queue_size=config.request_queue_size,
+            rejection_policy=config.request_rejection_policy,
+            daemon=config.daemon
+        )
+
+    @property
+    def queue_depth(self):
+        """Number of tasks waiting for a free worker."""
+        with self._lock:
+            return len(self._tasks)
+
+    @property
+    def worker_count(self):
+        with self._lock:
+            return len(self._workers)
+
+    @property
+    def is_shut_down(self):
+        return self._is_shut_down
+
+    def submit(self, task):
+        """Schedule `task` (a callable without arguments) on the pool.
+
+        Raises:
+            PubNubException: If the executor is shut down, or the queue is full and the rejection policy is ABORT.
+        """
+        with self._lock:
+            if self._is_shut_down:
+                raise PubNubException(pn_error=PNERR_REQUEST_EXECUTOR_SHUT_DOWN)
+
+            run_in_caller = False
+            while self._is_full() and not self._is_own_worker():
+                if self._rejection_policy == PNRequestRejectionPolicy.BLOCK:
+                    self._not_full.wait()
+                    if self._is_shut_down:
+                        raise PubNubException(pn_error=PNERR_REQUEST_EXECUTOR_SHUT_DOWN)
+                elif self._rejection_policy == PNRequestRejectionPolicy.CALLER_RUNS:
+                    run_in_caller = True
+                    break
+                else:
+                    raise PubNubException(
+                        pn_error=PNERR_REQUEST_QUEUE_FULL,
+                        errormsg="%d tasks already pending" % len(self._tasks)
+                    )
+
+            if not run_in_caller:
+                self._enqueue(task)
+                return
+
+        # Executed outside of the lock so the other workers can keep draining the queue
+        task()
+
+    def shutdown(self, wait=False, timeout=None):
+        """Stop accepting new tasks. Already queued tasks are still executed before workers exit.
+
+        Args:
+            wait: Block until all workers are finished.
+            timeout: Maximum number of seconds to wait for each worker when `wait` is True.
+        """
+        with self._lock:
+            self._is_shut_down = True
+            workers = list(self._workers)
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+
+        if wait:
+            current = threading.current_thread()
+            for worker in workers:
+                if worker is not current:
+                    worker.join(timeout)
+
+    def _enqueue(self, task):
+        self._tasks.append(task)
+        if self._idle_workers < len(self._tasks) and len(self._workers) < self._max_workers:
+            self._start_worker()
+        self._not_empty.notify()
+
+    def _start_worker(self):
+        worker = threading.Thread(
+            target=self._work,
+            name="%s-%d" % (self._name, len(self._workers) + 1),
+            daemon=self._daemon
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _is_full(self):
+        return self._queue_size > 0 and len(self._tasks) >= self._queue_size
+
+    def _is_own_worker(self):
+        return threading.current_thread() in self._workers
+
+    def _work(self):
+        while True:
+            with self._lock:
+                while not self._tasks and not self._is_shut_down:
+                    self._idle_workers += 1
+                    self._not_empty.wait()
+                    self._idle_workers -= 1
+
+                if not self._tasks:
+                    self._workers.remove(threading.current_thread())
+                    return
+
+                task = self._tasks.popleft()
+                self._not_full.notify()
+
+            try:
+                task()
+            except Exception as e:
+                logger.error("Request executor task failed: %s" % str(e))
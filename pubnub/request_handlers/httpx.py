@@ -14,6 +14,8 @@ from pubnub.errors import PNERR_CLIENT_ERROR, PNERR_UNKNOWN_ERROR, PNERR_TOO_MAN
 from pubnub.errors import PNERR_SERVER_ERROR
 from pubnub.exceptions import PubNubException
 from pubnub.request_handlers.base import BaseRequestHandler
+from pubnub.request_handlers.executor import RequestExecutor
+from pubnub.request_handlers.single_flight import SingleFlight
 from pubnub.structures import RequestOptions, PlatformOptions, ResponseInfo, Envelope
 
 try:
@@ -166,6 +168,9 @@ class HttpxRequestHandler(BaseRequestHandler):
         self._session = None
         self._session_lock = threading.Lock()
         self._watchdog = WallClockDeadlineWatchdog()
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._single_flight = SingleFlight()
 
         self.pubnub = pubnub
 
@@ -178,8 +183,10 @@ class HttpxRequestHandler(BaseRequestHandler):
             return self._session
 
     def close(self):
-        """Clean up resources: stop the watchdog thread and close the HTTP session."""
+        """Clean up resources: stop the watchdog and request executor threads and close the HTTP session."""
         self._watchdog.stop()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
         with self._session_lock:
             if self._session is not None:
                 self._session.close()
@@ -226,17 +233,36 @@ class HttpxRequestHandler(BaseRequestHandler):
             finally:
                 call.executed_cb()
 
-        self.execute_callback_in_separate_thread(
-            callback_to_invoke_in_separate_thread,
-            endpoint_name,
-            call,
-            cancellation_event
-        )
+        try:
+            self.execute_callback_in_separate_thread(
+                callback_to_invoke_in_separate_thread,
+                endpoint_name,
+                call,
+                cancellation_event
+            )
+        except PubNubException as e:
+            logger.error("Async request rejected. %s" % str(e))
+            callback(Envelope(
+                result=None,
+                status=endpoint_call_options.create_status(
+                    category=PNStatusCategory.PNInternalExceptionCategory,
+                    response=None,
+                    response_info=None,
+                    exception=e)))
+            call.executed_cb()
+
+        return call
 
     def execute_callback_in_separate_thread(
             self, callback_to_invoke_in_another_thread, operation_name, call_obj, cancellation_event
     ):
         client = AsyncHTTPClient(callback_to_invoke_in_another_thread)
+        call_obj.cancellation_event = cancellation_event
+
+        executor = self._get_executor()
+        if executor is not None:
+            executor.submit(client.run)
+            return call_obj
 
         HttpxRequestHandler.ENDPOINT_THREAD_COUNTER += 1
 
@@ -244,13 +270,23 @@ class HttpxRequestHandler(BaseRequestHandler):
             target=client.run,
             name=f"Thread-{operation_name}-{HttpxRequestHandler.ENDPOINT_THREAD_COUNTER}",
             daemon=self.pubnub.config.daemon
-        ).start()
-
+        )
         call_obj.thread = thread
-        call_obj.cancellation_event = cancellation_event
+        thread.start()
 
         return call_obj
 
+    def _get_executor(self):
+        """Return the shared request executor, creating one if needed. None if pooling is disabled. Thread-safe."""
+        if not self.pubnub.config.request_thread_pool_size:
+            return None
+
+        with self._executor_lock:
+            if self._executor is None or self._executor.is_shut_down:
+                logger.debug("Creating new request executor")
+                self._executor = RequestExecutor.from_config(self.pubnub.config)
+            return self._executor
+
     def async_file_based_operation(self, func, callback, operation_name, cancellation_event=None):
         call = Call()
 
@@ -269,15 +305,39 @@ class HttpxRequestHandler(BaseRequestHandler):
             finally:
                 call.executed_cb()
 
-        self.execute_callback_in_separate_thread(
-            callback_to_invoke_in_separate_thread,
-            operation_name,
-            call,
-            cancellation_event
-        )
+        try:
+            self.execute_callback_in_separate_thread(
+                callback_to_invoke_in_separate_thread,
+                operation_name,
+                call,
+                cancellation_event
+            )
+        except PubNubException as e:
+            logger.error("Async file upload request rejected. %s" % str(e))
+            callback(
+                Envelope(result=None, status=e)
+            )
+            call.executed_cb()
 
         return call
 
+    def download_stream(self, url, chunk_size, headers=None, on_response=None):
+        config = self.pubnub.config
+        try:
+            with self._ensure_session().stream(
+                    "GET", url, headers={**self.pubnub.headers, **(headers or {})}, follow_redirects=True,
+                    timeout=httpx.Timeout(config.non_subscribe_request_timeout, connect=config.connect_timeout)
+            ) as res:
+                if on_response:
+                    on_response(res.status_code, res.headers)
+                if res.status_code not in (200, 206):
+                    raise self.download_error(res.status_code, res.read().decode('utf-8', errors='ignore'))
+                yield from res.iter_bytes(chunk_size)
+        except httpx.TimeoutException as e:
+            raise PubNubException(pn_error=PNERR_CLIENT_TIMEOUT, errormsg=str(e))
+        except httpx.TransportError as e:
+            raise PubNubException(pn_error=PNERR_CONNECTION_ERROR, errormsg=str(e))
+
     def _build_envelope(self, p_options, e_options):
         """ A wrapper for _invoke_url to separate request logic """
 
@@ -285,8 +345,28 @@ class HttpxRequestHandler(BaseRequestHandler):
         response_info = None
 
         url_base_path = self.pubnub.base_origin if e_options.use_base_path else None
+        objects_cache = self.pubnub.objects_cache
+        if objects_cache is not None:
+            cached_response = objects_cache.lookup(e_options)
+            if cached_response is not None:
+                return Envelope(
+                    result=e_options.create_response(cached_response),
+                    status=e_options.create_status(
+                        category=PNStatusCategory.PNAcknowledgmentCategory,
+                        response=cached_response,
+                        response_info=None,
+                        exception=None
+                    )
+                )
+
         try:
-            res = self._invoke_request(p_options, e_options, url_base_path)
+            if self.pubnub.config.coalesce_read_requests and e_options.is_coalescable():
+                res = self._single_flight.do(
+                    e_options.coalescing_key,
+                    lambda: self._invoke_request(p_options, e_options, url_base_path)
+                )
+            else:
+                res = self._invoke_request(p_options, e_options, url_base_path)
         except PubNubException as e:
             if e._pn_error in [PNERR_CONNECTION_ERROR, PNERR_UNKNOWN_ERROR]:
                 status_category = PNStatusCategory.PNUnexpectedDisconnectCategory
@@ -322,6 +402,21 @@ class HttpxRequestHandler(BaseRequestHandler):
                 http_version=res.http_version
             )
 
+        if res.status_code == 304 and objects_cache is not None:
+            cached_response = objects_cache.not_modified(e_options)
+            if cached_response is not None:
+                return Envelope(
+                    result=e_options.create_response(cached_response),
+                    status=e_options.create_status(
+                        category=PNStatusCategory.PNAcknowledgmentCategory,
+                        response=cached_response,
+                        response_info=response_info,
+                        exception=None
+                    )
+                )
+            if objects_cache.drop_revalidation(e_options):
+                return self._build_envelope(p_options, e_options)
+
         if res.status_code not in [200, 204, 307]:
             if res.status_code == 403:
                 status_category = PNStatusCategory.PNAccessDeniedCategory
@@ -347,7 +442,7 @@ class HttpxRequestHandler(BaseRequestHandler):
             else:
                 err = PNERR_CLIENT_ERROR
             try:
-                response = res.json()
+                response = p_options.pn_config.json_codec.decode(res.content)
             except JSONDecodeError:
                 response = None
             return Envelope(
@@ -365,7 +460,9 @@ class HttpxRequestHandler(BaseRequestHandler):
             if e_options.non_json_response:
                 response = res
             else:
-                response = res.json()
+                response = p_options.pn_config.json_codec.decode(res.content)
+                if objects_cache is not None:
+                    objects_cache.update(e_options, response, res.headers.get('ETag'))
 
             return Envelope(
                 result=e_options.create_response(response),
@@ -512,6 +609,7 @@ class Call(object):
         self.cancellation_event = None
         self.is_executed = False
         self.is_canceled = False
+        self._executed_event = threading.Event()
 
     def cancel(self):
         """
@@ -523,9 +621,13 @@ class Call(object):
             self.cancellation_event.set()
         self.is_canceled = True
 
-    def join(self):
+    def join(self, timeout=None):
         if isinstance(self.thread, threading.Thread):
-            self.thread.join()
+            self.thread.join(timeout)
+        else:
+            # Call is executed by a pooled worker which outlives it
+            self._executed_event.wait(timeout)
 
     def executed_cb(self):
         self.is_executed = True
+        self._executed_event.set()
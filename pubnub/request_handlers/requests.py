@@ -14,6 +14,7 @@ from pubnub.errors import PNERR_CLIENT_ERROR, PNERR_UNKNOWN_ERROR, PNERR_TOO_MAN
 from pubnub.errors import PNERR_SERVER_ERROR
 from pubnub.exceptions import PubNubException
 from pubnub.request_handlers.base import BaseRequestHandler
+from pubnub.request_handlers.executor import RequestExecutor
 from pubnub.structures import RequestOptions, PlatformOptions, ResponseInfo, Envelope
 
 try:
@@ -38,6 +39,14 @@ class RequestsRequestHandler(BaseRequestHandler):
         self.session.mount('https://%s/v2/subscribe' % pubnub.config.origin, HTTPAdapter(pool_maxsize=500))
 
         self.pubnub = pubnub
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def close(self):
+        """Clean up resources: stop the request executor threads and close the HTTP session."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.session.close()
 
     async def async_request(self, options_func, cancellation_event):
         raise NotImplementedError("async_request is not implemented for synchronous handler")
@@ -81,17 +90,36 @@ class RequestsRequestHandler(BaseRequestHandler):
             finally:
                 call.executed_cb()
 
-        self.execute_callback_in_separate_thread(
-            callback_to_invoke_in_separate_thread,
-            endpoint_name,
-            call,
-            cancellation_event
-        )
+        try:
+            self.execute_callback_in_separate_thread(
+                callback_to_invoke_in_separate_thread,
+                endpoint_name,
+                call,
+                cancellation_event
+            )
+        except PubNubException as e:
+            logger.error("Async request rejected. %s" % str(e))
+            callback(Envelope(
+                result=None,
+                status=endpoint_call_options.create_status(
+                    category=PNStatusCategory.PNInternalExceptionCategory,
+                    response=None,
+                    response_info=None,
+                    exception=e)))
+            call.executed_cb()
+
+        return call
 
     def execute_callback_in_separate_thread(
             self, callback_to_invoke_in_another_thread, operation_name, call_obj, cancellation_event
     ):
         client = AsyncHTTPClient(callback_to_invoke_in_another_thread)
+        call_obj.cancellation_event = cancellation_event
+
+        executor = self._get_executor()
+        if executor is not None:
+            executor.submit(client.run)
+            return call_obj
 
         RequestsRequestHandler.ENDPOINT_THREAD_COUNTER += 1
 
@@ -99,13 +127,23 @@ class RequestsRequestHandler(BaseRequestHandler):
             target=client.run,
             name=f"Thread-{operation_name}-{RequestsRequestHandler.ENDPOINT_THREAD_COUNTER}",
             daemon=self.pubnub.config.daemon
-        ).start()
-
+        )
         call_obj.thread = thread
-        call_obj.cancellation_event = cancellation_event
+        thread.start()
 
         return call_obj
 
+    def _get_executor(self):
+        """Return the shared request executor, creating one if needed. None if pooling is disabled. Thread-safe."""
+        if not self.pubnub.config.request_thread_pool_size:
+            return None
+
+        with self._executor_lock:
+            if self._executor is None or self._executor.is_shut_down:
+                logger.debug("Creating new request executor")
+                self._executor = RequestExecutor.from_config(self.pubnub.config)
+            return self._executor
+
     def async_file_based_operation(self, func, callback, operation_name, cancellation_event=None):
         call = Call()
 
@@ -124,15 +162,37 @@ class RequestsRequestHandler(BaseRequestHandler):
             finally:
                 call.executed_cb()
 
-        self.execute_callback_in_separate_thread(
-            callback_to_invoke_in_separate_thread,
-            operation_name,
-            call,
-            cancellation_event
-        )
+        try:
+            self.execute_callback_in_separate_thread(
+                callback_to_invoke_in_separate_thread,
+                operation_name,
+                call,
+                cancellation_event
+            )
+        except PubNubException as e:
+            logger.error("Async file upload request rejected. %s" % str(e))
+            callback(
+                Envelope(result=None, status=e)
+            )
+            call.executed_cb()
 
         return call
 
+    def download_stream(self, url, chunk_size, headers=None, on_response=None):
+        config = self.pubnub.config
+        try:
+            with self.session.get(url, headers={**self.pubnub.headers, **(headers or {})}, stream=True,
+                                  timeout=(config.connect_timeout, config.non_subscribe_request_timeout)) as res:
+                if on_response:
+                    on_response(res.status_code, res.headers)
+                if res.status_code not in (200, 206):
+                    raise self.download_error(res.status_code, res.text)
+                yield from res.iter_content(chunk_size)
+        except requests.exceptions.ConnectionError as e:
+            raise PubNubException(pn_error=PNERR_CONNECTION_ERROR, errormsg=str(e))
+        except requests.exceptions.Timeout as e:
+            raise PubNubException(pn_error=PNERR_CLIENT_TIMEOUT, errormsg=str(e))
+
     def _build_envelope(self, p_options, e_options):
         """ A wrapper for _invoke_url to separate request logic """
 
@@ -140,6 +200,20 @@ class RequestsRequestHandler(BaseRequestHandler):
         response_info = None
 
         url_base_path = self.pubnub.base_origin if e_options.use_base_path else None
+        objects_cache = self.pubnub.objects_cache
+        if objects_cache is not None:
+            cached_response = objects_cache.lookup(e_options)
+            if cached_response is not None:
+                return Envelope(
+                    result=e_options.create_response(cached_response),
+                    status=e_options.create_status(
+                        category=PNStatusCategory.PNAcknowledgmentCategory,
+                        response=cached_response,
+                        response_info=None,
+                        exception=None
+                    )
+                )
+
         try:
             res = self._invoke_request(p_options, e_options, url_base_path)
         except PubNubException as e:
@@ -181,7 +255,22 @@ class RequestsRequestHandler(BaseRequestHandler):
                 )
             )
 
-        if not res.ok:
+        if res.status_code == 304 and objects_cache is not None:
+            cached_response = objects_cache.not_modified(e_options)
+            if cached_response is not None:
+                return Envelope(
+                    result=e_options.create_response(cached_response),
+                    status=e_options.create_status(
+                        category=PNStatusCategory.PNAcknowledgmentCategory,
+                        response=cached_response,
+                        response_info=response_info,
+                        exception=None
+                    )
+                )
+            if objects_cache.drop_revalidation(e_options):
+                return self._build_envelope(p_options, e_options)
+
+        if not res.ok or res.status_code == 304:
             if res.status_code == 403:
                 status_category = PNStatusCategory.PNAccessDeniedCategory
 
@@ -198,7 +287,7 @@ class RequestsRequestHandler(BaseRequestHandler):
             else:
                 err = PNERR_CLIENT_ERROR
             try:
-                response = res.json()
+                response = p_options.pn_config.json_codec.decode(res.content)
             except JSONDecodeError:
                 response = None
             return Envelope(
@@ -216,7 +305,9 @@ class RequestsRequestHandler(BaseRequestHandler):
             if e_options.non_json_response:
                 response = res
             else:
-                response = res.json()
+                response = p_options.pn_config.json_codec.decode(res.content)
+                if objects_cache is not None:
+                    objects_cache.update(e_options, response, res.headers.get('ETag'))
 
             return Envelope(
                 result=e_options.create_response(response),
@@ -327,6 +418,7 @@ class Call(object):
         self.cancellation_event = None
         self.is_executed = False
         self.is_canceled = False
+        self._executed_event = threading.Event()
 
     def cancel(self):
         """
@@ -338,9 +430,13 @@ class Call(object):
             self.cancellation_event.set()
         self.is_canceled = True
 
-    def join(self):
+    def join(self, timeout=None):
         if isinstance(self.thread, threading.Thread):
-            self.thread.join()
+            self.thread.join(timeout)
+        else:
+            # Call is executed by a pooled worker which outlives it
+            self._executed_event.wait(timeout)
 
     def executed_cb(self):
         self.is_executed = True
+        self._executed_event.set()
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces identical concurrent calls made from different threads.
+
+    The first caller for a given key (the leader) executes the call, every caller arriving while it is
+    in flight waits for the leader and receives the same result (or the same exception). Nothing is cached:
+    once the call completes, the next caller for that key triggers a new one.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    @property
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key, func):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _InFlightCall()
+
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Coalesces identical concurrent coroutine calls made on one event loop.
+
+    The call runs in its own task shared by all callers. A caller being cancelled does not affect the others,
+    the shared task is cancelled only when the last waiting caller is cancelled.
+    """
+
+    def __init__(self):
+        self._calls = {}
+
+    @property
+    def in_flight(self):
+        return len(self._calls)
+
+    async def do(self, key, coroutine_func):
+        entry = self._calls.get(key)
+        if entry is None:
+            entry = self._calls[key] = {'task': asyncio.ensure_future(coroutine_func()), 'waiters': 0}
+            entry['task'].add_done_callback(lambda _: self._forget(key, entry))
+
+        task = entry['task']
+        entry['waiters'] += 1
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if entry['waiters'] == 1 and not task.done():
+                task.cancel()
+            raise
+        finally:
+            entry['waiters'] -= 1
+
+    def _forget(self, key, entry):
+        if self._calls.get(key) is entry:
+            del self._calls[key]
@@ -1,4 +1,26 @@
-from .enums import HttpMethod
+from .enums import HttpMethod, PNOperationType
+
+# reads without side effects, identical concurrent ones can share a single response
+COALESCABLE_OPERATIONS = frozenset([
+    PNOperationType.PNTimeOperation,
+    PNOperationType.PNHereNowOperation,
+    PNOperationType.PNWhereNowOperation,
+    PNOperationType.PNGetState,
+    PNOperationType.PNHistoryOperation,
+    PNOperationType.PNFetchMessagesOperation,
+    PNOperationType.PNMessageCountOperation,
+    PNOperationType.PNGetMessageActions,
+    PNOperationType.PNChannelsForGroupOperation,
+    PNOperationType.PNPushNotificationEnabledChannelsOperation,
+    PNOperationType.PNAccessManagerAudit,
+    PNOperationType.PNGetFilesAction,
+    PNOperationType.PNGetUuidMetadataOperation,
+    PNOperationType.PNGetAllUuidMetadataOperation,
+    PNOperationType.PNGetChannelMetadataOperation,
+    PNOperationType.PNGetAllChannelMetadataOperation,
+    PNOperationType.PNGetChannelMembersOperation,
+    PNOperationType.PNGetMembershipsOperation,
+])
 
 
 class RequestOptions(object):
@@ -53,6 +75,26 @@ class RequestOptions(object):
     def is_patch(self):
         return self._method is HttpMethod.PATCH
 
+    def is_coalescable(self):
+        """ Only JSON reads can be safely shared between identical concurrent requests. Many writes (publish,
+        signal, grant, channel group and push changes) are GET requests as well, so reads are taken from
+        an allowlist of operation types """
+        if self.operation_type not in COALESCABLE_OPERATIONS:
+            return False
+        return self._method is HttpMethod.GET and not self.non_json_response and self.files is None
+
+    def canonical_query(self):
+        """ Sorted query without signature and timestamp, which differ between otherwise identical signed requests """
+        return tuple(sorted(
+            (str(k), str(v)) for k, v in self.params.items() if k not in ('signature', 'timestamp')
+        ))
+
+    @property
+    def coalescing_key(self):
+        """ Identifies identical requests: method, path, canonical query and headers """
+        headers = tuple(sorted(self.request_headers.items())) if self.request_headers else ()
+        return self.method_string, self.use_base_path, self.path, self.canonical_query(), headers
+
     def query_list(self):
         """ All query keys and values should be already encoded inside a build_params() method"""
         s = []
@@ -1,7 +1,6 @@
 import datetime
 import functools
 import hmac
-import json
 import uuid as u
 import threading
 import urllib
@@ -14,6 +13,7 @@ from pubnub.enums import PNStatusCategory, PNOperationType, PNPushType, HttpMeth
 from pubnub.models.consumer.common import PNStatus
 from pubnub.errors import PNERR_JSON_NOT_SERIALIZABLE
 from pubnub.exceptions import PubNubException
+from pubnub.json_codec import get_default_codec
 from pubnub.models.consumer.pn_error_data import PNErrorData
 
 
@@ -27,9 +27,9 @@ def get_data_for_user(data):
         return data
 
 
-def write_value_as_string(data):
+def write_value_as_string(data, codec=None):
     try:
-        return json.dumps(data)
+        return (codec or get_default_codec()).encode(data)
     except TypeError as e:
         exc = PubNubException(
             errormsg=str(e),
@@ -47,9 +47,9 @@ def url_encode(data):
     return urllib.parse.quote(data, safe="~").replace("+", "%2B")
 
 
-def url_write(data):
+def url_write(data, codec=None):
     """ Just wraps url_encode(write_value_as_string()) """
-    return url_encode(write_value_as_string(data))
+    return url_encode(write_value_as_string(data, codec))
 
 
 def uuid():
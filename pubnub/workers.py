@@ -1,6 +1,7 @@
 import logging
 
 from abc import abstractmethod
+from functools import partial
 from typing import Union
 
 from pubnub.enums import PNStatusCategory, PNOperationType
@@ -24,12 +25,18 @@ logger = logging.getLogger("pubnub")
 class BaseMessageWorker:
     # _pubnub: PubNub
     _listener_manager: Union[ListenerManager, None] = None
+    # messages collected while processing a batch of payloads, announced together through `messages` callbacks
+    _message_batch: Union[list, None] = None
+    # payloads of the current batch decrypted ahead in the decryption thread pool
+    _decrypted_payloads: Union[dict, None] = None
 
     TYPE_MESSAGE = 0
     TYPE_SIGNAL = 1
     TYPE_OBJECT = 2
     TYPE_MESSAGE_ACTION = 3
     TYPE_FILE_MESSAGE = 4
+    # types of messages whose payloads may be encrypted
+    ENCRYPTED_TYPES = (TYPE_MESSAGE, TYPE_SIGNAL, TYPE_FILE_MESSAGE)
 
     def __init__(self, pubnub_instance) -> None:
         self._pubnub = pubnub_instance
@@ -40,27 +47,66 @@ class BaseMessageWorker:
             .file_name(extracted_message["file"]["name"])\
             .file_id(extracted_message["file"]["id"]).get_complete_url()
 
+    def _decrypt(self, message_input):
+        try:
+            return self._pubnub.crypto.decrypt(message_input), None
+        except Exception as exception:
+            return message_input, exception
+
     def _process_message(self, message_input):
         if self._pubnub.config.cipher_key is None:
             return message_input, None
+
+        if self._decrypted_payloads and id(message_input) in self._decrypted_payloads:
+            message, exception = self._decrypted_payloads[id(message_input)]
         else:
-            try:
-                return self._pubnub.crypto.decrypt(message_input), None
-            except Exception as exception:
-                logger.warning("could not decrypt message: \"%s\", due to error %s" % (message_input, str(exception)))
-
-                pn_status = PNStatus()
-                pn_status.category = PNStatusCategory.PNDecryptionErrorCategory
-                pn_status.error_data = PNErrorData(str(exception), exception)
-                pn_status.error = True
-                pn_status.operation = PNOperationType.PNSubscribeOperation
-                self.announce(pn_status)
-                return message_input, exception
+            message, exception = self._decrypt(message_input)
+
+        if exception is not None:
+            logger.warning("could not decrypt message: \"%s\", due to error %s" % (message_input, str(exception)))
+
+            pn_status = PNStatus()
+            pn_status.category = PNStatusCategory.PNDecryptionErrorCategory
+            pn_status.error_data = PNErrorData(str(exception), exception)
+            pn_status.error = True
+            pn_status.operation = PNOperationType.PNSubscribeOperation
+            self.announce(pn_status)
+        return message, exception
+
+    def _encrypted_payloads(self, messages):
+        """ Payloads of messages, signals and file messages to decrypt ahead in the decryption thread pool, empty
+        when the pool is not configured """
+        if self._pubnub.config.cipher_key is None or not self._pubnub.config.decryption_thread_pool_size:
+            return []
+        return [message.payload for message in messages
+                if "-pnpres" not in message.channel and message.type in BaseMessageWorker.ENCRYPTED_TYPES]
+
+    def _decrypt_payloads(self, messages):
+        """ Decrypts payloads of a batch in parallel, results are keyed by payload identity and keep their order
+        once the messages are processed """
+        payloads = self._encrypted_payloads(messages)
+        if len(payloads) < 2:
+            return None
+        try:
+            decrypted = self._pubnub.crypto.decrypt_many(payloads, executor=self._pubnub._get_decryption_executor(),
+                                                         return_exceptions=True)
+        except RuntimeError:
+            # the pool was shut down by `stop()` meanwhile, the payloads are decrypted one by one when processed
+            return None
+        return {id(payload): (payload, result) if isinstance(result, Exception) else (result, None)
+                for payload, result in zip(payloads, decrypted)}
 
     def announce(self, result):
         if not self._listener_manager:
             return
 
+        if self._message_batch is not None:
+            if type(result) is PNMessageResult:
+                self._message_batch.append(result)
+                return
+            # keep the order of events: messages received before this one are announced first
+            self._flush_message_batch()
+
         if isinstance(result, PNStatus):
             self._listener_manager.announce_status(result)
 
@@ -88,6 +134,26 @@ class BaseMessageWorker:
         elif isinstance(result, PNMessageResult):
             self._listener_manager.announce_message(result)
 
+    def _flush_message_batch(self):
+        if self._message_batch:
+            batch, self._message_batch = self._message_batch, []
+            self._listener_manager.announce_messages(batch)
+
+    def _process_incoming_payloads(self, messages, decrypted_payloads=None):
+        """ Processes payloads received together, consecutive messages are announced as one batch """
+        if decrypted_payloads is None:
+            decrypted_payloads = self._decrypt_payloads(messages)
+
+        self._decrypted_payloads = decrypted_payloads
+        self._message_batch = []
+        try:
+            for message in messages:
+                self._process_incoming_payload(message)
+            self._flush_message_batch()
+        finally:
+            self._message_batch = None
+            self._decrypted_payloads = None
+
     def _process_incoming_payload(self, message: SubscribeMessage):
         assert isinstance(message, SubscribeMessage)
 
@@ -121,7 +187,8 @@ class BaseMessageWorker:
                 state=presence_payload.data,
                 join=message.payload.get('join', None),
                 leave=message.payload.get('leave', None),
-                timeout=message.payload.get('timeout', None)
+                timeout=message.payload.get('timeout', None),
+                here_now_refresh=bool(message.payload.get('here_now_refresh', False))
             )
 
             self.announce(pn_presence_event_result)
@@ -154,7 +221,8 @@ class BaseMessageWorker:
 
         elif message.type == SubscribeMessageWorker.TYPE_FILE_MESSAGE:
             extracted_message, _ = self._process_message(message.payload)
-            download_url = self._get_url_for_file_event_message(channel, extracted_message)
+            # building the signed download url is left to the first access of `file_url`
+            download_url = partial(self._get_url_for_file_event_message, channel, extracted_message)
 
             pn_file_result = PNFileMessageResult(
                 message=extracted_message.get("message"),
@@ -198,7 +266,7 @@ class BaseMessageWorker:
                     message_action['uuid'] = publisher
                 message_action_result = PNMessageActionResult(message_action, subscription=subscription_match,
                                                               channel=channel)
-                self._listener_manager.announce_message_action(message_action_result)
+                self.announce(message_action_result)
 
             else:
                 pn_message_result = PNMessageResult(
@@ -216,6 +284,9 @@ class BaseMessageWorker:
 
 
 class SubscribeMessageWorker(BaseMessageWorker):
+    # a subscribe response carries at most 100 messages
+    MAX_BATCH_SIZE = 100
+
     def __init__(self, pubnub_instance, listener_manager_instance, queue_instance, event):
         # assert isinstance(pubnub_instnace, PubNubCore)
         # assert isinstance(listener_manager_instance, ListenerManager)
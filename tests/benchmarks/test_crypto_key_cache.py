@@ -0,0 +1,45 @@
+"""Cost of getting the crypto module through `PubNub.crypto` with the default crypto module kept and with the module
+rebuilt on every access, as it was for every encrypted or decrypted message.
+
+Benchmarks are excluded from the default test run, run them explicitly with `pytest -s tests/benchmarks`.
+"""
+import time
+
+import pytest
+
+from pubnub.crypto import AesCbcCryptoModule, LegacyCryptoModule
+from pubnub.pnconfiguration import PNConfiguration
+from pubnub.pubnub import PubNub
+
+ACCESSES = 20000
+MESSAGE = '{"text": "hello", "sender": "benchmark"}'
+
+
+def create_config(module_class):
+    config = PNConfiguration()
+    config.cipher_key = "benchmark-cipher-key"
+    config.user_id = "benchmark"
+    config.DEFAULT_CRYPTO_MODULE = module_class
+    return config
+
+
+def measure(crypto):
+    start = time.perf_counter()
+    for _ in range(ACCESSES):
+        crypto().encode_header()
+    return (time.perf_counter() - start) / ACCESSES
+
+
+@pytest.mark.parametrize("module_class", [LegacyCryptoModule, AesCbcCryptoModule])
+def test_default_crypto_module_is_kept(module_class):
+    config = create_config(module_class)
+    pubnub = PubNub(config)
+    assert pubnub.crypto.decrypt(pubnub.crypto.encrypt(MESSAGE)) == {"text": "hello", "sender": "benchmark"}
+
+    rebuilt = measure(lambda: module_class(config))
+    kept = measure(lambda: pubnub.crypto)
+    pubnub.stop()
+
+    print("\n%s: module per access %.2f us, kept %.2f us"
+          % (module_class.__name__, rebuilt * 1e6, kept * 1e6))
+    assert kept < rebuilt
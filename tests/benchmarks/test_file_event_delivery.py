@@ -0,0 +1,70 @@
+"""Delivery throughput of file events with the download url built eagerly and on first access of `file_url`.
+
+Benchmarks are excluded from the default test run, run them explicitly with `pytest -s tests/benchmarks`.
+"""
+import time
+from unittest.mock import patch
+
+from pubnub.callbacks import SubscribeCallback
+from pubnub.managers import ListenerManager
+from pubnub.models.server.subscribe import SubscribeMessage
+from pubnub.pnconfiguration import PNConfiguration
+from pubnub.pubnub import PubNub
+from pubnub.workers import BaseMessageWorker
+
+EVENTS = 5000
+
+
+class FileListener(SubscribeCallback):
+    def __init__(self):
+        self.files = 0
+
+    def status(self, pubnub, status):
+        pass
+
+    def presence(self, pubnub, presence):
+        pass
+
+    def file(self, pubnub, file_message):
+        self.files += 1
+
+
+def create_worker():
+    config = PNConfiguration()
+    config.subscribe_key = "benchmark-sub"
+    config.publish_key = "benchmark-pub"
+    config.secret_key = "benchmark-secret"
+    config.user_id = "benchmark"
+    pubnub = PubNub(config)
+    worker = BaseMessageWorker(pubnub)
+    worker._listener_manager = ListenerManager(pubnub)
+    listener = FileListener()
+    worker._listener_manager.add_listener(listener)
+    return worker, listener
+
+
+def file_messages():
+    return [SubscribeMessage().from_json({
+        "c": "files-%d" % (index % 10), "f": 0, "k": "benchmark-sub", "e": 4, "p": {"t": "17000000000000000", "r": 1},
+        "d": {"message": "attachment", "file": {"id": "file-%d" % index, "name": "photo-%d.jpg" % index}}
+    }) for index in range(EVENTS)]
+
+
+def measure(worker, messages):
+    start = time.perf_counter()
+    for message in messages:
+        worker._process_incoming_payload(message)
+    return EVENTS / (time.perf_counter() - start)
+
+
+def test_lazy_file_url():
+    messages = file_messages()
+    worker, listener = create_worker()
+
+    with patch("pubnub.workers.partial", lambda func, *args: func(*args)):
+        eager = measure(worker, messages)
+    lazy = measure(worker, messages)
+
+    assert listener.files == 2 * EVENTS
+    print("\nfile events: eager url %.0f events/s, lazy url %.0f events/s" % (eager, lazy))
+    assert lazy > eager
@@ -0,0 +1,58 @@
+"""Compares the subscription registry dispatch with a linear scan over all subscriptions.
+
+Benchmarks are excluded from the default test run, run them explicitly with `pytest -s tests/benchmarks`.
+"""
+import time
+from unittest.mock import MagicMock
+
+from pubnub.models.consumer.pubsub import PNMessageResult
+from pubnub.models.subscription import PNSubscriptionRegistry, PNSubscriptionType, PubNubSubscription
+
+SUBSCRIPTIONS = 10000
+EVENTS = 2000
+
+
+def create_registry():
+    pubnub = MagicMock()
+    pubnub._subscription_manager._timetoken = 0
+    registry = PNSubscriptionRegistry(pubnub)
+    pubnub._subscription_registry = registry
+    return pubnub, registry
+
+
+def measure(func, events):
+    start = time.perf_counter()
+    for index in range(events):
+        func(index)
+    return (time.perf_counter() - start) / events
+
+
+def run(names):
+    pubnub, registry = create_registry()
+    subscriptions = [PubNubSubscription(pubnub, name, PNSubscriptionType.CHANNEL) for name in names]
+    for subscription in subscriptions:
+        subscription.subscribe()
+    events = [PNMessageResult("payload", None, "region-%d.tenant-%d.room" % (i % 100, i), 1) for i in range(EVENTS)]
+
+    def indexed(index):
+        return [emitter for emitter in registry.get_listeners_for(events[index])
+                if emitter.is_matching_listener(events[index])]
+
+    def linear(index):
+        return [subscription for subscription in subscriptions if subscription.is_matching_listener(events[index])]
+
+    assert all(set(indexed(index)) == set(linear(index)) for index in range(0, EVENTS, 97))
+    indexed_time, linear_time = measure(indexed, EVENTS), measure(linear, EVENTS // 20)
+    print("\n%d subscriptions: indexed %.2f us/event, linear %.2f us/event"
+          % (len(names), indexed_time * 1e6, linear_time * 1e6))
+    return indexed_time, linear_time
+
+
+def test_wildcard_subscriptions():
+    indexed_time, linear_time = run(["region-%d.tenant-%d.*" % (i % 100, i) for i in range(SUBSCRIPTIONS)])
+    assert indexed_time < linear_time
+
+
+def test_exact_subscriptions():
+    indexed_time, linear_time = run(["region-%d.tenant-%d.room" % (i % 100, i) for i in range(SUBSCRIPTIONS)])
+    assert indexed_time < linear_time
@@ -0,0 +1,144 @@
+import asyncio
+import threading
+import time
+
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from pubnub.endpoints.objects_v2.bulk import BulkPacer
+from pubnub.endpoints.objects_v2.channel.remove_channel import RemoveChannel
+from pubnub.endpoints.objects_v2.uuid.set_uuid import SetUuid
+from pubnub.exceptions import PubNubException
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from tests.helper import pnconf_copy
+
+
+class ConcurrencyCounter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.running -= 1
+
+
+@pytest.fixture(autouse=True)
+def short_pacing():
+    with patch.object(BulkPacer, "MIN_INTERVAL", 0.001):
+        yield
+
+
+def test_pacer_backs_off_on_throttling_and_recovers():
+    pacer = BulkPacer()
+    assert pacer.reserve() == 0 and pacer.reserve() == 0
+
+    pacer.throttled()
+    pacer.throttled()
+    assert pacer.interval == 2 * BulkPacer.MIN_INTERVAL
+    assert pacer.reserve() > 0
+
+    pacer.succeeded()
+    pacer.succeeded()
+    assert pacer.interval == 0
+
+
+def test_bulk_set_uuid_metadata_retries_throttled_requests():
+    pubnub = PubNub(pnconf_copy())
+    counter = ConcurrencyCounter()
+    attempts = {}
+    consumed = []
+
+    def sync(endpoint):
+        attempts[endpoint._uuid] = attempts.get(endpoint._uuid, 0) + 1
+        with counter:
+            time.sleep(0.01)
+        if endpoint._uuid == "user-7":
+            raise PubNubException(errormsg="Forbidden", status_code=403)
+        if endpoint._uuid == "user-3" and attempts["user-3"] < 3:
+            raise PubNubException(errormsg="Too Many Requests", status_code=429)
+        return Mock(result=endpoint._name)
+
+    def entities():
+        for n in range(20):
+            consumed.append(n)
+            yield {"uuid": "user-%d" % n, "name": "User %d" % n}
+
+    with patch.object(SetUuid, "sync", sync):
+        outcomes = pubnub.bulk_set_uuid_metadata(entities(), concurrency=4)
+        first = next(outcomes)
+        # entities are taken only when there is room for their requests
+        assert len(consumed) <= 5
+        outcomes = [first] + list(outcomes)
+
+    assert counter.max_running == 4
+    by_id = {outcome.id: outcome for outcome in outcomes}
+    assert len(by_id) == 20
+    assert by_id["user-3"].result == "User 3" and by_id["user-3"].attempts == 3
+    assert by_id["user-7"].is_error() and by_id["user-7"].attempts == 1
+    assert attempts["user-7"] == 1
+
+
+@pytest.mark.asyncio
+async def test_asyncio_bulk_remove_channel_metadata():
+    pubnub = PubNubAsyncio(pnconf_copy())
+    counter = ConcurrencyCounter()
+    attempts = {}
+
+    async def result(endpoint):
+        attempts[endpoint._channel] = attempts.get(endpoint._channel, 0) + 1
+        with counter:
+            await asyncio.sleep(0.01)
+        if endpoint._channel == "channel-2" and attempts["channel-2"] == 1:
+            raise PubNubException(errormsg="Service Unavailable", status_code=503)
+        return endpoint._channel
+
+    try:
+        with patch.object(RemoveChannel, "result", result):
+            outcomes = [outcome async for outcome in
+                        pubnub.bulk_remove_channel_metadata(("channel-%d" % n for n in range(10)), concurrency=3)]
+    finally:
+        await pubnub.close_session()
+
+    assert counter.max_running == 3
+    assert sorted(outcome.result for outcome in outcomes) == sorted("channel-%d" % n for n in range(10))
+    assert {outcome.id: outcome.attempts for outcome in outcomes}["channel-2"] == 2
+
+
+@pytest.mark.asyncio
+async def test_asyncio_bulk_reports_transport_errors_per_object():
+    pubnub = PubNubAsyncio(pnconf_copy())
+    attempts = {}
+
+    async def result(endpoint):
+        attempts[endpoint._channel] = attempts.get(endpoint._channel, 0) + 1
+        if endpoint._channel == "channel-1" and attempts["channel-1"] == 1:
+            raise httpx.ConnectError("connection reset")
+        if endpoint._channel == "channel-2":
+            raise asyncio.TimeoutError()
+        if endpoint._channel == "channel-3":
+            raise ValueError("unexpected")
+        return endpoint._channel
+
+    try:
+        with patch.object(RemoveChannel, "result", result):
+            outcomes = [outcome async for outcome in
+                        pubnub.bulk_remove_channel_metadata(("channel-%d" % n for n in range(5)), concurrency=2)]
+    finally:
+        await pubnub.close_session()
+
+    by_id = {outcome.id: outcome for outcome in outcomes}
+    assert len(by_id) == 5
+    assert by_id["channel-1"].result == "channel-1" and by_id["channel-1"].attempts == 2
+    assert isinstance(by_id["channel-2"].error, asyncio.TimeoutError) and by_id["channel-2"].attempts == 5
+    assert isinstance(by_id["channel-3"].error, ValueError) and by_id["channel-3"].attempts == 1
+    assert not by_id["channel-4"].is_error()
@@ -0,0 +1,87 @@
+import threading
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pubnub.endpoints.objects_v2.members.get_channel_members import GetChannelMembers
+from pubnub.endpoints.objects_v2.uuid.get_all_uuid import GetAllUuid
+from pubnub.exceptions import PubNubException
+from pubnub.models.consumer.objects_v2.channel_members import PNGetChannelMembersResult
+from pubnub.models.consumer.objects_v2.uuid import PNGetAllUUIDMetadataResult
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from tests.helper import pnconf_copy
+
+PAGES = {
+    None: {"status": 200, "data": [{"id": "user-1"}, {"id": "user-2"}], "next": "page-2"},
+    "page-2": {"status": 200, "data": [{"id": "user-3"}, {"id": "user-4"}], "next": "page-3"},
+    "page-3": {"status": 200, "data": [{"id": "user-5"}], "next": "page-4"},
+    "page-4": {"status": 200, "data": [], "next": "page-5"},
+}
+
+
+def requested_page(endpoint):
+    return endpoint._page.hash if endpoint._page else None
+
+
+def test_iterate_follows_and_prefetches_next_pages():
+    pubnub = PubNub(pnconf_copy())
+    requests = []
+    second_page_requested = threading.Event()
+
+    def sync(endpoint):
+        requests.append(requested_page(endpoint))
+        if requests[-1] == "page-2":
+            second_page_requested.set()
+        return Mock(result=PNGetAllUUIDMetadataResult(PAGES[requests[-1]]))
+
+    with patch.object(GetAllUuid, "sync", sync):
+        users = pubnub.get_all_uuid_metadata().limit(2).iterate()
+        assert next(users) == {"id": "user-1"}
+        # the second page is requested while the first one is consumed
+        assert second_page_requested.wait(5)
+        assert [user["id"] for user in users] == ["user-2", "user-3", "user-4", "user-5"]
+
+    assert requests == [None, "page-2", "page-3", "page-4"]
+
+
+def test_iterate_raises_request_errors():
+    pubnub = PubNub(pnconf_copy())
+
+    def sync(endpoint):
+        if endpoint._page:
+            raise PubNubException(errormsg="request failed")
+        return Mock(result=PNGetChannelMembersResult(PAGES[None]))
+
+    with patch.object(GetChannelMembers, "sync", sync):
+        members = pubnub.get_channel_members().channel("channel").iterate()
+        assert [next(members), next(members)] == PAGES[None]["data"]
+        with pytest.raises(PubNubException):
+            next(members)
+
+
+def test_write_requests_cannot_be_iterated():
+    pubnub = PubNub(pnconf_copy())
+
+    with pytest.raises(PubNubException):
+        next(pubnub.manage_memberships().uuid("user").set([]).iterate())
+
+
+@pytest.mark.asyncio
+async def test_aiterate_follows_next_pages():
+    pubnub = PubNubAsyncio(pnconf_copy())
+    requests = []
+
+    async def result(endpoint):
+        requests.append(requested_page(endpoint))
+        return PNGetAllUUIDMetadataResult(PAGES[requests[-1]])
+
+    try:
+        with patch.object(GetAllUuid, "result", result):
+            users = [user["id"] async for user in pubnub.get_all_uuid_metadata().aiterate()]
+    finally:
+        await pubnub.close_session()
+
+    assert users == ["user-1", "user-2", "user-3", "user-4", "user-5"]
+    assert requests == [None, "page-2", "page-3", "page-4"]
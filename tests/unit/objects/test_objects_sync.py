@@ -0,0 +1,120 @@
+import threading
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pubnub.endpoints.objects_v2.members.get_channel_members import GetChannelMembers
+from pubnub.endpoints.objects_v2.members.manage_channel_members import ManageChannelMembers
+from pubnub.endpoints.objects_v2.memberships.get_memberships import GetMemberships
+from pubnub.endpoints.objects_v2.memberships.manage_memberships import ManageMemberships
+from pubnub.exceptions import PubNubException
+from pubnub.models.consumer.objects_v2.channel_members import PNUserMember
+from pubnub.models.consumer.objects_v2.memberships import PNChannelMembership
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from tests.helper import pnconf_copy
+
+CURRENT_MEMBERSHIPS = [{"channel": {"id": "room-0"}, "custom": {"role": "member"}}] + \
+    [{"channel": {"id": "room-%d" % n}, "status": "active"} for n in range(1, 150)]
+
+
+def desired_channels():
+    return [PNChannelMembership("room-0", custom={"role": "admin"}),
+            PNChannelMembership("room-1", status="active")] + \
+        ["room-%d" % n for n in range(2, 100)] + ["room-%d" % n for n in range(200, 350)]
+
+
+def test_sync_memberships_sends_only_the_difference():
+    pubnub = PubNub(pnconf_copy())
+    lock = threading.Lock()
+    requests = []
+
+    def sync(endpoint):
+        payload = endpoint.build_data()
+        with lock:
+            requests.append(payload)
+        if "room-300" in payload:
+            raise PubNubException(errormsg="Forbidden", status_code=403)
+        return Mock(result=None)
+
+    with patch.object(GetMemberships, "iterate", Mock(return_value=iter(CURRENT_MEMBERSHIPS))), \
+            patch.object(ManageMemberships, "sync", sync):
+        result = pubnub.sync_memberships("user-1", desired_channels(), concurrency=2)
+
+    assert len(requests) == 3
+    assert all(payload.count('"id"') <= 100 for payload in requests)
+    assert len(result.failed) == 1 and result.is_error()
+    assert "room-0" in result.set and "room-1" not in result.set and "room-50" not in result.set
+    assert len(result.set) + len(result.removed) == 101
+    assert set(result.removed) <= {"room-%d" % n for n in range(100, 150)}
+
+
+@pytest.mark.asyncio
+async def test_asyncio_sync_channel_members():
+    pubnub = PubNubAsyncio(pnconf_copy())
+    requests = []
+
+    async def current_members(endpoint):
+        for uuid in ("user-1", "user-2", "user-3"):
+            yield {"uuid": {"id": uuid}}
+
+    async def result(endpoint):
+        requests.append(endpoint.build_data())
+        return None
+
+    try:
+        with patch.object(GetChannelMembers, "aiterate", current_members), \
+                patch.object(ManageChannelMembers, "result", result):
+            outcome = await pubnub.sync_channel_members(
+                "room-1", ["user-1", PNUserMember("user-2", custom={"team": "red"}), "user-4"])
+            unchanged = await pubnub.sync_channel_members("room-1", ["user-1", "user-2", "user-3"])
+    finally:
+        await pubnub.close_session()
+
+    assert len(requests) == 1
+    assert sorted(outcome.set) == ["user-2", "user-4"] and outcome.removed == ["user-3"]
+    assert not outcome.is_error()
+    assert unchanged.set == [] and unchanged.removed == []
+
+
+@pytest.mark.asyncio
+async def test_asyncio_sync_keeps_outcomes_of_other_chunks_when_one_raises():
+    pubnub = PubNubAsyncio(pnconf_copy())
+
+    async def no_memberships(endpoint):
+        for membership in ():
+            yield membership
+
+    async def result(endpoint):
+        if "room-150" in endpoint.build_data():
+            raise ValueError("unexpected response")
+        return None
+
+    try:
+        with patch.object(GetMemberships, "aiterate", no_memberships), \
+                patch.object(ManageMemberships, "result", result):
+            outcome = await pubnub.sync_memberships("user-1", ["room-%d" % n for n in range(250)])
+    finally:
+        await pubnub.close_session()
+
+    assert len(outcome.failed) == 1 and isinstance(outcome.failed[0].error, ValueError)
+    assert outcome.set == ["room-%d" % n for n in range(100)] + ["room-%d" % n for n in range(200, 250)]
+
+
+def test_sync_records_a_chunk_whose_request_raised():
+    pubnub = PubNub(pnconf_copy())
+    executed = []
+
+    def execute(endpoint, pacer, max_attempts):
+        executed.append(endpoint)
+        if len(executed) == 1:
+            raise RuntimeError("worker failed")
+        return Mock(is_error=Mock(return_value=False))
+
+    with patch.object(GetMemberships, "iterate", Mock(return_value=iter([]))), \
+            patch("pubnub.endpoints.objects_v2.bulk.execute", execute):
+        result = pubnub.sync_memberships("user-1", ["room-%d" % n for n in range(150)], concurrency=1)
+
+    assert len(result.failed) == 1 and isinstance(result.failed[0].error, RuntimeError)
+    assert result.set == ["room-%d" % n for n in range(100, 150)]
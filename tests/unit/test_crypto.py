@@ -1,7 +1,10 @@
+import tracemalloc
+from unittest.mock import patch
+
 from pubnub.pubnub import PubNub
 from pubnub.pnconfiguration import PNConfiguration
 from pubnub.crypto import PubNubCryptodome, PubNubCrypto, AesCbcCryptoModule, PubNubCryptoModule
-from pubnub.crypto_core import PubNubAesCbcCryptor, PubNubLegacyCryptor
+from pubnub.crypto_core import PubNubAesCbcCryptor, PubNubLegacyCryptor, _derive_key, _derive_legacy_key
 from pubnub.exceptions import PubNubException
 from tests.helper import pnconf_file_copy, hardcoded_iv_config_copy, pnconf_env_copy
 
@@ -85,6 +88,19 @@ class TestPubNubCryptoInterface:
         assert isinstance(config.crypto, PubNubCrypto)
         assert isinstance(config.crypto, CustomCryptor)
 
+    def test_default_crypto_module_is_kept_until_settings_change(self):
+        config = pnconf_env_copy()
+        config.cipher_key = 'myCipherKey'
+        pubnub = PubNub(config)
+
+        crypto = pubnub.crypto
+        assert pubnub.crypto is crypto
+
+        config.cipher_key = 'otherCipherKey'
+        assert pubnub.crypto is not crypto
+        assert pubnub.crypto is pubnub.crypto
+        assert pubnub.crypto.decrypt(AesCbcCryptoModule(config).encrypt('hello')) == 'hello'
+
 
 class TestPubNubCryptoModule:
     cipher_key = 'myCipherKey'
@@ -213,3 +229,64 @@ class TestPubNubCryptoModule:
             "mvPmbuQKLErBzS2l7vEohCwbmAJODPR2yNhJGB8989reTZ7Y7Q=="
         decrypted = crypto.decrypt(phpmess)
         assert decrypted == 'PHP can into space with headers and aes cbc and other shiny stuff'
+
+    def test_file_decryption_works_on_views(self):
+        file_content = bytes(range(256)) * 41
+        for crypto in (AesCbcCryptoModule(self.config(self.cipher_key, True)),
+                       AesCbcCryptoModule(self.config(self.cipher_key, False))):
+            for cryptor_id in ('ACRH', '0000'):
+                encrypted = crypto.encrypt_file(file_content, cryptor_id=cryptor_id)
+                for encrypted_data in (encrypted, bytearray(encrypted), memoryview(encrypted)):
+                    decrypted = crypto.decrypt_file(encrypted_data)
+                    assert isinstance(decrypted, bytearray) and decrypted == file_content
+
+        header = crypto.decode_header(memoryview(b'PNED\x01ACRH\xff\x01\x00' + b'\x21' * 256 + b'payload'))
+        assert header['cryptor_data'] == b'\x21' * 256
+        assert header['length'] == 12 + 256
+
+    def test_custom_cryptor_receives_bytes(self):
+        received = []
+
+        class RecordingCryptor(PubNubAesCbcCryptor):
+            def decrypt(self, payload, **kwargs):
+                received.append(payload['data'])
+                return bytearray(super().decrypt(payload, **kwargs))
+
+        cryptor = RecordingCryptor(self.cipher_key)
+        crypto = PubNubCryptoModule({cryptor.CRYPTOR_ID: cryptor}, cryptor)
+        encrypted = crypto.encrypt_file(b'knights who say NI')
+
+        decrypted = crypto.decrypt_file(memoryview(encrypted))
+        assert type(received[0]) is bytes
+        assert decrypted == b'knights who say NI'
+
+    def test_file_encryption_and_decryption_allocate_one_buffer(self):
+        file_content = bytes(range(256)) * 4096 * 8
+        for crypto in (AesCbcCryptoModule(self.config(self.cipher_key, True)),
+                       AesCbcCryptoModule(self.config(self.cipher_key, False))):
+            for cryptor_id in ('ACRH', '0000'):
+                tracemalloc.start()
+                try:
+                    encrypted = crypto.encrypt_file(file_content, cryptor_id=cryptor_id)
+                    encryption_peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.reset_peak()
+                    decrypted = crypto.decrypt_file(encrypted)
+                    decryption_peak = tracemalloc.get_traced_memory()[1] - len(encrypted)
+                finally:
+                    tracemalloc.stop()
+
+                assert decrypted == file_content
+                assert encryption_peak < 1.1 * len(file_content)
+                assert decryption_peak < 1.1 * len(file_content)
+
+    def test_cipher_key_is_derived_once_per_cryptor(self):
+        with patch('pubnub.crypto_core._derive_key', wraps=_derive_key) as derive_key, \
+                patch('pubnub.crypto_core._derive_legacy_key', wraps=_derive_legacy_key) as derive_legacy_key:
+            crypto = AesCbcCryptoModule(self.config(self.cipher_key, True))
+            for _ in range(3):
+                for cryptor_id in ('ACRH', '0000'):
+                    assert crypto.decrypt(crypto.encrypt('hello', cryptor_id=cryptor_id)) == 'hello'
+
+        # the legacy key is derived from the same hash, so each cryptor hashes the cipher key once
+        assert derive_key.call_count == 2
+        assert derive_legacy_key.call_count == 1
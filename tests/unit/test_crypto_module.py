@@ -1177,6 +1177,43 @@ class TestAesCbcCryptoModule:
         decrypted = aes_module.decrypt(encrypted)
         assert decrypted == test_message
 
+    def test_aes_cbc_crypto_module_batch_round_trip(self):
+        """Test encrypt_many / decrypt_many keep order, with and without an executor."""
+        from concurrent.futures import ThreadPoolExecutor
+        from pubnub.crypto import AesCbcCryptoModule
+
+        config = PNConfiguration()
+        config.cipher_key = 'test_cipher_key'
+        aes_module = AesCbcCryptoModule(config)
+        messages = ['message %d' % index for index in range(50)]
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            encrypted = aes_module.encrypt_many(messages, executor=executor)
+            assert aes_module.decrypt_many(encrypted, executor=executor) == messages
+
+        legacy = aes_module.encrypt_many(messages[:3], cryptor_id='0000')
+        assert aes_module.decrypt_many(legacy + encrypted[3:]) == messages
+
+    def test_aes_cbc_crypto_module_decrypt_many_errors(self):
+        """Test decrypt_many raises by default and returns exceptions in place on request."""
+        from pubnub.crypto import AesCbcCryptoModule
+        from pubnub.exceptions import PubNubException
+
+        config = PNConfiguration()
+        config.cipher_key = 'test_cipher_key'
+        aes_module = AesCbcCryptoModule(config)
+        payloads = [aes_module.encrypt('first'), 'bm90IGVuY3J5cHRlZA==', aes_module.encrypt('last')]
+
+        results = aes_module.decrypt_many(payloads, return_exceptions=True)
+        assert results[0] == 'first' and results[2] == 'last'
+        assert isinstance(results[1], (PubNubException, ValueError))
+
+        try:
+            aes_module.decrypt_many(payloads)
+            assert False, 'decrypt_many should raise without return_exceptions'
+        except (PubNubException, ValueError):
+            pass
+
 
 class TestCryptoModuleIntegration:
     """Integration tests for crypto module functionality."""
@@ -0,0 +1,328 @@
+import http.server
+import json
+import os
+import re
+import threading
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from pubnub.crypto import AesCbcCryptoModule, LegacyCryptoModule, PubNubCryptoModule
+from pubnub.exceptions import PubNubException
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from pubnub.request_handlers.async_aiohttp import AsyncAiohttpRequestHandler
+from pubnub.request_handlers.async_httpx import AsyncHttpxRequestHandler
+from pubnub.request_handlers.httpx import HttpxRequestHandler
+from pubnub.request_handlers.requests import RequestsRequestHandler
+from tests.helper import pnconf_file_copy
+
+FILE_CONTENT = bytes(range(256)) * 1000 + b'tail'
+
+
+def create_config(cipher_key=None, use_random_iv=True):
+    config = pnconf_file_copy()
+    config.cipher_key = cipher_key
+    config.use_random_initialization_vector = use_random_iv
+    return config
+
+
+@pytest.mark.parametrize("module_class", [AesCbcCryptoModule, LegacyCryptoModule])
+@pytest.mark.parametrize("use_random_iv", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 13, 16, 4096])
+def test_decrypt_file_stream(module_class, use_random_iv, chunk_size):
+    crypto = module_class(create_config("streamKey", use_random_iv))
+    encrypted = crypto.encrypt_file(FILE_CONTENT)
+
+    chunks = (encrypted[offset:offset + chunk_size] for offset in range(0, len(encrypted), chunk_size))
+
+    assert b''.join(crypto.decrypt_file_stream(chunks)) == FILE_CONTENT
+
+
+@pytest.mark.parametrize("module_class", [AesCbcCryptoModule, LegacyCryptoModule])
+def test_decrypt_file_stream_rejects_broken_files(module_class):
+    crypto = module_class(create_config("streamKey"))
+    encrypted = crypto.encrypt_file(FILE_CONTENT)
+
+    for broken in (b'', encrypted[:-1], encrypted[:26]):
+        with pytest.raises(PubNubException):
+            b''.join(crypto.decrypt_file_stream([broken]))
+
+
+class FileServer(http.server.ThreadingHTTPServer):
+    def __init__(self, body, status=200, ranges=True):
+        self.body = body
+        self.status = status
+        self.ranges = ranges
+        self.failing_ranges = set()
+        self.requested_ranges = []
+        super().__init__(("127.0.0.1", 0), FileRequestHandler)
+        threading.Thread(target=self.serve_forever, args=(0.05,), daemon=True).start()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%d/file.bin?signature=abc" % self.server_port
+
+
+class FileRequestHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body, status = self.server.body, self.server.status
+        requested_range = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range") or "")
+        if requested_range and self.server.ranges and status == 200:
+            start = int(requested_range.group(1))
+            end = min(int(requested_range.group(2) or len(body) - 1), len(body) - 1)
+            self.server.requested_ranges.append(start)
+            if start in self.server.failing_ranges:
+                return self.send_body(b"Internal error", 500)
+            if start >= len(body):
+                return self.send_body(b"", 416, {"Content-Range": "bytes */%d" % len(body)})
+            return self.send_body(body[start:end + 1], 206,
+                                  {"Content-Range": "bytes %d-%d/%d" % (start, end, len(body))})
+        self.send_body(body, status)
+
+    def send_body(self, body, status, headers=None):
+        self.send_response(status)
+        for name, value in {"Content-Length": str(len(body)), **(headers or {})}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        for offset in range(0, len(body), 10000):
+            self.wfile.write(body[offset:offset + 10000])
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def serve(body, status=200, ranges=True):
+        servers.append(FileServer(body, status, ranges))
+        return servers[-1]
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def download_url(url):
+    envelope = Mock()
+    envelope.result.file_url = url
+    return Mock(sync=Mock(return_value=envelope), future=AsyncMock(return_value=envelope))
+
+
+def download_endpoint(pubnub, url):
+    endpoint = pubnub.download_file().channel("files").file_id("file-id").file_name("file.bin")
+    endpoint.get_download_url = Mock(return_value=download_url(url))
+    return endpoint
+
+
+def encrypted_file(config):
+    return PubNub(config).crypto.encrypt_file(FILE_CONTENT) if config.cipher_key else FILE_CONTENT
+
+
+@pytest.mark.parametrize("handler", [HttpxRequestHandler, RequestsRequestHandler])
+@pytest.mark.parametrize("cipher_key", [None, "streamKey"])
+def test_download_to_path(serve, tmp_path, handler, cipher_key):
+    config = create_config(cipher_key)
+    pubnub = PubNub(config, custom_request_handler=handler)
+    url = serve(encrypted_file(config)).url
+    path = tmp_path / "file.bin"
+
+    assert download_endpoint(pubnub, url).to_path(path) == path
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert os.listdir(tmp_path) == ["file.bin"]
+    chunks = list(download_endpoint(pubnub, url).iter_chunks(4096))
+    assert b''.join(chunks) == FILE_CONTENT
+    assert max(len(chunk) for chunk in chunks) <= 4096 + 16
+
+
+@pytest.mark.parametrize("handler", [HttpxRequestHandler, RequestsRequestHandler])
+def test_failed_download_leaves_no_file(serve, tmp_path, handler):
+    pubnub = PubNub(create_config("streamKey"), custom_request_handler=handler)
+    path = tmp_path / "file.bin"
+
+    with pytest.raises(PubNubException) as exception:
+        download_endpoint(pubnub, serve(b"Access denied", status=403).url).to_path(path)
+
+    assert exception.value._status_code == 403
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("handler", [AsyncHttpxRequestHandler, AsyncAiohttpRequestHandler])
+@pytest.mark.parametrize("cipher_key", [None, "streamKey"])
+async def test_asyncio_download_to_path(serve, tmp_path, handler, cipher_key):
+    config = create_config(cipher_key)
+    pubnub = PubNubAsyncio(config, custom_request_handler=handler)
+    url = serve(encrypted_file(config)).url
+    path = tmp_path / "file.bin"
+
+    try:
+        assert await download_endpoint(pubnub, url).to_path(path) == path
+        chunks = [chunk async for chunk in download_endpoint(pubnub, url).iter_chunks(4096)]
+    finally:
+        await pubnub.close_session()
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert b''.join(chunks) == FILE_CONTENT
+
+
+@pytest.mark.asyncio
+async def test_asyncio_download_decrypts_off_the_event_loop(serve, tmp_path):
+    config = create_config("streamKey")
+    pubnub = PubNubAsyncio(config)
+    url = serve(encrypted_file(config)).url
+    decrypting_threads = set()
+    decrypt_file_stream = PubNubCryptoModule.decrypt_file_stream
+
+    def record_thread(crypto, chunks):
+        for chunk in decrypt_file_stream(crypto, chunks):
+            decrypting_threads.add(threading.current_thread())
+            yield chunk
+
+    try:
+        with patch.object(PubNubCryptoModule, "decrypt_file_stream", record_thread):
+            await download_endpoint(pubnub, url).to_path(tmp_path / "file.bin")
+    finally:
+        await pubnub.close_session()
+
+    assert decrypting_threads and threading.current_thread() not in decrypting_threads
+
+
+@pytest.mark.parametrize("handler", [HttpxRequestHandler, RequestsRequestHandler])
+@pytest.mark.parametrize("cipher_key", [None, "streamKey"])
+@pytest.mark.parametrize("ranges", [True, False])
+def test_download_resumes_from_part_file(serve, tmp_path, handler, cipher_key, ranges):
+    config = create_config(cipher_key)
+    pubnub = PubNub(config, custom_request_handler=handler)
+    server = serve(encrypted_file(config), ranges=ranges)
+    path = tmp_path / "file.bin"
+    endpoint = download_endpoint(pubnub, server.url)
+    with open(endpoint.part_path(path), "wb") as fd:
+        fd.write(server.body[:100000])
+
+    assert endpoint.to_path(path) == path
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert os.listdir(tmp_path) == ["file.bin"]
+    assert server.requested_ranges == ([100000] if ranges else [])
+
+
+def test_download_of_complete_part_file(serve, tmp_path):
+    pubnub = PubNub(create_config())
+    server = serve(FILE_CONTENT)
+    path = tmp_path / "file.bin"
+    endpoint = download_endpoint(pubnub, server.url)
+    with open(endpoint.part_path(path), "wb") as fd:
+        fd.write(FILE_CONTENT)
+
+    endpoint.to_path(path)
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert server.requested_ranges == [len(FILE_CONTENT)]
+
+
+@pytest.mark.parametrize("handler", [HttpxRequestHandler, RequestsRequestHandler])
+def test_parallel_download_resumes_missing_ranges(serve, tmp_path, handler):
+    pubnub = PubNub(create_config(), custom_request_handler=handler)
+    server = serve(FILE_CONTENT)
+    server.failing_ranges = {50000, 120000}
+    path = tmp_path / "file.bin"
+    endpoint = download_endpoint(pubnub, server.url)
+
+    with patch("pubnub.endpoints.file_operations.partial_download.DOWNLOAD_RANGE_SIZE", 10000):
+        with pytest.raises(PubNubException):
+            endpoint.to_path(path, parallel=4)
+
+        with open(endpoint.part_path(path) + ".ranges") as fd:
+            progress = json.load(fd)
+        assert progress["size"] == len(FILE_CONTENT)
+        assert not {50000, 120000} & set(progress["done"])
+        assert not path.exists()
+
+        server.failing_ranges = set()
+        server.requested_ranges = []
+        endpoint.to_path(path, parallel=4)
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert os.listdir(tmp_path) == ["file.bin"]
+    assert {50000, 120000} <= set(server.requested_ranges)
+    assert not set(progress["done"]) & set(server.requested_ranges)
+
+
+@pytest.mark.parametrize("ranges", [True, False])
+def test_parallel_download_without_range_support(serve, tmp_path, ranges):
+    pubnub = PubNub(create_config())
+    server = serve(FILE_CONTENT, ranges=ranges)
+    path = tmp_path / "file.bin"
+
+    with patch("pubnub.endpoints.file_operations.partial_download.DOWNLOAD_RANGE_SIZE", 10000):
+        download_endpoint(pubnub, server.url).to_path(path, parallel=4)
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert os.listdir(tmp_path) == ["file.bin"]
+
+
+def test_download_without_resume_discards_part_file(serve, tmp_path):
+    pubnub = PubNub(create_config())
+    server = serve(FILE_CONTENT)
+    path = tmp_path / "file.bin"
+    endpoint = download_endpoint(pubnub, server.url)
+    with open(endpoint.part_path(path), "wb") as fd:
+        fd.write(b"stale content")
+
+    endpoint.to_path(path, resume=False)
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert server.requested_ranges == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("handler", [AsyncHttpxRequestHandler, AsyncAiohttpRequestHandler])
+@pytest.mark.parametrize("cipher_key", [None, "streamKey"])
+async def test_asyncio_download_resumes_from_part_file(serve, tmp_path, handler, cipher_key):
+    config = create_config(cipher_key)
+    pubnub = PubNubAsyncio(config, custom_request_handler=handler)
+    server = serve(encrypted_file(config))
+    path = tmp_path / "file.bin"
+    endpoint = download_endpoint(pubnub, server.url)
+    with open(endpoint.part_path(path), "wb") as fd:
+        fd.write(server.body[:100000])
+
+    try:
+        await endpoint.to_path(path)
+    finally:
+        await pubnub.close_session()
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert os.listdir(tmp_path) == ["file.bin"]
+    assert server.requested_ranges == [100000]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("handler", [AsyncHttpxRequestHandler, AsyncAiohttpRequestHandler])
+async def test_asyncio_parallel_download_resumes_missing_ranges(serve, tmp_path, handler):
+    pubnub = PubNubAsyncio(create_config(), custom_request_handler=handler)
+    server = serve(FILE_CONTENT)
+    server.failing_ranges = {50000}
+    path = tmp_path / "file.bin"
+    endpoint = download_endpoint(pubnub, server.url)
+
+    try:
+        with patch("pubnub.endpoints.file_operations.partial_download.DOWNLOAD_RANGE_SIZE", 10000):
+            with pytest.raises(PubNubException):
+                await endpoint.to_path(path, parallel=4)
+
+            server.failing_ranges = set()
+            server.requested_ranges = []
+            await endpoint.to_path(path, parallel=4)
+    finally:
+        await pubnub.close_session()
+
+    assert path.read_bytes() == FILE_CONTENT
+    assert os.listdir(tmp_path) == ["file.bin"]
+    assert 50000 in server.requested_ranges and 0 not in server.requested_ranges
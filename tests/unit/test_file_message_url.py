@@ -0,0 +1,42 @@
+from unittest.mock import patch
+
+from pubnub.endpoints.file_operations.get_file_url import GetFileDownloadUrl
+from pubnub.managers import ListenerManager
+from pubnub.models.consumer.pubsub import PNFileMessageResult
+from pubnub.models.server.subscribe import SubscribeMessage
+from pubnub.pubnub import PubNub
+from pubnub.workers import BaseMessageWorker
+from tests.helper import pnconf_file_copy
+
+
+def file_message():
+    return SubscribeMessage().from_json({
+        "c": "files", "f": 0, "k": "sub", "e": 4, "p": {"t": "17000000000000000", "r": 1},
+        "d": {"message": {"text": "hello"}, "file": {"id": "file-id", "name": "file.txt"}}
+    })
+
+
+def test_file_url_is_built_on_first_access():
+    pubnub = PubNub(pnconf_file_copy())
+    worker = BaseMessageWorker(pubnub)
+    worker._listener_manager = ListenerManager(pubnub)
+    expected_url = GetFileDownloadUrl(pubnub).channel("files").file_name("file.txt").file_id("file-id") \
+        .get_complete_url()
+
+    with patch.object(GetFileDownloadUrl, "get_complete_url", autospec=True,
+                      side_effect=GetFileDownloadUrl.get_complete_url) as get_complete_url:
+        result = worker._process_incoming_payload(file_message())
+
+        assert isinstance(result, PNFileMessageResult)
+        assert result.file_id == "file-id" and result.message == {"text": "hello"}
+        assert get_complete_url.call_count == 0
+
+        file_url = result.file_url
+        assert file_url.split("?")[0] == expected_url.split("?")[0]
+        assert result.file_url is file_url
+        assert get_complete_url.call_count == 1
+
+
+def test_file_url_can_be_given_as_string():
+    result = PNFileMessageResult({"text": "hello"}, None, "files", 1, None, "https://example.com/file.txt", "id", "n")
+    assert result.file_url == "https://example.com/file.txt"
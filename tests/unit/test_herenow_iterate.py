@@ -0,0 +1,77 @@
+import threading
+import time
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from pubnub.endpoints.presence.here_now import HereNow
+from pubnub.models.consumer.presence import PNHereNowResult
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from tests.helper import pnconf_copy
+
+OCCUPANTS = {"lobby": ["user-%d" % n for n in range(2350)], "room": ["user-%d" % n for n in range(120)]}
+
+
+def page(offset, limit):
+    return PNHereNowResult.from_json({"status": 200, "payload": {
+        "total_channels": 2,
+        "total_occupancy": sum(len(uuids) for uuids in OCCUPANTS.values()),
+        "channels": {name: {"occupancy": len(uuids), "uuids": uuids[offset:offset + limit]}
+                     for name, uuids in OCCUPANTS.items()}}}, list(OCCUPANTS))
+
+
+def test_iterate_walks_all_offsets_concurrently():
+    pubnub = PubNub(pnconf_copy())
+    lock = threading.Lock()
+    offsets = []
+    running = [0, 0]
+
+    def sync(endpoint):
+        with lock:
+            offsets.append(endpoint._offset)
+            running[0] += 1
+            running[1] = max(running)
+        time.sleep(0.02)
+        with lock:
+            running[0] -= 1
+        return Mock(result=page(endpoint._offset or 0, endpoint._limit))
+
+    with patch.object(HereNow, "sync", sync):
+        occupants = list(pubnub.here_now().channels(list(OCCUPANTS)).limit(100).iterate(concurrency=4))
+
+    assert sorted(offsets, key=lambda offset: offset or 0) == [None] + list(range(100, 2350, 100))
+    assert running[1] == 4
+    assert [occupant.uuid for occupant in occupants if occupant.channel_name == "lobby"] == OCCUPANTS["lobby"]
+    assert [occupant.uuid for occupant in occupants if occupant.channel_name == "room"] == OCCUPANTS["room"]
+
+
+def test_iterate_single_page():
+    pubnub = PubNub(pnconf_copy())
+    single = {"status": 200, "occupancy": 2, "uuids": ["user-1", {"uuid": "user-2", "state": {"mood": "ok"}}]}
+
+    with patch.object(HereNow, "sync", Mock(return_value=Mock(result=PNHereNowResult.from_json(single, ["room"])))):
+        occupants = list(pubnub.here_now().channels("room").iterate())
+
+    assert [(occupant.uuid, occupant.state, occupant.channel_name) for occupant in occupants] == \
+        [("user-1", None, "room"), ("user-2", {"mood": "ok"}, "room")]
+
+
+@pytest.mark.asyncio
+async def test_aiterate_walks_all_offsets():
+    pubnub = PubNubAsyncio(pnconf_copy())
+    offsets = []
+
+    async def result(endpoint):
+        offsets.append(endpoint._offset)
+        return page(endpoint._offset or 0, endpoint._limit)
+
+    try:
+        with patch.object(HereNow, "result", result):
+            uuids = [occupant.uuid async for occupant in pubnub.here_now().channels("lobby").limit(1000).aiterate()]
+    finally:
+        await pubnub.close_session()
+
+    assert offsets == [None, 1000, 2000]
+    assert len(uuids) == 2350 + 120
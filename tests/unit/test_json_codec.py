@@ -0,0 +1,127 @@
+import json
+
+import pytest
+
+from pubnub import utils
+from pubnub.crypto import AesCbcCryptoModule, PubNubCryptodome
+from pubnub.endpoints.pubsub.publish import Publish
+from pubnub.exceptions import PubNubException
+from pubnub.json_codec import PubNubJsonCodec, OrjsonCodec, UjsonCodec, get_default_codec, set_default_codec
+from pubnub.pubnub import PubNub
+from tests.helper import pnconf_copy, pnconf_enc_copy
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class CountingCodec(PubNubJsonCodec):
+    def __init__(self):
+        self.encoded = 0
+        self.decoded = 0
+
+    def encode(self, data):
+        self.encoded += 1
+        return super().encode(data)
+
+    def decode(self, data):
+        self.decoded += 1
+        return super().decode(data)
+
+
+FAST_CODECS = [
+    pytest.param(OrjsonCodec, marks=pytest.mark.skipif(orjson is None, reason="orjson is not installed")),
+    pytest.param(UjsonCodec, marks=pytest.mark.skipif(ujson is None, reason="ujson is not installed")),
+]
+
+
+@pytest.fixture
+def restore_default_codec():
+    codec = get_default_codec()
+    yield
+    set_default_codec(codec)
+
+
+def test_config_uses_default_codec():
+    config = pnconf_copy()
+    assert config.json_codec is get_default_codec()
+
+    codec = CountingCodec()
+    config.json_codec = codec
+    assert config.json_codec is codec
+    assert config.copy().json_codec is not None
+
+
+@pytest.mark.parametrize('codec_class', FAST_CODECS)
+def test_fast_codec_decodes_like_stdlib(codec_class):
+    codec = codec_class()
+    document = '{"a": [1, 2.5, "\\u017c\\u00f3\\u0142w"], "b": {"c": null, "d": true}, "t": 17000000000000000}'
+
+    assert codec.decode(document) == json.loads(document)
+    assert codec.decode(document.encode('utf-8')) == json.loads(document)
+
+
+@pytest.mark.parametrize('codec_class', FAST_CODECS)
+def test_fast_codec_falls_back_to_stdlib(codec_class):
+    codec = codec_class()
+
+    assert codec.decode('[NaN, 123456789012345678901234567890]')[1] == 123456789012345678901234567890
+    with pytest.raises(ValueError):
+        codec.decode('not a json')
+
+
+@pytest.mark.parametrize('codec_class', FAST_CODECS)
+def test_fast_codec_keeps_stdlib_encoding_by_default(codec_class):
+    message = {"text": "hello", "list": [1, 2], "unicode": "żółw"}
+
+    assert codec_class().encode(message) == json.dumps(message)
+    assert json.loads(codec_class(compact_encoding=True).encode(message)) == message
+
+
+def test_write_value_as_string_uses_given_codec():
+    codec = CountingCodec()
+
+    assert utils.write_value_as_string(["ch1", "ch2"], codec) == '["ch1", "ch2"]'
+    assert utils.url_write({"a": 1}, codec) == utils.url_encode('{"a": 1}')
+    assert codec.encoded == 2
+
+
+def test_write_value_as_string_reports_serialization_error():
+    with pytest.raises(PubNubException):
+        utils.write_value_as_string({"set": {1, 2}}, CountingCodec())
+
+
+def test_publish_encodes_with_config_codec():
+    config = pnconf_copy()
+    config.json_codec = CountingCodec()
+    pubnub = PubNub(config)
+
+    Publish(pubnub).channel("ch").message({"hi": "there"}).meta({"m": 1}).build_path()
+    Publish(pubnub).channel("ch").message({"hi": "there"}).use_post(True).build_data()
+
+    assert config.json_codec.encoded == 2
+
+
+def test_legacy_crypto_decodes_with_config_codec():
+    config = pnconf_enc_copy()
+    config.json_codec = CountingCodec()
+    crypto = PubNubCryptodome(config)
+
+    encrypted = crypto.encrypt("testKey", '{"hi": "there"}')
+    assert crypto.decrypt("testKey", encrypted) == {"hi": "there"}
+    assert config.json_codec.decoded == 1
+
+
+def test_crypto_module_decodes_with_default_codec(restore_default_codec):
+    codec = CountingCodec()
+    set_default_codec(codec)
+    crypto = AesCbcCryptoModule(pnconf_enc_copy())
+
+    assert crypto.decrypt(crypto.encrypt('{"hi": "there"}')) == {"hi": "there"}
+    assert codec.decoded == 1
@@ -0,0 +1,103 @@
+from unittest.mock import MagicMock
+
+from pubnub.callbacks import SubscribeCallback
+from pubnub.managers import ListenerManager
+from pubnub.models.consumer.pubsub import PNMessageResult
+from pubnub.models.server.subscribe import SubscribeMessage
+from pubnub.models.subscription import PNSubscriptionRegistry, PNSubscriptionType, PubNubSubscription
+from pubnub.workers import BaseMessageWorker, SubscribeMessageWorker
+
+
+def subscribe_message(channel, payload, message_type=SubscribeMessageWorker.TYPE_MESSAGE):
+    return SubscribeMessage().from_json({
+        "c": channel, "d": payload, "e": message_type, "f": 0, "k": "sub", "p": {"t": "1", "r": 1}
+    })
+
+
+class RecordingCallback(SubscribeCallback):
+    def __init__(self):
+        self.events = []
+
+    def status(self, pubnub, status):
+        pass
+
+    def presence(self, pubnub, presence):
+        pass
+
+    def message(self, pubnub, message):
+        self.events.append(("message", message.message))
+
+    def signal(self, pubnub, signal):
+        self.events.append(("signal", signal.message))
+
+
+class BatchCallback(RecordingCallback):
+    def messages(self, pubnub, messages):
+        self.events.append(("messages", [message.message for message in messages]))
+
+
+def create_worker(*listeners):
+    pubnub = MagicMock()
+    pubnub.config.cipher_key = None
+    worker = BaseMessageWorker(pubnub)
+    worker._listener_manager = ListenerManager(pubnub)
+    for listener in listeners:
+        worker._listener_manager.add_listener(listener)
+    return worker
+
+
+PAYLOADS = [
+    subscribe_message("ch", 1),
+    subscribe_message("ch", 2),
+    subscribe_message("ch", "s", SubscribeMessageWorker.TYPE_SIGNAL),
+    subscribe_message("ch", 3),
+]
+
+
+def test_consecutive_messages_are_announced_as_one_batch():
+    callback = BatchCallback()
+    worker = create_worker(callback)
+
+    worker._process_incoming_payloads(PAYLOADS)
+
+    assert callback.events == [("messages", [1, 2]), ("signal", "s"), ("messages", [3])]
+    assert worker._message_batch is None
+
+
+def test_default_batch_callback_delivers_messages_one_by_one():
+    callback = RecordingCallback()
+    worker = create_worker(callback)
+
+    worker._process_incoming_payloads(PAYLOADS)
+    worker._process_incoming_payload(subscribe_message("ch", 4))
+
+    assert callback.events == [("message", 1), ("message", 2), ("signal", "s"), ("message", 3), ("message", 4)]
+
+
+def test_subscriptions_receive_matching_messages_through_on_messages():
+    pubnub = MagicMock()
+    pubnub._subscription_manager._timetoken = 0
+    registry = PNSubscriptionRegistry(pubnub)
+    pubnub._subscription_registry = registry
+
+    batched = PubNubSubscription(pubnub, "chat.*", PNSubscriptionType.CHANNEL)
+    batched.on_messages = MagicMock()
+    single = PubNubSubscription(pubnub, "chat.b", PNSubscriptionType.CHANNEL)
+    single.on_message = MagicMock()
+    batched.subscribe()
+    single.subscribe()
+
+    messages = [PNMessageResult(n, None, channel, n) for n, channel in enumerate(["chat.a", "chat.b", "news"])]
+    registry.subscription_registry_callback.messages(pubnub, messages)
+
+    batched.on_messages.assert_called_once_with(messages[:2])
+    single.on_message.assert_called_once_with(messages[1])
+
+
+def test_signals_are_not_batched():
+    callback = BatchCallback()
+    worker = create_worker(callback)
+
+    worker._process_incoming_payloads([subscribe_message("ch", "s", SubscribeMessageWorker.TYPE_SIGNAL)])
+
+    assert callback.events == [("signal", "s")]
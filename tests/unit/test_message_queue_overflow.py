@@ -0,0 +1,136 @@
+import asyncio
+import threading
+from collections import deque
+from queue import Full
+
+import pytest
+
+from pubnub.callbacks import SubscribeCallback
+from pubnub.enums import PNMessageQueueOverflowPolicy, PNStatusCategory
+from pubnub.managers import MessageQueueOverflow
+from pubnub.models.consumer.common import PNStatus
+from pubnub.models.server.subscribe import SubscribeMessage
+from pubnub.pubnub import NativeSubscribeMessageQueue, PubNub
+from pubnub.pubnub_asyncio import AsyncioSubscribeMessageQueue
+from tests.helper import pnconf_copy
+
+
+def subscribe_message(channel, payload):
+    message = SubscribeMessage()
+    message.channel = channel
+    message.payload = payload
+    return message
+
+
+def fill(overflow, messages):
+    items = deque()
+    for channel, payload in messages:
+        overflow.put(items, subscribe_message(channel, payload))
+    return [(item.channel, item.payload) for item in items]
+
+
+MESSAGES = [("a", 1), ("b", 2), ("a", 3), ("c", 4)]
+
+
+@pytest.mark.parametrize("policy, expected", [
+    (PNMessageQueueOverflowPolicy.DROP_OLDEST, [("b", 2), ("a", 3), ("c", 4)]),
+    (PNMessageQueueOverflowPolicy.DROP_NEWEST, [("a", 1), ("b", 2), ("a", 3)]),
+    (PNMessageQueueOverflowPolicy.COALESCE_BY_CHANNEL, [("b", 2), ("a", 3), ("c", 4)]),
+    (PNMessageQueueOverflowPolicy.BLOCK, MESSAGES),
+])
+def test_overflow_policies(policy, expected):
+    overflow = MessageQueueOverflow(max_size=3, policy=policy)
+
+    assert fill(overflow, MESSAGES) == expected
+    assert overflow.dropped == len(MESSAGES) - len(expected)
+
+
+def test_coalesce_replaces_message_of_the_same_channel():
+    overflow = MessageQueueOverflow(max_size=3, policy=PNMessageQueueOverflowPolicy.COALESCE_BY_CHANNEL)
+
+    assert fill(overflow, [("a", 1), ("b", 2), ("c", 3), ("b", 4)]) == [("a", 1), ("c", 3), ("b", 4)]
+    assert overflow.take_dropped_channels() == ["b"]
+    assert overflow.take_dropped_channels() == []
+
+
+def test_unbounded_by_default():
+    overflow = MessageQueueOverflow.from_config(pnconf_copy())
+
+    assert len(fill(overflow, MESSAGES * 100)) == 400
+    assert overflow.dropped == 0
+
+
+def test_native_queue_drops_without_leaking_unfinished_tasks():
+    queue = NativeSubscribeMessageQueue(MessageQueueOverflow(2, PNMessageQueueOverflowPolicy.DROP_OLDEST))
+    for payload in range(5):
+        queue.put(subscribe_message("ch", payload))
+
+    assert [queue.get_nowait().payload for _ in range(queue.qsize())] == [3, 4]
+    queue.task_done()
+    queue.task_done()
+    queue.join()
+
+
+def test_native_queue_blocks_when_full():
+    queue = NativeSubscribeMessageQueue(MessageQueueOverflow(1, PNMessageQueueOverflowPolicy.BLOCK))
+    queue.put(subscribe_message("ch", 1))
+
+    with pytest.raises(Full):
+        queue.put(subscribe_message("ch", 2), timeout=0.05)
+
+    consumer = threading.Timer(0.05, queue.get)
+    consumer.start()
+    queue.put(subscribe_message("ch", 3), timeout=5)
+    consumer.join()
+    assert queue.get_nowait().payload == 3
+
+
+@pytest.mark.asyncio
+async def test_asyncio_queue_signals_free_space():
+    queue = AsyncioSubscribeMessageQueue(MessageQueueOverflow(2, PNMessageQueueOverflowPolicy.BLOCK))
+    for payload in range(3):
+        queue.put_nowait(subscribe_message("ch", payload))
+
+    waiter = asyncio.ensure_future(queue.wait_for_space())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await queue.get()
+    await queue.get()
+    await asyncio.wait_for(waiter, 1)
+
+
+def test_dropped_messages_are_announced_and_counted():
+    config = pnconf_copy()
+    config.enable_subscribe = True
+    config.message_queue_size = 1
+    config.message_queue_overflow_policy = PNMessageQueueOverflowPolicy.DROP_NEWEST
+    pubnub = PubNub(config)
+    statuses = []
+
+    class StatusListener(SubscribeCallback):
+        def status(self, pubnub, status):
+            statuses.append(status)
+
+        def message(self, pubnub, message):
+            pass
+
+    try:
+        manager = pubnub._subscription_manager
+        manager._set_consumer_event()
+        manager._consumer_thread.join(5)
+        pubnub.add_listener(StatusListener())
+        manager._subscription_status_announced = True
+        manager._handle_endpoint_call({
+            "t": {"t": "1", "r": 1},
+            "m": [{"c": channel, "d": "hi", "f": 0, "k": "sub", "p": {"t": "1", "r": 1}}
+                  for channel in ("a", "b", "b")]
+        }, PNStatus())
+
+        stats = pubnub.get_message_queue_stats()
+        assert (stats.depth, stats.max_size, stats.dropped) == (1, 1, 2)
+        assert len(statuses) == 1
+        assert statuses[0].category == PNStatusCategory.PNMessageQueueOverflowCategory
+        assert statuses[0].affected_channels == ["b"]
+    finally:
+        pubnub.stop()
@@ -0,0 +1,69 @@
+import threading
+
+from pubnub.callbacks import SubscribeCallback
+from pubnub.models.consumer.common import PNStatus
+from pubnub.pubnub import PubNub
+from tests.helper import pnconf_copy
+
+
+class BlockingListener(SubscribeCallback):
+    def __init__(self, slow_channel):
+        self.slow_channel = slow_channel
+        self.release = threading.Event()
+        self.received = {}
+        self.lock = threading.Lock()
+        self.fast_delivered = threading.Event()
+
+    def status(self, pubnub, status):
+        pass
+
+    def presence(self, pubnub, presence):
+        pass
+
+    def message(self, pubnub, message):
+        if message.channel == self.slow_channel:
+            self.release.wait(5)
+        with self.lock:
+            self.received.setdefault(message.channel, []).append(message.message)
+        if message.channel != self.slow_channel:
+            self.fast_delivered.set()
+
+
+def response(messages):
+    return {
+        "t": {"t": "1", "r": 1},
+        "m": [{"c": channel, "d": payload, "f": 0, "k": "sub", "p": {"t": "1", "r": 1}}
+              for channel, payload in messages]
+    }
+
+
+def test_slow_channel_does_not_stall_other_channels():
+    config = pnconf_copy()
+    config.enable_subscribe = True
+    config.message_worker_threads = 4
+    pubnub = PubNub(config)
+    manager = pubnub._subscription_manager
+    shards = len(manager._message_queues)
+    slow = "slow"
+    fast = next("fast-%d" % i for i in range(100) if hash("fast-%d" % i) % shards != hash(slow) % shards)
+    listener = BlockingListener(slow)
+
+    try:
+        assert len(manager._consumer_threads) == 4
+        pubnub.add_listener(listener)
+        manager._subscription_status_announced = True
+        manager._handle_endpoint_call(response([(slow, 1), (fast, 1), (slow, 2), (fast, 2), (fast, 3)]), PNStatus())
+
+        assert listener.fast_delivered.wait(5)
+        listener.release.set()
+        for queue in manager._message_queues:
+            queue.join()
+
+        assert listener.received == {slow: [1, 2], fast: [1, 2, 3]}
+    finally:
+        listener.release.set()
+        pubnub.stop()
+
+    for thread in manager._consumer_threads:
+        thread.join(5)
+        assert not thread.is_alive()
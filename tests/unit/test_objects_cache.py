@@ -0,0 +1,204 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import httpx
+import requests
+
+from pubnub.managers import ObjectsCacheManager
+from pubnub.pubnub import PubNub
+from pubnub.request_handlers.httpx import HttpxRequestHandler
+from pubnub.request_handlers.requests import RequestsRequestHandler
+from pubnub.structures import PlatformOptions
+from tests.helper import pnconf_copy
+
+
+def uuid_metadata(name, etag):
+    return {"status": 200, "data": {"id": "user", "name": name, "eTag": etag}}
+
+
+class TestObjectsCacheManager(unittest.TestCase):
+    def setUp(self):
+        self.pubnub = PubNub(pnconf_copy())
+        self.cache = ObjectsCacheManager(max_entries=2, ttl=30)
+
+    def options(self, endpoint):
+        options = endpoint.options()
+        options.merge_params_in({})
+        return options
+
+    def test_serves_fresh_copy_and_skips_other_operations(self):
+        options = self.options(self.pubnub.get_uuid_metadata().uuid("user"))
+        self.cache.update(options, uuid_metadata("Ann", "e1"))
+
+        cached = self.cache.lookup(self.options(self.pubnub.get_uuid_metadata().uuid("user")))
+        self.assertEqual(cached, uuid_metadata("Ann", "e1"))
+        cached["data"]["name"] = "changed"
+        self.assertEqual(self.cache.lookup(options)["data"]["name"], "Ann")
+
+        all_uuids = self.options(self.pubnub.get_all_uuid_metadata())
+        self.cache.update(all_uuids, {"data": []})
+        self.assertIsNone(self.cache.lookup(all_uuids))
+
+    def test_stale_entry_is_revalidated_with_etag(self):
+        options = self.options(self.pubnub.get_uuid_metadata().uuid("user"))
+        self.cache.update(options, uuid_metadata("Ann", "e1"))
+
+        with patch("pubnub.managers.time.monotonic", return_value=10 ** 9):
+            stale_options = self.options(self.pubnub.get_uuid_metadata().uuid("user"))
+            self.assertIsNone(self.cache.lookup(stale_options))
+            self.assertEqual(stale_options.request_headers["If-None-Match"], "e1")
+            self.assertEqual(self.cache.not_modified(stale_options), uuid_metadata("Ann", "e1"))
+            self.assertIsNotNone(self.cache.lookup(stale_options))
+
+    def test_stale_entry_without_etag_is_dropped(self):
+        options = self.options(self.pubnub.get_memberships().uuid("user"))
+        self.cache.update(options, {"status": 200, "data": []})
+
+        with patch("pubnub.managers.time.monotonic", return_value=10 ** 9):
+            self.assertIsNone(self.cache.lookup(options))
+            self.assertNotIn("If-None-Match", options.request_headers or {})
+        self.assertEqual(len(self.cache), 0)
+
+    def test_evicts_least_recently_used(self):
+        first = self.options(self.pubnub.get_uuid_metadata().uuid("first"))
+        second = self.options(self.pubnub.get_uuid_metadata().uuid("second"))
+        third = self.options(self.pubnub.get_uuid_metadata().uuid("third"))
+
+        self.cache.update(first, uuid_metadata("first", "e1"))
+        self.cache.update(second, uuid_metadata("second", "e2"))
+        self.cache.lookup(first)
+        self.cache.update(third, uuid_metadata("third", "e3"))
+
+        self.assertIsNotNone(self.cache.lookup(first))
+        self.assertIsNone(self.cache.lookup(second))
+        self.assertIsNotNone(self.cache.lookup(third))
+
+    def test_writes_invalidate_object_and_relationship_lists(self):
+        cache = ObjectsCacheManager(max_entries=10, ttl=30)
+        user = self.options(self.pubnub.get_uuid_metadata().uuid("user"))
+        other_user = self.options(self.pubnub.get_uuid_metadata().uuid("other"))
+        channel = self.options(self.pubnub.get_channel_metadata().channel("ch"))
+        members = self.options(self.pubnub.get_channel_members().channel("ch"))
+        for options in (user, other_user, channel, members):
+            cache.update(options, uuid_metadata("any", "e"))
+
+        cache.update(self.options(self.pubnub.set_uuid_metadata().uuid("user").set_name("Bob")), {"data": {}})
+
+        self.assertIsNone(cache.lookup(user))
+        self.assertIsNone(cache.lookup(members))
+        self.assertIsNotNone(cache.lookup(other_user))
+        self.assertIsNotNone(cache.lookup(channel))
+
+        cache.update(self.options(self.pubnub.remove_channel_metadata().channel("ch")), {"data": {}})
+        self.assertIsNone(cache.lookup(channel))
+        self.assertIsNotNone(cache.lookup(other_user))
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(ObjectsCacheManager.from_config(pnconf_copy()))
+        self.assertIsNone(self.pubnub.objects_cache)
+
+
+class TestObjectsCacheRequestHandler(unittest.TestCase):
+    def setUp(self):
+        config = pnconf_copy()
+        config.objects_cache_size = 10
+        self.pubnub = PubNub(config)
+        self.handler = HttpxRequestHandler(self.pubnub)
+        self.platform_options = PlatformOptions(self.pubnub.headers, self.pubnub.config)
+
+    def tearDown(self):
+        self.handler.close()
+
+    def get_user(self):
+        endpoint = self.pubnub.get_uuid_metadata().uuid("user")
+        options = endpoint.options()
+        options.merge_params_in({})
+        return self.handler._build_envelope(self.platform_options, options)
+
+    def response(self, status_code, **kwargs):
+        return httpx.Response(status_code, request=httpx.Request("GET", "https://ps.pndsn.com/v2/objects"), **kwargs)
+
+    def test_fresh_response_is_served_from_cache(self):
+        self.handler._invoke_request = MagicMock(return_value=self.response(200, json=uuid_metadata("Ann", "e1")))
+
+        first = self.get_user()
+        second = self.get_user()
+
+        self.assertEqual(self.handler._invoke_request.call_count, 1)
+        self.assertEqual(first.result.data, second.result.data)
+        self.assertFalse(second.status.is_error())
+
+    def test_not_modified_response_reuses_cached_data(self):
+        self.handler._invoke_request = MagicMock(side_effect=[
+            self.response(200, json=uuid_metadata("Ann", "e1")),
+            self.response(304),
+        ])
+        self.get_user()
+
+        with patch("pubnub.managers.time.monotonic", return_value=10 ** 9):
+            envelope = self.get_user()
+
+        revalidation_options = self.handler._invoke_request.call_args[0][1]
+        self.assertEqual(revalidation_options.request_headers["If-None-Match"], "e1")
+        self.assertFalse(envelope.status.is_error())
+        self.assertEqual(envelope.result.data["name"], "Ann")
+
+    def test_not_modified_after_eviction_is_repeated_as_cache_miss(self):
+        self.handler._invoke_request = MagicMock(return_value=self.response(200, json=uuid_metadata("Ann", "e1")))
+        self.get_user()
+
+        def invoke_request(*args):
+            if self.handler._invoke_request.call_count == 1:
+                # the entry is evicted while the revalidation is in flight
+                self.pubnub.objects_cache.clear()
+                return self.response(304)
+            return self.response(200, json=uuid_metadata("Bob", "e2"))
+
+        self.handler._invoke_request = MagicMock(side_effect=invoke_request)
+        with patch("pubnub.managers.time.monotonic", return_value=10 ** 9):
+            envelope = self.get_user()
+
+        retry_options = self.handler._invoke_request.call_args[0][1]
+        self.assertNotIn("If-None-Match", retry_options.request_headers or {})
+        self.assertEqual(self.handler._invoke_request.call_count, 2)
+        self.assertFalse(envelope.status.is_error())
+        self.assertEqual(envelope.result.data["name"], "Bob")
+
+
+class TestRequestsHandlerObjectsCache(unittest.TestCase):
+    def response(self, status_code, body=None):
+        res = requests.Response()
+        res.status_code = status_code
+        res.url = "https://ps.pndsn.com/v2/objects"
+        res._content = json.dumps(body).encode("utf-8") if body is not None else b""
+        return res
+
+    def test_not_modified_after_eviction_is_repeated_as_cache_miss(self):
+        config = pnconf_copy()
+        config.objects_cache_size = 10
+        pubnub = PubNub(config)
+        handler = RequestsRequestHandler(pubnub)
+        platform_options = PlatformOptions(pubnub.headers, config)
+
+        def get_user():
+            options = pubnub.get_uuid_metadata().uuid("user").options()
+            options.merge_params_in({})
+            return handler._build_envelope(platform_options, options)
+
+        def invoke_request(p_options, e_options, base_origin):
+            if "If-None-Match" in (e_options.request_headers or {}):
+                pubnub.objects_cache.clear()
+                return self.response(304)
+            return self.response(200, uuid_metadata("Bob", "e2"))
+
+        handler._invoke_request = MagicMock(return_value=self.response(200, uuid_metadata("Ann", "e1")))
+        get_user()
+        handler._invoke_request = MagicMock(side_effect=invoke_request)
+        with patch("pubnub.managers.time.monotonic", return_value=10 ** 9):
+            envelope = get_user()
+
+        self.assertEqual(handler._invoke_request.call_count, 2)
+        self.assertFalse(envelope.status.is_error())
+        self.assertEqual(envelope.result.data["name"], "Bob")
+        handler.close()
@@ -0,0 +1,118 @@
+from unittest.mock import patch
+
+import pytest
+
+from pubnub.endpoints.objects_v2.channel.get_all_channels import GetAllChannels
+from pubnub.endpoints.objects_v2.members.get_channel_members import GetChannelMembers
+from pubnub.endpoints.objects_v2.memberships.get_memberships import GetMemberships
+from pubnub.endpoints.objects_v2.objects_endpoint import ListEndpoint
+from pubnub.endpoints.objects_v2.uuid.get_all_uuid import GetAllUuid
+from pubnub.models.consumer.objects_v2.channel import PNChannelMetadataResult
+from pubnub.models.consumer.objects_v2.memberships import PNMembershipResult
+from pubnub.models.consumer.objects_v2.uuid import PNUUIDMetadataResult
+from pubnub.objects_mirror import ObjectsMemoryStore, ObjectsMirror, ObjectsSQLiteStore
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from tests.helper import pnconf_copy
+
+LISTS = {
+    GetAllUuid: [{"id": "user-1", "name": "Ann", "updated": "2024-01-01T00:00:00Z"},
+                 {"id": "user-2", "name": "Bob", "updated": "2024-01-01T00:00:00Z"}],
+    GetAllChannels: [{"id": "room-1", "name": "Room", "updated": "2024-01-01T00:00:00Z"}],
+    GetMemberships: [{"channel": {"id": "room-1"}, "custom": {"role": "admin"}}],
+    GetChannelMembers: [{"uuid": {"id": "user-2"}}],
+}
+
+
+def listed_objects(endpoint):
+    return iter(LISTS[type(endpoint)])
+
+
+async def alisted_objects(endpoint):
+    for item in LISTS[type(endpoint)]:
+        yield item
+
+
+@pytest.fixture(params=[ObjectsMemoryStore, ObjectsSQLiteStore])
+def mirror(request):
+    return ObjectsMirror(request.param())
+
+
+def test_seed_and_lookups(mirror):
+    with patch.object(ListEndpoint, "iterate", listed_objects):
+        mirror.seed(PubNub(pnconf_copy()), memberships_of=["user-1"], members_of=["room-1"])
+
+    assert mirror.uuid_metadata("user-1")["name"] == "Ann"
+    assert mirror.channel_metadata("room-1")["name"] == "Room"
+    assert mirror.uuid_metadata("user-3") is None
+    assert mirror.memberships("user-1")["room-1"]["custom"] == {"role": "admin"}
+    assert set(mirror.channel_members("room-1")) == {"user-1", "user-2"}
+
+
+@pytest.mark.asyncio
+async def test_aseed(mirror):
+    pubnub = PubNubAsyncio(pnconf_copy())
+    try:
+        with patch.object(ListEndpoint, "aiterate", alisted_objects):
+            await mirror.aseed(pubnub, memberships_of=["user-1"])
+    finally:
+        await pubnub.close_session()
+
+    assert mirror.uuid_metadata("user-2")["name"] == "Bob"
+    assert list(mirror.memberships("user-1")) == ["room-1"]
+
+
+def test_events_update_the_mirror(mirror):
+    with patch.object(ListEndpoint, "iterate", listed_objects):
+        mirror.seed(PubNub(pnconf_copy()), memberships_of=["user-1"])
+
+    mirror.uuid(None, PNUUIDMetadataResult("set", {"id": "user-1", "email": "ann@example.com",
+                                                   "updated": "2024-02-01T00:00:00Z"}))
+    assert mirror.uuid_metadata("user-1")["name"] == "Ann"
+    assert mirror.uuid_metadata("user-1")["email"] == "ann@example.com"
+
+    # events older than the mirrored object are ignored
+    mirror.channel(None, PNChannelMetadataResult("set", {"id": "room-1", "name": "Old",
+                                                         "updated": "2023-01-01T00:00:00Z"}))
+    assert mirror.channel_metadata("room-1")["name"] == "Room"
+
+    mirror.membership(None, PNMembershipResult("set", {"uuid": {"id": "user-2"}, "channel": {"id": "room-1"}}))
+    assert set(mirror.channel_members("room-1")) == {"user-1", "user-2"}
+
+    mirror.membership(None, PNMembershipResult("delete", {"uuid": {"id": "user-2"}, "channel": {"id": "room-1"}}))
+    assert set(mirror.channel_members("room-1")) == {"user-1"}
+
+    mirror.channel(None, PNChannelMetadataResult("delete", {"id": "room-1"}))
+    assert mirror.channel_metadata("room-1") is None
+    assert mirror.memberships("user-1") == {}
+
+
+def test_deletes_while_seeding_are_not_brought_back(mirror):
+    def listed_pages(endpoint):
+        items = LISTS[type(endpoint)]
+        yield items[0]
+        # the second page was listed before these deletions arrived
+        mirror.uuid(None, PNUUIDMetadataResult("delete", {"id": "user-2"}))
+        mirror.membership(None, PNMembershipResult("delete", {"uuid": {"id": "user-3"},
+                                                              "channel": {"id": "room-1"}}))
+        yield from items[1:]
+
+    lists = {**LISTS, GetChannelMembers: [{"uuid": {"id": "user-2"}}, {"uuid": {"id": "user-3"}}]}
+    with patch.dict(LISTS, lists), patch.object(ListEndpoint, "iterate", listed_pages):
+        mirror.seed(PubNub(pnconf_copy()), members_of=["room-1"])
+
+    assert mirror.uuid_metadata("user-1")["name"] == "Ann"
+    assert mirror.uuid_metadata("user-2") is None
+    assert mirror.channel_members("room-1") == {}
+
+    # deletions are remembered only while seeding
+    mirror.uuid(None, PNUUIDMetadataResult("set", {"id": "user-2", "name": "Bob"}))
+    assert mirror.uuid_metadata("user-2")["name"] == "Bob"
+
+
+def test_sqlite_store_persists(tmp_path):
+    path = str(tmp_path / "objects.db")
+    mirror = ObjectsMirror(ObjectsSQLiteStore(path))
+    mirror.uuid(None, PNUUIDMetadataResult("set", {"id": "user-1", "name": "Ann"}))
+
+    assert ObjectsMirror(ObjectsSQLiteStore(path)).uuid_metadata("user-1") == {"id": "user-1", "name": "Ann"}
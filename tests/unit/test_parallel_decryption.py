@@ -0,0 +1,145 @@
+import json
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+
+from pubnub.callbacks import SubscribeCallback
+from pubnub.crypto import PubNubCryptoModule
+from pubnub.enums import PNStatusCategory
+from pubnub.managers import ListenerManager
+from pubnub.models.server.subscribe import SubscribeMessage
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import AsyncioSubscribeMessageWorker
+from pubnub.workers import BaseMessageWorker
+from tests.helper import pnconf_enc_copy
+
+
+class RecordingCallback(SubscribeCallback):
+    def __init__(self):
+        self.received = []
+        self.statuses = []
+
+    def status(self, pubnub, status):
+        self.statuses.append(status)
+
+    def presence(self, pubnub, presence):
+        pass
+
+    def message(self, pubnub, message):
+        self.received.append((message.message, message.error is not None))
+
+
+def subscribe_message(payload, message_type=None):
+    envelope = {"c": "ch", "d": payload, "f": 0, "k": "sub", "p": {"t": "1", "r": 1}}
+    if message_type is not None:
+        envelope["e"] = message_type
+    return SubscribeMessage().from_json(envelope)
+
+
+@pytest.fixture
+def pubnub():
+    config = pnconf_enc_copy()
+    config.enable_subscribe = False
+    config.decryption_thread_pool_size = 4
+    pubnub = PubNub(config)
+    yield pubnub
+    pubnub._shutdown_decryption_executor()
+
+
+def create_worker(worker_class, pubnub, callback):
+    worker = worker_class(pubnub)
+    worker._listener_manager = ListenerManager(pubnub)
+    worker._listener_manager.add_listener(callback)
+    return worker
+
+
+@pytest.fixture
+def decrypting_threads():
+    threads = set()
+    decrypt = PubNubCryptoModule.decrypt
+
+    def record_thread(crypto_module, message):
+        threads.add(threading.current_thread().name)
+        return decrypt(crypto_module, message)
+
+    with patch.object(PubNubCryptoModule, "decrypt", record_thread):
+        yield threads
+
+
+def encrypted_batch(pubnub):
+    payloads = [pubnub.crypto.encrypt(json.dumps({"n": n})) for n in range(20)]
+    payloads[5] = "not encrypted"
+    return [subscribe_message(payload) for payload in payloads]
+
+
+def expected_messages():
+    return [("not encrypted", True) if n == 5 else ({"n": n}, False) for n in range(20)]
+
+
+def test_batch_is_decrypted_in_pool_and_delivered_in_order(pubnub, decrypting_threads):
+    callback = RecordingCallback()
+    worker = create_worker(BaseMessageWorker, pubnub, callback)
+
+    worker._process_incoming_payloads(encrypted_batch(pubnub))
+
+    assert callback.received == expected_messages()
+    assert [status.category for status in callback.statuses] == [PNStatusCategory.PNDecryptionErrorCategory]
+    assert decrypting_threads and all(name.startswith("pubnub-decrypt") for name in decrypting_threads)
+    assert worker._decrypted_payloads is None
+
+
+@pytest.mark.asyncio
+async def test_asyncio_worker_decrypts_off_the_event_loop(pubnub, decrypting_threads):
+    callback = RecordingCallback()
+    worker = create_worker(lambda pn: AsyncioSubscribeMessageWorker(pn, None, None, None), pubnub, callback)
+    messages = encrypted_batch(pubnub)
+
+    worker._process_incoming_payloads(messages, await worker._decrypt_payloads_async(messages))
+
+    assert callback.received == expected_messages()
+    assert decrypting_threads and threading.current_thread().name not in decrypting_threads
+
+
+def test_only_messages_signals_and_files_are_decrypted_in_pool(pubnub):
+    worker = BaseMessageWorker(pubnub)
+    message, signal, file_message = (subscribe_message(pubnub.crypto.encrypt('"%s"' % message_type), message_type)
+                                     for message_type in (BaseMessageWorker.TYPE_MESSAGE,
+                                                          BaseMessageWorker.TYPE_SIGNAL,
+                                                          BaseMessageWorker.TYPE_FILE_MESSAGE))
+    message_action = subscribe_message({"source": "actions", "event": "added", "data": {"type": "reaction"}},
+                                       BaseMessageWorker.TYPE_MESSAGE_ACTION)
+    object_event = subscribe_message({"type": "uuid", "event": "set", "data": {}}, BaseMessageWorker.TYPE_OBJECT)
+
+    payloads = worker._encrypted_payloads([message, message_action, signal, object_event, file_message])
+
+    assert payloads == [message.payload, signal.payload, file_message.payload]
+
+
+def test_batch_is_decrypted_after_stop(pubnub, decrypting_threads):
+    callback = RecordingCallback()
+    worker = create_worker(BaseMessageWorker, pubnub, callback)
+    worker._process_incoming_payloads(encrypted_batch(pubnub))
+
+    # the decryption pool is shut down even though the subscription manager is disabled
+    with pytest.raises(Exception, match="Subscription manager is not enabled"):
+        pubnub.stop()
+    decrypting_threads.clear()
+    worker._process_incoming_payloads(encrypted_batch(pubnub))
+
+    assert callback.received == expected_messages() * 2
+    assert decrypting_threads and all(name.startswith("pubnub-decrypt") for name in decrypting_threads)
+
+
+def test_batch_is_decrypted_inline_when_pool_is_shut_down_meanwhile(pubnub):
+    callback = RecordingCallback()
+    worker = create_worker(BaseMessageWorker, pubnub, callback)
+    executor = ThreadPoolExecutor(max_workers=1)
+    executor.shutdown()
+
+    with patch.object(pubnub, "_get_decryption_executor", return_value=executor):
+        worker._process_incoming_payloads(encrypted_batch(pubnub))
+
+    assert callback.received == expected_messages()
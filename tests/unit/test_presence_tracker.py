@@ -0,0 +1,145 @@
+import threading
+import time
+
+from unittest.mock import patch
+
+import pytest
+
+from pubnub.endpoints.presence.here_now import HereNow
+from pubnub.models.consumer.presence import PNHereNowOccupantsData
+from pubnub.models.consumer.pubsub import PNPresenceEventResult
+from pubnub.presence_tracker import PresenceTracker
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from tests.helper import pnconf_copy
+
+HERE_NOW = {"room-1": {"user-1": {"mood": "ok"}, "user-2": None}, "room-2": {}}
+
+
+def here_now_occupants(endpoint, *args):
+    return iter([PNHereNowOccupantsData(uuid, state, channel)
+                 for channel in endpoint._channels for uuid, state in HERE_NOW.get(channel, {}).items()])
+
+
+async def ahere_now_occupants(endpoint, *args):
+    for occupant in here_now_occupants(endpoint):
+        yield occupant
+
+
+def presence_event(event, occupancy, uuid=None, state=None, join=None, leave=None, timeout=None,
+                   here_now_refresh=False):
+    return PNPresenceEventResult(event=event, uuid=uuid, timestamp=0, occupancy=occupancy, subscription=None,
+                                 channel="room-1", timetoken=0, state=state, join=join, leave=leave, timeout=timeout,
+                                 here_now_refresh=here_now_refresh)
+
+
+def seeded_tracker():
+    tracker = PresenceTracker()
+    with patch.object(HereNow, "iterate", here_now_occupants):
+        tracker.seed(PubNub(pnconf_copy()), ["room-1", "room-2"])
+    return tracker
+
+
+def test_seed_and_queries():
+    tracker = seeded_tracker()
+
+    assert tracker.occupancy("room-1") == 2 and tracker.occupancy("room-2") == 0
+    assert tracker.is_present("room-1", "user-1") and not tracker.is_present("room-2", "user-1")
+    assert tracker.state("room-1", "user-1") == {"mood": "ok"}
+    assert tracker.occupants("room-1") == HERE_NOW["room-1"]
+
+
+def test_presence_events_update_occupants():
+    tracker = seeded_tracker()
+
+    tracker.presence(None, presence_event("join", 3, uuid="user-3"))
+    tracker.presence(None, presence_event("state-change", 3, uuid="user-2", state={"mood": "busy"}))
+    tracker.presence(None, presence_event("leave", 2, uuid="user-1"))
+    assert tracker.occupants("room-1") == {"user-2": {"mood": "busy"}, "user-3": None}
+
+    tracker.presence(None, presence_event("interval", 2, join=["user-4"], leave=["user-2"], timeout=["user-3"]))
+    assert tracker.occupancy("room-1") == 2
+    assert set(tracker.occupants("room-1")) == {"user-4"}
+
+
+def test_interval_refresh_reconciles_with_here_now():
+    tracker = seeded_tracker()
+    reconciled = threading.Event()
+
+    def iterate(endpoint, *args):
+        reconciled.set()
+        return here_now_occupants(endpoint)
+
+    with patch.object(HereNow, "iterate", iterate):
+        tracker.start(PubNub(pnconf_copy()))
+        try:
+            tracker.presence(None, presence_event("interval", 5000, here_now_refresh=True))
+            assert tracker.stale_channels() == {"room-1"} or reconciled.is_set()
+            assert reconciled.wait(5)
+        finally:
+            tracker.stop()
+
+    for _ in range(100):
+        if not tracker.stale_channels():
+            break
+        time.sleep(0.01)
+    assert tracker.stale_channels() == set()
+    assert tracker.occupancy("room-1") == 2
+
+
+def test_events_received_while_seeding_are_kept():
+    tracker = PresenceTracker()
+
+    def iterate(endpoint, *args):
+        occupants = list(here_now_occupants(endpoint))
+        yield occupants[0]
+        # the snapshot was taken before these events arrived
+        tracker.presence(None, presence_event("leave", 1, uuid="user-1"))
+        tracker.presence(None, presence_event("join", 2, uuid="user-5"))
+        yield from occupants[1:]
+
+    with patch.object(HereNow, "iterate", iterate):
+        tracker.seed(PubNub(pnconf_copy()), ["room-1"])
+
+    assert not tracker.is_present("room-1", "user-1")
+    assert set(tracker.occupants("room-1")) == {"user-2", "user-5"}
+    assert tracker.occupancy("room-1") == 2
+
+
+def test_reconciliation_survives_unexpected_errors():
+    tracker = seeded_tracker()
+    calls = []
+    reconciled = threading.Event()
+
+    def iterate(endpoint, *args):
+        calls.append(endpoint)
+        if len(calls) == 1:
+            raise RuntimeError("connection reset")
+        reconciled.set()
+        return here_now_occupants(endpoint)
+
+    with patch.object(HereNow, "iterate", iterate):
+        tracker.start(PubNub(pnconf_copy()))
+        try:
+            tracker.presence(None, presence_event("interval", 5000, here_now_refresh=True))
+            for _ in range(100):
+                if calls:
+                    break
+                time.sleep(0.01)
+            tracker.presence(None, presence_event("interval", 5000, here_now_refresh=True))
+            assert reconciled.wait(5)
+        finally:
+            tracker.stop()
+
+
+@pytest.mark.asyncio
+async def test_aseed():
+    pubnub = PubNubAsyncio(pnconf_copy())
+    tracker = PresenceTracker()
+    try:
+        with patch.object(HereNow, "aiterate", ahere_now_occupants):
+            await tracker.aseed(pubnub, ["room-1"])
+    finally:
+        await pubnub.close_session()
+
+    assert tracker.occupants("room-1") == HERE_NOW["room-1"]
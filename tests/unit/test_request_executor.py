@@ -0,0 +1,187 @@
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from pubnub.enums import PNRequestRejectionPolicy, PNStatusCategory
+from pubnub.errors import PNERR_REQUEST_QUEUE_FULL, PNERR_REQUEST_EXECUTOR_SHUT_DOWN
+from pubnub.exceptions import PubNubException
+from pubnub.pubnub import PubNub
+from pubnub.request_handlers.executor import RequestExecutor
+from pubnub.request_handlers.httpx import HttpxRequestHandler
+from pubnub.structures import Envelope
+from tests.helper import pnconf_copy
+
+
+class TestRequestExecutor(unittest.TestCase):
+    def setUp(self):
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+
+    def _blocking_task(self, started=None):
+        def task():
+            if started is not None:
+                started.set()
+            self.release.wait(5)
+        return task
+
+    def test_runs_tasks_on_bounded_number_of_threads(self):
+        executor = RequestExecutor(max_workers=2)
+        thread_names = set()
+        done = threading.Semaphore(0)
+
+        def task():
+            thread_names.add(threading.current_thread().name)
+            done.release()
+
+        for _ in range(50):
+            executor.submit(task)
+        for _ in range(50):
+            self.assertTrue(done.acquire(timeout=5))
+
+        self.assertLessEqual(len(thread_names), 2)
+        self.assertLessEqual(executor.worker_count, 2)
+        executor.shutdown(wait=True, timeout=5)
+
+    def test_abort_policy_rejects_when_queue_is_full(self):
+        executor = RequestExecutor(max_workers=1, queue_size=1, rejection_policy=PNRequestRejectionPolicy.ABORT)
+        started = threading.Event()
+
+        executor.submit(self._blocking_task(started))
+        self.assertTrue(started.wait(5))
+        executor.submit(lambda: None)
+        self.assertEqual(executor.queue_depth, 1)
+
+        with self.assertRaises(PubNubException) as context:
+            executor.submit(lambda: None)
+        self.assertEqual(context.exception._pn_error, PNERR_REQUEST_QUEUE_FULL)
+
+        self.release.set()
+        executor.shutdown(wait=True, timeout=5)
+
+    def test_caller_runs_policy_executes_on_submitting_thread(self):
+        executor = RequestExecutor(max_workers=1, queue_size=1,
+                                   rejection_policy=PNRequestRejectionPolicy.CALLER_RUNS)
+        started = threading.Event()
+        executed_on = []
+
+        executor.submit(self._blocking_task(started))
+        self.assertTrue(started.wait(5))
+        executor.submit(lambda: None)
+        executor.submit(lambda: executed_on.append(threading.current_thread()))
+
+        self.assertEqual(executed_on, [threading.current_thread()])
+        self.release.set()
+        executor.shutdown(wait=True, timeout=5)
+
+    def test_block_policy_waits_for_free_slot(self):
+        executor = RequestExecutor(max_workers=1, queue_size=1, rejection_policy=PNRequestRejectionPolicy.BLOCK)
+        started = threading.Event()
+        submitted = threading.Event()
+        executed = threading.Event()
+
+        executor.submit(self._blocking_task(started))
+        self.assertTrue(started.wait(5))
+        executor.submit(lambda: None)
+
+        def submit_third():
+            executor.submit(executed.set)
+            submitted.set()
+
+        threading.Thread(target=submit_third, daemon=True).start()
+        self.assertFalse(submitted.wait(0.2))
+
+        self.release.set()
+        self.assertTrue(submitted.wait(5))
+        self.assertTrue(executed.wait(5))
+        executor.shutdown(wait=True, timeout=5)
+
+    def test_tasks_submitted_by_workers_bypass_the_bound(self):
+        executor = RequestExecutor(max_workers=1, queue_size=1, rejection_policy=PNRequestRejectionPolicy.ABORT)
+        executed = threading.Event()
+
+        def resubmitting_task():
+            executor.submit(lambda: None)
+            executor.submit(executed.set)
+
+        executor.submit(resubmitting_task)
+        self.assertTrue(executed.wait(5))
+        executor.shutdown(wait=True, timeout=5)
+
+    def test_shutdown_drains_queue_and_rejects_new_tasks(self):
+        executor = RequestExecutor(max_workers=1)
+        started = threading.Event()
+        executed = threading.Event()
+
+        executor.submit(self._blocking_task(started))
+        self.assertTrue(started.wait(5))
+        executor.submit(executed.set)
+        executor.shutdown()
+
+        with self.assertRaises(PubNubException) as context:
+            executor.submit(lambda: None)
+        self.assertEqual(context.exception._pn_error, PNERR_REQUEST_EXECUTOR_SHUT_DOWN)
+
+        self.release.set()
+        self.assertTrue(executed.wait(5))
+        executor.shutdown(wait=True, timeout=5)
+        self.assertEqual(executor.worker_count, 0)
+
+    def test_from_config_is_disabled_by_default(self):
+        self.assertIsNone(RequestExecutor.from_config(pnconf_copy()))
+
+
+class TestHttpxRequestHandlerExecutor(unittest.TestCase):
+    def setUp(self):
+        config = pnconf_copy()
+        config.request_thread_pool_size = 2
+        self.pubnub = PubNub(config)
+        self.handler = self.pubnub.get_request_handler()
+        self.assertIsInstance(self.handler, HttpxRequestHandler)
+
+    def tearDown(self):
+        self.handler.close()
+
+    def _options(self):
+        options = MagicMock()
+        options.create_status.side_effect = lambda category, response, response_info, exception: (category, exception)
+        return options
+
+    def test_threaded_request_uses_shared_executor(self):
+        envelope = Envelope(result="ok", status=None)
+        self.handler._build_envelope = MagicMock(return_value=envelope)
+        received = []
+        done = threading.Semaphore(0)
+
+        def callback(result):
+            received.append(threading.current_thread().name)
+            done.release()
+
+        calls = [self.handler.threaded_request("Time", None, self._options(), callback, None) for _ in range(10)]
+        for call in calls:
+            call.join(5)
+            self.assertTrue(call.is_executed)
+        for _ in range(10):
+            self.assertTrue(done.acquire(timeout=5))
+
+        self.assertLessEqual(len(set(received)), 2)
+        self.assertTrue(all(name.startswith("pubnub-request") for name in received))
+
+    def test_threaded_request_reports_rejection_to_callback(self):
+        executor = self.handler._get_executor()
+        executor.shutdown()
+        self.handler._get_executor = MagicMock(return_value=executor)
+        received = []
+
+        call = self.handler.threaded_request("Time", None, self._options(), received.append, None)
+
+        self.assertTrue(call.is_executed)
+        category, exception = received[0].status
+        self.assertEqual(category, PNStatusCategory.PNInternalExceptionCategory)
+        self.assertEqual(exception._pn_error, PNERR_REQUEST_EXECUTOR_SHUT_DOWN)
+
+    def test_close_shuts_executor_down(self):
+        executor = self.handler._get_executor()
+        self.handler.close()
+        self.assertTrue(executor.is_shut_down)
@@ -0,0 +1,126 @@
+import io
+
+from email.parser import BytesParser
+from unittest.mock import Mock
+
+import pytest
+
+from pubnub.crypto import AesCbcCryptoModule, LegacyCryptoModule, PubNubFileCrypto
+from pubnub.endpoints.file_operations.send_file import SendFileNative
+from pubnub.endpoints.file_operations.send_file_asyncio import AsyncioSendFile
+from pubnub.endpoints.file_operations.upload_body import AsyncMultipartUploadBody
+from pubnub.pubnub import PubNub
+from tests.helper import pnconf_file_copy
+
+FILE_CONTENT = bytes(range(256)) * 1000 + b'tail'
+FORM_FIELDS = [{"key": "key", "value": "sub-key/file-id/file.bin"}, {"key": "policy", "value": "c2lnbmVk"}]
+
+
+def chunked(data, size):
+    return (data[offset:offset + size] for offset in range(0, len(data), size))
+
+
+def create_config(cipher_key=None, use_random_iv=True):
+    config = pnconf_file_copy()
+    config.cipher_key = cipher_key
+    config.use_random_initialization_vector = use_random_iv
+    return config
+
+
+@pytest.mark.parametrize("module_class", [AesCbcCryptoModule, LegacyCryptoModule])
+@pytest.mark.parametrize("use_random_iv", [True, False])
+@pytest.mark.parametrize("chunk_size", [1000, 4096])
+def test_encrypted_file_stream_matches_file_encryption(module_class, use_random_iv, chunk_size):
+    crypto = module_class(create_config("streamKey", use_random_iv))
+
+    encrypted = b''.join(crypto.encrypt_file_stream(chunked(FILE_CONTENT, chunk_size)))
+
+    assert len(encrypted) == crypto.encrypted_file_size(len(FILE_CONTENT))
+    assert len(encrypted) == len(crypto.encrypt_file(FILE_CONTENT))
+    assert crypto.decrypt_file(encrypted) == FILE_CONTENT
+
+
+def test_deprecated_file_crypto_stream():
+    file_crypto = PubNubFileCrypto(create_config())
+
+    encrypted = b''.join(file_crypto.encrypt_stream("streamKey", chunked(FILE_CONTENT, 1000)))
+
+    assert len(encrypted) == file_crypto.encrypted_size(len(FILE_CONTENT))
+    assert file_crypto.decrypt("streamKey", encrypted) == FILE_CONTENT
+
+
+def send_file_endpoint(endpoint_class, config, progress):
+    endpoint = endpoint_class(PubNub(config))
+    endpoint._file_upload_envelope = Mock()
+    endpoint._file_upload_envelope.result.data = {"url": "https://s3.example.com/bucket", "form_fields": FORM_FIELDS}
+    return endpoint.channel("files").file_name("file.bin").progress_callback(lambda *args: progress.append(args))
+
+
+def parse_multipart(headers, body):
+    message = BytesParser().parsebytes(b"Content-Type: " + headers["Content-Type"].encode() + b"\r\n\r\n" + body)
+    return {part.get_param("name", header="content-disposition"): part.get_payload(decode=True)
+            for part in message.get_payload()}
+
+
+@pytest.mark.parametrize("cipher_key", [None, "streamKey"])
+@pytest.mark.parametrize("source", ["path", "file_object", "bytes"])
+def test_send_file_streams_multipart_body(tmp_path, cipher_key, source):
+    path = tmp_path / "file.bin"
+    path.write_bytes(FILE_CONTENT)
+    progress = []
+    config = create_config(cipher_key)
+    endpoint = send_file_endpoint(SendFileNative, config, progress)
+
+    if source == "path":
+        endpoint.file_path(str(path))
+    elif source == "file_object":
+        file_object = io.BufferedReader(io.BytesIO(b"skipped" + FILE_CONTENT))
+        file_object.read(len(b"skipped"))
+        endpoint.file_object(file_object)
+    else:
+        endpoint.file_object(FILE_CONTENT)
+    options = endpoint.options()
+    body = options.data
+
+    assert options.files is None
+    assert max(len(chunk) for chunk in body) <= 64 * 1024 + 32
+    sent = b''.join(body)
+    # the body can be sent again, when the request is retried
+    assert len(b''.join(body)) == len(sent)
+
+    assert int(options.request_headers["Content-Length"]) == len(sent)
+    assert progress[-1] == (len(sent), len(sent))
+    parts = parse_multipart(options.request_headers, sent)
+    assert parts["key"] == b"sub-key/file-id/file.bin"
+    assert parts["policy"] == b"c2lnbmVk"
+    if cipher_key:
+        assert parts["file"] != FILE_CONTENT
+        assert PubNub(config).crypto.decrypt_file(parts["file"]) == FILE_CONTENT
+    else:
+        assert parts["file"] == FILE_CONTENT
+
+
+def test_send_file_falls_back_to_reading_unseekable_streams():
+    endpoint = send_file_endpoint(SendFileNative, create_config(), [])
+    endpoint.file_object(Mock(read=Mock(return_value=FILE_CONTENT)))
+
+    options = endpoint.options()
+
+    assert options.data is None
+    assert options.files["file"][0] == "file.bin"
+    assert endpoint.request_headers() == {}
+
+
+@pytest.mark.asyncio
+async def test_asyncio_send_file_streams_body(tmp_path):
+    path = tmp_path / "file.bin"
+    path.write_bytes(FILE_CONTENT)
+    progress = []
+    endpoint = send_file_endpoint(AsyncioSendFile, create_config("streamKey"), progress)
+
+    options = endpoint.file_path(str(path)).options()
+
+    assert isinstance(options.data, AsyncMultipartUploadBody)
+    sent = b''.join([chunk async for chunk in options.data])
+    assert len(sent) == int(options.request_headers["Content-Length"])
+    assert progress[-1] == (len(sent), len(sent))
@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from pubnub.endpoints.file_operations.fetch_upload_details import FetchFileUploadS3Data
+from pubnub.endpoints.file_operations.send_file import SendFileNative
+from pubnub.endpoints.file_operations.send_file_asyncio import AsyncioSendFile
+from pubnub.exceptions import PubNubAsyncioException, PubNubException
+from pubnub.pubnub import PubNub
+from pubnub.pubnub_asyncio import PubNubAsyncio
+from tests.helper import pnconf_file_copy
+
+
+class ConcurrencyCounter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+    def __exit__(self, *exc_info):
+        with self.lock:
+            self.running -= 1
+
+
+def file_senders(pubnub, count):
+    return [pubnub.send_file().channel("files").file_name("file-%d.txt" % n).file_object(b"content")
+            for n in range(count)]
+
+
+def test_send_files_overlaps_files_and_keeps_order():
+    pubnub = PubNub(pnconf_file_copy())
+    counter = ConcurrencyCounter()
+
+    def sync(endpoint):
+        with counter:
+            time.sleep(0.05)
+        if endpoint._file_name == "file-3.txt":
+            raise PubNubException(errormsg="upload failed")
+        return Mock(result=endpoint._file_name)
+
+    with patch.object(SendFileNative, "sync", sync):
+        results = pubnub.send_files(file_senders(pubnub, 12), concurrency=4)
+
+    assert counter.max_running == 4
+    assert isinstance(results[3], PubNubException)
+    assert [result for n, result in enumerate(results) if n != 3] == \
+        ["file-%d.txt" % n for n in range(12) if n != 3]
+
+
+@pytest.mark.asyncio
+async def test_asyncio_send_files_overlaps_files_and_keeps_order():
+    pubnub = PubNubAsyncio(pnconf_file_copy())
+    counter = ConcurrencyCounter()
+    failure = PubNubAsyncioException(result=None, status=Mock())
+
+    async def future(endpoint):
+        with counter:
+            await asyncio.sleep(0.05)
+        if endpoint._file_name == "file-3.txt":
+            return failure
+        return Mock(result=endpoint._file_name, is_error=Mock(return_value=False))
+
+    try:
+        with patch.object(AsyncioSendFile, "future", future):
+            results = await pubnub.send_files(file_senders(pubnub, 12), concurrency=4)
+    finally:
+        await pubnub.close_session()
+
+    assert counter.max_running == 4
+    assert results[3] is failure
+    assert [result for n, result in enumerate(results) if n != 3] == \
+        ["file-%d.txt" % n for n in range(12) if n != 3]
+
+
+@pytest.mark.asyncio
+async def test_asyncio_send_file_stops_at_the_failed_request():
+    pubnub = PubNubAsyncio(pnconf_file_copy())
+    failure = PubNubAsyncioException(result=None, status=Mock())
+
+    try:
+        with patch.object(FetchFileUploadS3Data, "future", AsyncMock(return_value=failure)):
+            assert await file_senders(pubnub, 1)[0].future() is failure
+    finally:
+        await pubnub.close_session()
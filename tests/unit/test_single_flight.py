@@ -0,0 +1,208 @@
+import asyncio
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+import pytest
+
+from pubnub.exceptions import PubNubException
+from pubnub.pubnub import PubNub
+from pubnub.request_handlers.single_flight import SingleFlight, AsyncSingleFlight
+from pubnub.request_handlers.httpx import HttpxRequestHandler
+from pubnub.structures import PlatformOptions
+from tests.helper import pnconf_copy
+
+
+class TestSingleFlight(unittest.TestCase):
+    def _run_concurrently(self, single_flight, key, func, callers):
+        results = []
+        errors = []
+
+        def call():
+            try:
+                results.append(single_flight.do(key, func))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        return threads, results, errors
+
+    def test_identical_calls_share_one_execution(self):
+        single_flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def func():
+            calls.append(1)
+            release.wait(5)
+            return {"result": 42}
+
+        threads, results, errors = self._run_concurrently(single_flight, "key", func, 5)
+        for thread in threads:
+            thread.join(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(errors, [])
+        self.assertTrue(all(result is results[0] for result in results))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(single_flight.in_flight, 0)
+
+    def test_followers_receive_leader_exception(self):
+        single_flight = SingleFlight()
+        leader_started = threading.Event()
+        release = threading.Event()
+
+        def func():
+            leader_started.set()
+            release.wait(5)
+            raise ValueError("boom")
+
+        leader = threading.Thread(target=lambda: self.assertRaises(ValueError, single_flight.do, "key", func))
+        leader.start()
+        self.assertTrue(leader_started.wait(5))
+
+        follower_error = []
+        follower = threading.Thread(target=lambda: follower_error.append(
+            self.assertRaises(ValueError, single_flight.do, "key", lambda: "never called")))
+        follower.start()
+        release.set()
+        leader.join(5)
+        follower.join(5)
+
+        self.assertEqual(len(follower_error), 1)
+        self.assertEqual(single_flight.in_flight, 0)
+
+    def test_completed_calls_are_not_cached(self):
+        single_flight = SingleFlight()
+        counter = iter(range(10))
+
+        self.assertEqual(single_flight.do("key", lambda: next(counter)), 0)
+        self.assertEqual(single_flight.do("key", lambda: next(counter)), 1)
+
+    def test_handler_coalesces_only_when_enabled(self):
+        config = pnconf_copy()
+        config.coalesce_read_requests = True
+        pubnub = PubNub(config)
+        handler = HttpxRequestHandler(pubnub)
+        handler._single_flight = MagicMock(wraps=handler._single_flight)
+        handler._invoke_request = MagicMock(side_effect=PubNubException(errormsg="offline"))
+        platform_options = PlatformOptions(pubnub.headers, config)
+        options = pubnub.time().options()
+        options.merge_params_in({})
+
+        handler._build_envelope(platform_options, options)
+        self.assertEqual(handler._single_flight.do.call_count, 1)
+
+        config.coalesce_read_requests = False
+        handler._build_envelope(platform_options, options)
+        self.assertEqual(handler._single_flight.do.call_count, 1)
+        self.assertEqual(handler._invoke_request.call_count, 2)
+        handler.close()
+
+    def test_identical_concurrent_publishes_are_both_sent(self):
+        config = pnconf_copy()
+        config.coalesce_read_requests = True
+        pubnub = PubNub(config)
+        handler = HttpxRequestHandler(pubnub)
+        both_sent = threading.Barrier(2, timeout=5)
+
+        def invoke_request(*args):
+            both_sent.wait()
+            raise PubNubException(errormsg="offline")
+
+        handler._invoke_request = MagicMock(side_effect=invoke_request)
+        platform_options = PlatformOptions(pubnub.headers, config)
+        options = [pubnub.publish().channel("ch").message("hello").options() for _ in range(2)]
+        for publish_options in options:
+            publish_options.merge_params_in({})
+        self.assertEqual(options[0].coalescing_key, options[1].coalescing_key)
+        self.assertFalse(options[0].is_coalescable())
+
+        threads = [threading.Thread(target=handler._build_envelope, args=(platform_options, publish_options))
+                   for publish_options in options]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+
+        self.assertEqual(handler._invoke_request.call_count, 2)
+        self.assertFalse(both_sent.broken)
+        handler.close()
+
+
+def test_coalescing_key_ignores_param_order_and_signature():
+    pubnub = PubNub(pnconf_copy())
+
+    first = pubnub.get_channel_metadata().channel("ch").include_custom(True).options()
+    first.merge_params_in({"b": 1, "a": 2, "timestamp": 1, "signature": "x"})
+    second = pubnub.get_channel_metadata().channel("ch").include_custom(True).options()
+    second.merge_params_in({"a": 2, "b": 1, "timestamp": 2, "signature": "y"})
+    other = pubnub.get_channel_metadata().channel("other").include_custom(True).options()
+    other.merge_params_in({"a": 2, "b": 1})
+
+    assert first.is_coalescable()
+    assert first.coalescing_key == second.coalescing_key
+    assert first.coalescing_key != other.coalescing_key
+    assert not pubnub.set_channel_metadata().channel("ch").options().is_coalescable()
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_shares_one_task():
+    single_flight = AsyncSingleFlight()
+    calls = []
+
+    async def request():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    results = await asyncio.gather(*[single_flight.do("key", request) for _ in range(5)])
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert single_flight.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_survives_cancelled_caller():
+    single_flight = AsyncSingleFlight()
+    release = asyncio.Event()
+
+    async def request():
+        await release.wait()
+        return "response"
+
+    cancelled = asyncio.ensure_future(single_flight.do("key", request))
+    waiting = asyncio.ensure_future(single_flight.do("key", request))
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiting == "response"
+    with pytest.raises(asyncio.CancelledError):
+        await cancelled
+
+
+@pytest.mark.asyncio
+async def test_async_single_flight_cancels_when_last_caller_leaves():
+    single_flight = AsyncSingleFlight()
+    started = asyncio.Event()
+
+    async def request():
+        started.set()
+        await asyncio.sleep(10)
+
+    caller = asyncio.ensure_future(single_flight.do("key", request))
+    await started.wait()
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    await asyncio.sleep(0)
+
+    assert single_flight.in_flight == 0
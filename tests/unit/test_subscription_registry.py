@@ -0,0 +1,101 @@
+from unittest.mock import MagicMock
+
+from pubnub.callbacks import SubscribeCallback
+from pubnub.models.consumer.pubsub import PNMessageResult
+from pubnub.models.subscription import PNSubscriptionMatcher, PNSubscriptionRegistry, PNSubscriptionType, \
+    PubNubSubscription, PubNubSubscriptionSet
+
+
+def create_registry():
+    pubnub = MagicMock()
+    pubnub._subscription_manager._timetoken = 0
+    registry = PNSubscriptionRegistry(pubnub)
+    pubnub._subscription_registry = registry
+    return pubnub, registry
+
+
+def subscribe(pubnub, name, type=PNSubscriptionType.CHANNEL):
+    subscription = PubNubSubscription(pubnub, name, type)
+    subscription.on_message = MagicMock()
+    subscription.subscribe()
+    return subscription
+
+
+def message(channel, subscription=None):
+    return PNMessageResult("hi", subscription, channel, 1)
+
+
+def test_dispatch_visits_only_matching_subscriptions():
+    pubnub, registry = create_registry()
+    exact = subscribe(pubnub, "chat.room")
+    wildcard = subscribe(pubnub, "chat.*")
+    group = subscribe(pubnub, "group", PNSubscriptionType.CHANNEL_GROUP)
+    others = [subscribe(pubnub, "other-%d" % i) for i in range(100)]
+
+    listeners = registry.get_listeners_for(message("chat.room", "group"))
+
+    assert list(listeners) == [exact, wildcard, group]
+    assert not set(others) & set(listeners)
+
+    registry.subscription_registry_callback.message(pubnub, message("chat.room", "group"))
+    exact.on_message.assert_called_once()
+    wildcard.on_message.assert_called_once()
+    group.on_message.assert_called_once()
+    assert all(not other.on_message.called for other in others)
+
+
+def test_wildcard_matches_nested_channels_only():
+    pubnub, registry = create_registry()
+    wildcard = subscribe(pubnub, "a.b.*")
+
+    assert wildcard in registry.get_listeners_for(message("a.b.c.d"))
+    assert wildcard not in registry.get_listeners_for(message("a.bc"))
+    assert wildcard not in registry.get_listeners_for(message("a.b"))
+
+
+def test_index_follows_add_and_remove():
+    pubnub, registry = create_registry()
+    first = PubNubSubscription(pubnub, "ch1", PNSubscriptionType.CHANNEL)
+    second = PubNubSubscription(pubnub, "ch2", PNSubscriptionType.CHANNEL, with_presence=True)
+    subscription_set = PubNubSubscriptionSet(pubnub, [first, second])
+    global_listener = MagicMock(spec=SubscribeCallback)
+
+    subscription_set.subscribe()
+    registry.add_listener(global_listener)
+    assert list(registry.get_listeners_for(message("ch2"))) == [second, subscription_set, global_listener]
+
+    subscription_set.unsubscribe()
+    assert list(registry.get_listeners_for(message("ch1"))) == [global_listener]
+    assert registry.channels == {"ch1": [], "ch2": [], "ch2-pnpres": []}
+
+
+def test_matcher_orders_exact_then_deepest_wildcard_and_prunes():
+    pubnub, _ = create_registry()
+    matcher = PNSubscriptionMatcher()
+    subscriptions = {name: PubNubSubscription(pubnub, name, PNSubscriptionType.CHANNEL)
+                     for name in ("a.*", "a.b.*", "a.b.c", "a.bc")}
+    for subscription in subscriptions.values():
+        matcher.add(subscription, subscription.name)
+
+    assert matcher.match(message("a.b.c")) == ["a.b.c", "a.b.*", "a.*"]
+    assert matcher.match(message("a.b")) == ["a.*"]
+    assert matcher.match(message("b.c")) == []
+
+    for subscription in subscriptions.values():
+        matcher.remove(subscription, subscription.name)
+    assert matcher._root.children == {}
+
+
+def test_subscription_set_matches_through_compiled_matcher():
+    pubnub, _ = create_registry()
+    subscription_set = PubNubSubscriptionSet(pubnub, [
+        PubNubSubscription(pubnub, "news.*", PNSubscriptionType.CHANNEL),
+        PubNubSubscription(pubnub, "group", PNSubscriptionType.CHANNEL_GROUP),
+    ])
+
+    assert subscription_set.is_matching_listener(message("news.sport"))
+    assert subscription_set.is_matching_listener(message("weather", "group"))
+    assert not subscription_set.is_matching_listener(message("weather"))
+
+    subscription_set.subscriptions = [PubNubSubscription(pubnub, "weather", PNSubscriptionType.CHANNEL)]
+    assert subscription_set.is_matching_listener(message("weather"))
@@ -0,0 +1,164 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from pubnub.models.consumer.pubsub import PNMessageResult
+from pubnub.models.subscription import PNSubscriptionType, PubNubSubscription
+from pubnub.pubnub import NativeSubscriptionManager, PubNub
+from pubnub.endpoints.pubsub.subscribe import Subscribe
+from pubnub.enums import PNStatusCategory
+from pubnub.pubnub_asyncio import AsyncioSubscriptionManager, AsyncioSubscriptionStream, PubNubAsyncio
+from tests.helper import pnconf_copy
+
+
+def message(channel, payload):
+    return PNMessageResult(payload, None, channel, 1)
+
+
+@pytest.fixture
+def pubnub():
+    config = pnconf_copy()
+    config.enable_subscribe = True
+    with patch.object(NativeSubscriptionManager, "reconnect"), patch.object(NativeSubscriptionManager, "_send_leave"):
+        pubnub = PubNub(config)
+        yield pubnub
+        pubnub.stop()
+
+
+def test_stream_buffers_messages_and_reports_lag(pubnub):
+    manager = pubnub._subscription_manager
+    stream = pubnub.channel("chat").subscription().stream(maxsize=2)
+    assert pubnub.get_subscribed_channels() == ["chat"]
+
+    callback = pubnub._subscription_registry.subscription_registry_callback
+    callback.messages(pubnub, [message("chat", 1), message("other", 0), message("chat", 2), message("chat", 3)])
+
+    assert manager._lagging_streams() == [stream]
+    assert not stream.wait_for_space(timeout=0.01)
+
+    messages = iter(stream)
+    assert next(messages).message == 1
+    assert stream.is_full()
+    assert next(messages).message == 2
+    assert manager._lagging_streams() == []
+    assert stream.wait_for_space(timeout=0.01)
+
+    stream.close()
+    assert [item.message for item in messages] == [3]
+    assert pubnub.get_subscribed_channels() == []
+    assert manager._subscription_streams == []
+
+
+def test_subscribe_loop_waits_for_slow_consumer(pubnub):
+    manager = pubnub._subscription_manager
+    stream = pubnub.channel("chat").subscription().stream(maxsize=1)
+    stream.subscription.messages([message("chat", 1)])
+
+    waiter = threading.Thread(target=manager._wait_for_streams)
+    waiter.start()
+    waiter.join(0.05)
+    assert waiter.is_alive()
+
+    assert stream.get(timeout=1).message == 1
+    waiter.join(5)
+    assert not waiter.is_alive()
+    stream.close()
+
+
+@pytest.mark.asyncio
+async def test_asyncio_stream_iterates_and_signals_space():
+    subscription_manager = MagicMock()
+    subscription = PubNubSubscription(MagicMock(), "chat", PNSubscriptionType.CHANNEL)
+    stream = AsyncioSubscriptionStream(subscription_manager, subscription, maxsize=2)
+    subscription.messages([message("chat", payload) for payload in range(3)])
+
+    waiter = asyncio.ensure_future(stream.wait_for_space())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    received = []
+    async with stream:
+        async for item in stream:
+            received.append(item.message)
+            if len(received) == 3:
+                break
+
+    await asyncio.wait_for(waiter, 1)
+    assert received == [0, 1, 2]
+    assert stream.closed
+    subscription_manager.close_stream.assert_called_once_with(stream)
+
+
+@pytest.mark.asyncio
+async def test_asyncio_subscribe_loop_waits_for_stream_without_lock():
+    config = pnconf_copy()
+    config.enable_subscribe = True
+    with patch.object(AsyncioSubscriptionManager, "reconnect"):
+        pubnub = PubNubAsyncio(config, subscription_manager=AsyncioSubscriptionManager)
+        stream = pubnub.channel("chat").subscription().stream(maxsize=1)
+    manager = pubnub._subscription_manager
+    stream.subscription.messages([message("chat", 1)])
+    requests = []
+
+    async def future(endpoint):
+        requests.append(endpoint)
+        if len(requests) > 1:
+            await asyncio.Event().wait()
+        return MagicMock(is_error=MagicMock(return_value=False))
+
+    try:
+        with patch.object(Subscribe, "future", future), patch.object(manager, "_handle_endpoint_call"):
+            first_loop = manager._subscribe_loop_task = asyncio.ensure_future(manager._start_subscribe_loop())
+            await asyncio.sleep(0.05)
+            assert not first_loop.done()
+
+            # subscription changes can take the lock while the loop waits for the slow consumer
+            await asyncio.wait_for(manager._subscription_lock.acquire(), 1)
+            manager._subscription_lock.release()
+
+            assert (await stream.get()).message == 1
+            await asyncio.wait_for(first_loop, 1)
+            await asyncio.sleep(0.01)
+            assert len(requests) == 2 and manager._subscribe_loop_task is not first_loop
+    finally:
+        manager._subscribe_loop_task.cancel()
+        manager._stop_subscribe_loop()
+        manager._message_worker.cancel()
+        await pubnub.close_session()
+
+
+@pytest.mark.asyncio
+async def test_asyncio_subscribe_loop_continues_after_timeout():
+    config = pnconf_copy()
+    config.enable_subscribe = True
+    with patch.object(AsyncioSubscriptionManager, "reconnect"):
+        pubnub = PubNubAsyncio(config, subscription_manager=AsyncioSubscriptionManager)
+        pubnub.subscribe().channels("chat").execute()
+    manager = pubnub._subscription_manager
+    requests = []
+
+    async def future(endpoint):
+        requests.append(endpoint)
+        if len(requests) == 1:
+            return MagicMock(is_error=MagicMock(return_value=True),
+                             status=MagicMock(category=PNStatusCategory.PNTimeoutCategory))
+        if len(requests) > 3:
+            await asyncio.Event().wait()
+        return MagicMock(is_error=MagicMock(return_value=False))
+
+    try:
+        with patch.object(Subscribe, "future", future), patch.object(manager, "_handle_endpoint_call"):
+            manager._subscribe_loop_task = asyncio.ensure_future(manager._start_subscribe_loop())
+            for _ in range(100):
+                if len(requests) > 3:
+                    break
+                await asyncio.sleep(0.01)
+            # timeout, then two successful responses, each followed by the next request
+            assert len(requests) == 4
+    finally:
+        manager._subscribe_loop_task.cancel()
+        manager._stop_subscribe_loop()
+        manager._message_worker.cancel()
+        await pubnub.close_session()